@@ -0,0 +1,100 @@
+import argparse
+from argparse import ArgumentParser
+
+from compmatrix import create_app, db
+from compmatrix.api import search
+from compmatrix.api.matrix import membership, signatures, transitions
+
+import config
+
+
+def build(build_signatures: bool,
+          build_transitions: bool,
+          build_indexes: bool,
+          build_membership: bool,
+          build_search: bool):
+    app = create_app(config.DB_PATH)
+
+    print('🟩 Starting derived data builder...')
+
+    with app.app_context():
+        if build_indexes:
+            # `db.create_all()` only creates the indexes of new tables, so
+            # databases made before an index was added don't have it yet.
+            print(':: Creating missing indexes...')
+            for table in db.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(db.session.connection(), checkfirst=True)
+
+            db.session.commit()
+
+        if build_transitions:
+            # Built first, since changing the database means that the
+            # signature histogram has to be rebuilt.
+            print(':: Building the SDK transition table...')
+            transitions.create_table()
+            transitions.rebuild_table()
+            db.session.commit()
+
+        if build_membership:
+            print(':: Building the app SDK count table...')
+            membership.create_table()
+            membership.rebuild_table()
+            db.session.commit()
+
+        if build_search:
+            print(':: Building the app search index...')
+            search.create_table()
+            search.rebuild_table()
+            db.session.commit()
+
+        if build_signatures:
+            print(':: Building the app signature histogram...')
+            histogram: signatures.SignatureHistogram = (
+                signatures.load_histogram()
+            )
+            print(f':: Found {len(histogram.signature_counts)} distinct '
+                  'signatures.')
+
+    print('💖 Done!')
+
+
+def main():
+    parser: ArgumentParser = ArgumentParser(
+        prog='Derived Data Builder',
+        description='Builds data derived from the database, which are used '
+                    'to speed up the API. Builds everything if no flags are '
+                    'set.')
+    parser.add_argument('--signatures', action='store_true',
+                        help='Build the app signature histogram.')
+    parser.add_argument('--transitions', action='store_true',
+                        help='Build the SDK transition table, and install '
+                             'the triggers that keep it up-to-date.')
+    parser.add_argument('--indexes', action='store_true',
+                        help='Create the indexes that are missing from the '
+                             'database.')
+    parser.add_argument('--membership', action='store_true',
+                        help='Build the app SDK count table used to list the '
+                             'apps of a cell, and install the triggers that '
+                             'keep it up-to-date.')
+    parser.add_argument('--search', action='store_true',
+                        help='Build the full-text index used to search the '
+                             'apps of a cell, and install the triggers that '
+                             'keep it up-to-date.')
+    args: argparse.Namespace = parser.parse_args()
+
+    build_all: bool = not (args.signatures
+                           or args.transitions
+                           or args.indexes
+                           or args.membership
+                           or args.search)
+
+    build(args.signatures or build_all,
+          args.transitions or build_all,
+          args.indexes or build_all,
+          args.membership or build_all,
+          args.search or build_all)
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,8 @@ db = SQLAlchemy()
 
 def create_app(db_path: Path,
                assets_folder_path: Path | None = None,
-               template_folder_path: Path | None = None) -> Flask:
+               template_folder_path: Path | None = None,
+               extra_config: dict[str, object] | None = None) -> Flask:
     db_uri: str = f'sqlite:///{db_path}'
 
     app: Flask = Flask(__name__,
@@ -18,6 +19,61 @@ def create_app(db_path: Path,
                        static_url_path='/assets')
     app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
 
+    # Determines how the competitive matrix numbers get computed. See
+    # `compmatrix.api.matrix.ENGINES` for the available engines.
+    app.config['COMPMATRIX_NUMBERS_ENGINE'] = 'single_pass'
+
+    # Number of threads used by the "parallel_per_cell" engine. Uses the
+    # number of CPUs when set to None.
+    app.config['COMPMATRIX_NUMBERS_WORKERS'] = None
+
+    # Limits for the cache of computed matrices. The cache is cleared
+    # whenever the database changes.
+    app.config['COMPMATRIX_NUMBERS_CACHE_MAX_ENTRIES'] = 1024
+    app.config['COMPMATRIX_NUMBERS_CACHE_MAX_BYTES'] = 64 * 1024 * 1024
+
+    # Limits for the cache of the total number of apps of each cell, which
+    # is returned with every page of the apps of a cell. The cache is
+    # cleared whenever the database changes.
+    app.config['COMPMATRIX_APPS_COUNT_CACHE_MAX_ENTRIES'] = 16384
+    app.config['COMPMATRIX_APPS_COUNT_CACHE_MAX_BYTES'] = 8 * 1024 * 1024
+
+    # Limits for the cache of the facet counts of each cell. The cache is
+    # cleared whenever the database changes.
+    app.config['COMPMATRIX_APPS_FACETS_CACHE_MAX_ENTRIES'] = 4096
+    app.config['COMPMATRIX_APPS_FACETS_CACHE_MAX_BYTES'] = 16 * 1024 * 1024
+
+    # Whether the apps of a cell get listed with the help of the
+    # `app_sdk_count` table (see `compmatrix.api.matrix.membership`), which
+    # must have been built beforehand.
+    app.config['COMPMATRIX_APPS_USE_MEMBERSHIP_TABLE'] = False
+
+    # Whether the total number of apps of a cell can be taken from the
+    # cached matrices, instead of being counted.
+    app.config['COMPMATRIX_APPS_COUNT_FROM_MATRICES'] = True
+
+    # Selections of SDKs with at least this many IDs get passed to the
+    # queries as a JSON array, instead of one variable per ID. Set to None to
+    # never do so.
+    app.config['COMPMATRIX_LARGE_SELECTION_SIZE'] = 500
+
+    # Number of apps fetched from the database at a time when exporting the
+    # apps of a cell.
+    app.config['COMPMATRIX_APPS_EXPORT_BATCH_SIZE'] = 1000
+
+    # Share of the apps that get sampled to estimate the matrix when the
+    # "approx" mode is requested. Higher rates give narrower bounds, but
+    # slower responses.
+    app.config['COMPMATRIX_APPROX_SAMPLE_RATE'] = 0.01
+
+    # Where the signature histogram used by the "signatures" engine gets
+    # saved, so that it doesn't need to be rebuilt every startup. Set to None
+    # to keep it in memory only.
+    app.config['COMPMATRIX_SIGNATURES_PATH'] = f'{db_path}.signatures.json'
+
+    if extra_config:
+        app.config.update(extra_config)
+
     db.init_app(app)
 
     with app.app_context():
@@ -0,0 +1,397 @@
+import bisect
+import sys
+import typing
+
+from flask import current_app
+
+from compmatrix.api import versioning
+from compmatrix.api.matrix import (
+    approx,
+    bitmap,
+    cache_index,
+    derived,
+    parallel,
+    per_cell,
+    selections,
+    signatures,
+    single_pass
+)
+from compmatrix.utils import caching
+
+NUMBERS_CACHE_KEY: typing.Final[str] = 'compmatrix.matrix.numbers'
+_NUMBERS_INDEX_KEY: typing.Final[str] = 'compmatrix.matrix.numbers_index'
+
+NumbersEngine = typing.Callable[[list[int], list[int]], list[list[int]]]
+
+ENGINES: dict[str, NumbersEngine] = {
+    'bitmap': bitmap.compute_numbers,
+    'parallel_per_cell': parallel.compute_numbers,
+    'per_cell': per_cell.compute_numbers,
+    'signatures': signatures.compute_numbers,
+    'single_pass': single_pass.compute_numbers
+}
+
+
+def compute_numbers(from_sdks: list[int],
+                    to_sdks: list[int]) -> list[list[int]]:
+    """
+    Computes the numbers of the competitive matrix for the given SDKs using
+    the engine set in the `COMPMATRIX_NUMBERS_ENGINE` config. The last row
+    and column of the matrix are for the "(none)" SDK.
+
+    The matrices are cached until the database changes. The numbers of a
+    matrix only depend on which SDKs were selected, not on their order. So,
+    we cache the matrix of the sorted SDKs, and rearrange it to the requested
+    order afterwards.
+
+    :param from_sdks: The IDs of the SDKs in the rows of the matrix.
+    :param to_sdks: The IDs of the SDKs in the columns of the matrix.
+    :return: The matrix, with one list per row.
+    """
+    sorted_from_sdks: list[int] = sorted(set(from_sdks))
+    sorted_to_sdks: list[int] = sorted(set(to_sdks))
+    matrix_numbers: derived.MatrixNumbers = _get_matrix_numbers(
+        sorted_from_sdks, sorted_to_sdks)
+
+    # The cached matrix is never handed out directly, since the expanded
+    # matrix is made of new lists.
+    return selections.expand_numbers(
+        matrix_numbers.numbers,
+        selections.get_distinct_indices(sorted_from_sdks),
+        selections.get_distinct_indices(sorted_to_sdks),
+        from_sdks,
+        to_sdks
+    )
+
+
+def compute_matrix_numbers(from_sdks: list[int],
+                           to_sdks: list[int]) -> derived.MatrixNumbers:
+    """
+    Computes the numbers of the competitive matrix for the given SDKs, like
+    `compute_numbers()`, together with its normalized matrices and SDK
+    metrics. The derived numbers are cached along with the matrix.
+
+    Duplicate SDKs are only counted once when normalizing, so the normalized
+    numbers stay the same no matter how many times an SDK was selected.
+
+    :param from_sdks: The IDs of the SDKs in the rows of the matrix.
+    :param to_sdks: The IDs of the SDKs in the columns of the matrix.
+    :return: The matrix and its derived numbers, in the requested order.
+    """
+    sorted_from_sdks: list[int] = sorted(set(from_sdks))
+    sorted_to_sdks: list[int] = sorted(set(to_sdks))
+    matrix_numbers: derived.MatrixNumbers = _get_matrix_numbers(
+        sorted_from_sdks, sorted_to_sdks)
+
+    from_indices: dict[int, int] = selections.get_distinct_indices(
+        sorted_from_sdks)
+    to_indices: dict[int, int] = selections.get_distinct_indices(
+        sorted_to_sdks)
+    return derived.MatrixNumbers(
+        selections.expand_numbers(matrix_numbers.numbers,
+                                  from_indices,
+                                  to_indices,
+                                  from_sdks,
+                                  to_sdks),
+        selections.expand_numbers(matrix_numbers.row_normalized,
+                                  from_indices,
+                                  to_indices,
+                                  from_sdks,
+                                  to_sdks),
+        selections.expand_numbers(matrix_numbers.column_normalized,
+                                  from_indices,
+                                  to_indices,
+                                  from_sdks,
+                                  to_sdks),
+        dict(matrix_numbers.sdk_metrics)
+    )
+
+
+def estimate_matrix_numbers(
+        from_sdks: list[int],
+        to_sdks: list[int]
+) -> tuple[derived.MatrixNumbers, approx.ApproxNumbers]:
+    """
+    Estimates the numbers of the competitive matrix for the given SDKs from a
+    sample of the apps, instead of counting all of the apps. Each number
+    comes with the bounds of its confidence interval, whose confidence level
+    is `approx.CONFIDENCE_LEVEL`. The normalized matrices and SDK metrics are
+    derived from the estimates, like in `compute_matrix_numbers()`.
+
+    :param from_sdks: The IDs of the SDKs in the rows of the matrix.
+    :param to_sdks: The IDs of the SDKs in the columns of the matrix.
+    :return: The estimated matrix and its derived numbers, and the estimated
+             matrix and its bounds, in the requested order.
+    """
+    sorted_from_sdks: list[int] = sorted(set(from_sdks))
+    sorted_to_sdks: list[int] = sorted(set(to_sdks))
+    approx_numbers: approx.ApproxNumbers = approx.estimate_numbers(
+        sorted_from_sdks, sorted_to_sdks)
+    matrix_numbers: derived.MatrixNumbers = derived.derive_numbers(
+        approx_numbers.estimates, sorted_from_sdks, sorted_to_sdks)
+
+    from_indices: dict[int, int] = selections.get_distinct_indices(
+        sorted_from_sdks)
+    to_indices: dict[int, int] = selections.get_distinct_indices(
+        sorted_to_sdks)
+
+    def expand(values: list[list[int]] | list[list[float]]) -> list[list]:
+        return selections.expand_numbers(values,
+                                         from_indices,
+                                         to_indices,
+                                         from_sdks,
+                                         to_sdks)
+
+    estimates: list[list[int]] = expand(approx_numbers.estimates)
+    return (
+        derived.MatrixNumbers(estimates,
+                              expand(matrix_numbers.row_normalized),
+                              expand(matrix_numbers.column_normalized),
+                              matrix_numbers.sdk_metrics),
+        approx.ApproxNumbers(estimates,
+                             expand(approx_numbers.lower_bounds),
+                             expand(approx_numbers.upper_bounds))
+    )
+
+
+def iter_matrix_rows(
+        from_sdks: list[int],
+        to_sdks: list[int]
+) -> tuple[typing.Iterator[derived.MatrixRow], dict[int, derived.SDKMetrics]]:
+    """
+    Computes the competitive matrix for the given SDKs, like
+    `compute_matrix_numbers()`, but hands out the rows one at a time. The
+    rows get expanded to the requested order only once they are needed, so
+    the expanded matrix is never held in memory all at once.
+
+    :param from_sdks: The IDs of the SDKs in the rows of the matrix.
+    :param to_sdks: The IDs of the SDKs in the columns of the matrix.
+    :return: The rows of the matrix, and the metrics of the SDKs that are
+             both "from" and "to" SDKs.
+    """
+    sorted_from_sdks: list[int] = sorted(set(from_sdks))
+    sorted_to_sdks: list[int] = sorted(set(to_sdks))
+    matrix_numbers: derived.MatrixNumbers = _get_matrix_numbers(
+        sorted_from_sdks, sorted_to_sdks)
+
+    from_indices: dict[int, int] = selections.get_distinct_indices(
+        sorted_from_sdks)
+    to_indices: dict[int, int] = selections.get_distinct_indices(
+        sorted_to_sdks)
+
+    def iter_rows() -> typing.Iterator[derived.MatrixRow]:
+        expanded_rows: list[typing.Iterator] = [
+            selections.iter_expanded_rows(values,
+                                          from_indices,
+                                          to_indices,
+                                          from_sdks,
+                                          to_sdks)
+            for values in [matrix_numbers.numbers,
+                           matrix_numbers.row_normalized,
+                           matrix_numbers.column_normalized]
+        ]
+        for from_sdk, (numbers, row_normalized, column_normalized) in zip(
+                [*from_sdks, None], zip(*expanded_rows)):
+            yield derived.MatrixRow(from_sdk,
+                                    numbers,
+                                    row_normalized,
+                                    column_normalized)
+
+    return iter_rows(), dict(matrix_numbers.sdk_metrics)
+
+
+def create_numbers_cache_updater(
+        base_version: versioning.DataVersion,
+        compute_changes: NumbersEngine
+) -> typing.Callable[[caching.LRUCache, versioning.DataVersion],
+                     caching.LRUCache]:
+    """
+    Creates an updater of the cache of matrices, to be used with
+    `versioning.advance_versioned()`. The updater adds the changes of the
+    numbers to the cached matrices, instead of throwing them away.
+
+    It must be created before the changes get committed. Only the matrices
+    that were cached by then get updated, since the ones cached afterwards
+    may have been computed from the changed data already. The rest get
+    dropped.
+
+    :param base_version: The data version before the changes.
+    :param compute_changes: Computes the changes of the numbers of a matrix,
+                            given its "from" and "to" SDKs.
+    :return: The updater.
+    """
+    _, cache = _get_numbers_cache()
+    base_entries: dict[tuple, derived.MatrixNumbers] = {
+        key: matrix_numbers
+        for key, matrix_numbers in cache.items()
+        if key[0] == base_version
+    }
+
+    def update(cache: caching.LRUCache,
+               new_version: versioning.DataVersion) -> caching.LRUCache:
+        entries: list[tuple[tuple, derived.MatrixNumbers]] = cache.items()
+        cache.clear()
+        for key, matrix_numbers in entries:
+            if base_entries.get(key) is not matrix_numbers:
+                continue
+
+            _, engine_name, from_sdks, to_sdks = key
+            changes: list[list[int]] = compute_changes(list(from_sdks),
+                                                       list(to_sdks))
+            numbers: list[list[int]] = [
+                [n + change for n, change in zip(row, change_row)]
+                for row, change_row in zip(matrix_numbers.numbers, changes)
+            ]
+            new_matrix_numbers: derived.MatrixNumbers = (
+                derived.derive_numbers(numbers,
+                                       list(from_sdks),
+                                       list(to_sdks))
+            )
+
+            # Entries are put back from the least to the most recently used,
+            # so that they keep their order.
+            cache.put((new_version, engine_name, from_sdks, to_sdks),
+                      new_matrix_numbers,
+                      _estimate_matrix_numbers_size(new_matrix_numbers))
+
+        return cache
+
+    return update
+
+
+def find_cached_number(from_sdk: int | None,
+                       to_sdk: int | None,
+                       other_from_sdks: list[int],
+                       other_to_sdks: list[int]) -> int | None:
+    """
+    Looks for the number of apps of a cell in the matrices that are already
+    cached, without computing anything. The cell is specified the same way
+    as in the `/sdk-compmatrix/apps` endpoint, where None is the "(none)"
+    SDK.
+
+    The numbers between two SDKs don't depend on the other selected SDKs,
+    so any cached matrix that has both SDKs will do. The numbers in the
+    "(none)" row depend on all of the "from" SDKs, and the ones in the
+    "(none)" column depend on all of the "to" SDKs, so those need a matrix
+    with the exact same SDKs.
+
+    :return: The number of apps, or None if no cached matrix has the cell.
+    """
+    version, cache = _get_numbers_cache()
+    index: cache_index.CachedMatrixIndex = _get_numbers_index(version, cache)
+    for key in index.find(from_sdk,
+                          to_sdk,
+                          tuple(sorted(set(other_from_sdks))),
+                          tuple(sorted(set(other_to_sdks)))):
+        cache_version, _, sorted_from_sdks, sorted_to_sdks = key
+        matrix_numbers: derived.MatrixNumbers | None = cache.peek(key)
+        if cache_version != version or matrix_numbers is None:
+            continue
+
+        # The "(none)" row and column come after the rows and columns of the
+        # SDKs, which are sorted.
+        if from_sdk is None:
+            row_index: int = len(sorted_from_sdks)
+        else:
+            row_index: int = bisect.bisect_left(sorted_from_sdks, from_sdk)
+
+        if to_sdk is None:
+            col_index: int = len(sorted_to_sdks)
+        else:
+            col_index: int = bisect.bisect_left(sorted_to_sdks, to_sdk)
+
+        return matrix_numbers.numbers[row_index][col_index]
+
+    return None
+
+
+def get_numbers_cache_stats() -> caching.CacheStats:
+    """
+    Returns the hit, miss, and eviction counts, among others, of the cache of
+    matrices.
+    """
+    _, cache = _get_numbers_cache()
+    return cache.stats
+
+
+def _get_numbers_cache() -> tuple[versioning.DataVersion, caching.LRUCache]:
+    return versioning.get_versioned_cache(
+        NUMBERS_CACHE_KEY,
+        current_app.config['COMPMATRIX_NUMBERS_CACHE_MAX_ENTRIES'],
+        current_app.config['COMPMATRIX_NUMBERS_CACHE_MAX_BYTES']
+    )
+
+
+def _get_numbers_index(
+        version: versioning.DataVersion,
+        cache: caching.LRUCache
+) -> cache_index.CachedMatrixIndex:
+    # The index starts out with the matrices that are already cached, such
+    # as the ones moved to the new data version by the deltas.
+    def build_index() -> cache_index.CachedMatrixIndex:
+        index: cache_index.CachedMatrixIndex = cache_index.CachedMatrixIndex()
+        for key, _ in cache.items():
+            if key[0] == version:
+                index.add(key)
+
+        return index
+
+    return versioning.get_versioned(_NUMBERS_INDEX_KEY, build_index)
+
+
+def _get_matrix_numbers(sorted_from_sdks: list[int],
+                        sorted_to_sdks: list[int]) -> derived.MatrixNumbers:
+    engine_name: str = current_app.config['COMPMATRIX_NUMBERS_ENGINE']
+
+    version, cache = _get_numbers_cache()
+    key: tuple = (version,
+                  engine_name,
+                  tuple(sorted_from_sdks),
+                  tuple(sorted_to_sdks))
+    matrix_numbers: derived.MatrixNumbers | None = cache.get(key)
+    if matrix_numbers is None:
+        engine: NumbersEngine = ENGINES[engine_name]
+        matrix_numbers = derived.derive_numbers(
+            engine(sorted_from_sdks, sorted_to_sdks),
+            sorted_from_sdks,
+            sorted_to_sdks)
+        cache.put(key,
+                  matrix_numbers,
+                  _estimate_matrix_numbers_size(matrix_numbers))
+
+        index: cache_index.CachedMatrixIndex = _get_numbers_index(version,
+                                                                  cache)
+        index.add(key)
+
+        # The keys of evicted matrices stay in the index until we drop them,
+        # which we do once they outnumber the cached matrices.
+        if len(index) > 2 * len(cache):
+            index.retain(cached_key for cached_key, _ in cache.items())
+
+    return matrix_numbers
+
+
+def _estimate_matrix_numbers_size(
+        matrix_numbers: derived.MatrixNumbers
+) -> int:
+    size: int = sys.getsizeof(matrix_numbers)
+    for values in [matrix_numbers.numbers,
+                   matrix_numbers.row_normalized,
+                   matrix_numbers.column_normalized]:
+        size += _estimate_numbers_size(values)
+
+    size += sys.getsizeof(matrix_numbers.sdk_metrics)
+    size += (sys.getsizeof(derived.SDKMetrics(None, None, 0))
+             * len(matrix_numbers.sdk_metrics))
+
+    return size
+
+
+def _estimate_numbers_size(
+        numbers: list[list[int]] | list[list[float]]
+) -> int:
+    size: int = sys.getsizeof(numbers)
+    for row in numbers:
+        size += sys.getsizeof(row) + sum(sys.getsizeof(n) for n in row)
+
+    return size
@@ -0,0 +1,140 @@
+import dataclasses
+import math
+import statistics
+import typing
+
+from flask import current_app
+
+from compmatrix import db
+from compmatrix.api import versioning
+from compmatrix.api.matrix import signatures
+from compmatrix.api.views import queries
+
+_VERSIONED_KEY: typing.Final[str] = 'compmatrix.matrix.approx'
+
+# Chance that the true number of a cell is within its bounds.
+CONFIDENCE_LEVEL: typing.Final[float] = 0.95
+_Z_SCORE: typing.Final[float] = statistics.NormalDist().inv_cdf(
+    0.5 + CONFIDENCE_LEVEL / 2)
+
+
+@dataclasses.dataclass(frozen=True)
+class ApproxNumbers:
+    """
+    The estimated numbers of a competitive matrix, together with the bounds
+    of their confidence intervals.
+    """
+    estimates: list[list[int]]
+    lower_bounds: list[list[int]]
+    upper_bounds: list[list[int]]
+
+
+class AppSample:
+    """
+    The signature histogram of a sample of the apps. The sample is made of
+    the apps whose hashed IDs fall below a threshold, so it is the same
+    sample every time it gets loaded, and it is spread evenly across the
+    apps. The matrix of the sample gets scaled up to the number of all apps.
+    """
+
+    def __init__(self,
+                 histogram: signatures.SignatureHistogram,
+                 num_apps: int):
+        self._histogram = histogram
+        self._num_sampled_apps = (sum(histogram.signature_counts.values())
+                                  + histogram.num_apps_without_sdks)
+        self._num_apps = num_apps
+
+    @property
+    def num_sampled_apps(self) -> int:
+        return self._num_sampled_apps
+
+    @property
+    def num_apps(self) -> int:
+        return self._num_apps
+
+    def estimate_numbers(self,
+                         from_sdks: list[int],
+                         to_sdks: list[int]) -> ApproxNumbers:
+        sample_numbers: list[list[int]] = self._histogram.compute_numbers(
+            from_sdks, to_sdks)
+
+        estimates: list[list[int]] = []
+        lower_bounds: list[list[int]] = []
+        upper_bounds: list[list[int]] = []
+        for sample_row in sample_numbers:
+            estimates.append([])
+            lower_bounds.append([])
+            upper_bounds.append([])
+            for num_sampled in sample_row:
+                estimate, lower_bound, upper_bound = self._estimate_count(
+                    num_sampled)
+                estimates[-1].append(estimate)
+                lower_bounds[-1].append(lower_bound)
+                upper_bounds[-1].append(upper_bound)
+
+        return ApproxNumbers(estimates, lower_bounds, upper_bounds)
+
+    def _estimate_count(self, num_sampled: int) -> tuple[int, int, int]:
+        # We use the Wilson score interval for the share of the sampled apps
+        # that are in the cell, since it still behaves with the small shares
+        # that most cells have. The sample is taken without replacement, so
+        # the interval narrows down as the sample gets closer to all of the
+        # apps, until it only has the exact number once all apps are in it.
+        n: int = self._num_sampled_apps
+        N: int = self._num_apps
+        if n == 0:
+            return 0, 0, N
+
+        estimate: int = round(num_sampled * N / n)
+
+        population_correction: float = (N - n) / (N - 1) if N > 1 else 0.0
+        z: float = _Z_SCORE * math.sqrt(max(population_correction, 0.0))
+        share: float = num_sampled / n
+        denominator: float = 1 + z * z / n
+        center: float = (share + z * z / (2 * n)) / denominator
+        half_width: float = (z / denominator) * math.sqrt(
+            share * (1 - share) / n + z * z / (4 * n * n))
+
+        # The apps we found in the cell are surely in it, and the apps we
+        # found outside of it are surely not.
+        lower_bound: int = max(math.floor((center - half_width) * N),
+                               num_sampled)
+        upper_bound: int = min(math.ceil((center + half_width) * N),
+                               N - (n - num_sampled))
+
+        return (estimate,
+                min(lower_bound, estimate),
+                max(upper_bound, estimate))
+
+
+def estimate_numbers(from_sdks: list[int],
+                     to_sdks: list[int]) -> ApproxNumbers:
+    """
+    Estimates the competitive matrix from a sample of the apps. The sample is
+    loaded on first use, and reloaded whenever the database changes.
+    """
+    sample: AppSample = versioning.get_versioned(_VERSIONED_KEY, load_sample)
+    return sample.estimate_numbers(from_sdks, to_sdks)
+
+
+def load_sample() -> AppSample:
+    """
+    Loads the sample of the apps from the database. The share of the apps
+    that get sampled is set in the `COMPMATRIX_APPROX_SAMPLE_RATE` config.
+    """
+    sample_rate: float = current_app.config['COMPMATRIX_APPROX_SAMPLE_RATE']
+    max_app_hash: int = round(sample_rate * queries.APP_HASH_MODULUS)
+    histogram: signatures.SignatureHistogram = signatures.build_histogram(
+        max_app_hash)
+
+    num_apps: int = (
+        db.session.execute(
+            queries.get_query_for_num_apps_with_sdks()
+        ).scalar_one()
+        + db.session.execute(
+            queries.get_query_for_num_apps_without_sdks()
+        ).scalar_one()
+    )
+
+    return AppSample(histogram, num_apps)
@@ -0,0 +1,223 @@
+import typing
+
+from sqlalchemy import Select
+
+from compmatrix import db
+from compmatrix.api import models, versioning
+from compmatrix.api.matrix import selections
+from compmatrix.utils import bitsets
+
+_VERSIONED_KEY: typing.Final[str] = 'compmatrix.matrix.bitmap'
+_LOAD_BATCH_SIZE: typing.Final[int] = 10000
+
+
+class BitmapIndex:
+    """
+    An in-memory index of the apps that have, or used to have, each SDK
+    installed. Every app gets a position, and each SDK gets one bitset of the
+    apps that have it installed and another for the apps that used to have it
+    installed. The number of installed and uninstalled SDKs of each app are
+    kept as bit-sliced counters.
+
+    Each cell of the matrix can then be computed with bitwise operations and
+    a count of the set bits. The rules used here mirror the per-cell queries
+    in `compmatrix.api.views.queries`.
+    """
+
+    def __init__(self,
+                 num_apps: int,
+                 installed: dict[int, bitsets.PackedBitset],
+                 uninstalled: dict[int, bitsets.PackedBitset],
+                 num_installed_counter: list[int],
+                 num_uninstalled_counter: list[int],
+                 apps_with_sdk_rows: int):
+        self._num_apps = num_apps
+        self._installed = installed
+        self._uninstalled = uninstalled
+        self._num_installed_counter = num_installed_counter
+        self._num_uninstalled_counter = num_uninstalled_counter
+        self._apps_with_sdk_rows = apps_with_sdk_rows
+
+    @property
+    def num_apps(self) -> int:
+        return self._num_apps
+
+    def compute_numbers(self,
+                        from_sdks: list[int],
+                        to_sdks: list[int]) -> list[list[int]]:
+        size: int = self._num_apps
+        from_indices: dict[int, int] = selections.get_distinct_indices(
+            from_sdks)
+        to_indices: dict[int, int] = selections.get_distinct_indices(to_sdks)
+
+        installed: dict[int, int] = {
+            s: self._get_installed(s) for s in (*from_indices, *to_indices)
+        }
+        uninstalled: dict[int, int] = {
+            s: self._get_uninstalled(s) for s in from_indices
+        }
+
+        # Apps with at least one or two installed SDKs that are not one of
+        # the "to" SDKs.
+        num_installed_to: list[int] = bitsets.sum_bitsets(
+            installed[s] for s in to_indices)
+        installed_other_to1: int = self._get_apps_with_more(
+            self._num_installed_counter, num_installed_to, 1)
+        installed_other_to2: int = self._get_apps_with_more(
+            self._num_installed_counter, num_installed_to, 2)
+
+        # Apps with at least one uninstalled SDK that is not one of the
+        # "from" SDKs.
+        num_uninstalled_from: list[int] = bitsets.sum_bitsets(
+            uninstalled.values())
+        uninstalled_other_from: int = self._get_apps_with_more(
+            self._num_uninstalled_counter, num_uninstalled_from, 1)
+
+        # Apps with at least one installed SDK that was not selected at all.
+        num_installed_selected: list[int] = bitsets.sum_bitsets(
+            installed.values())
+        installed_unselected: int = self._get_apps_with_more(
+            self._num_installed_counter, num_installed_selected, 1)
+
+        apps_with_installed: int = 0
+        for counter_slice in self._num_installed_counter:
+            apps_with_installed |= counter_slice
+
+        apps_without_installed: int = (self._apps_with_sdk_rows
+                                       & ~apps_with_installed)
+        apps_without_sdk_rows: int = (bitsets.universe(size)
+                                      & ~self._apps_with_sdk_rows)
+
+        numbers: list[list[int]] = []
+        for from_sdk in from_indices:
+            row_numbers: list[int] = []
+            for to_sdk in to_indices:
+                if from_sdk == to_sdk:
+                    cell: int = installed[to_sdk]
+                else:
+                    cell: int = uninstalled[from_sdk] & installed[to_sdk]
+
+                row_numbers.append(cell.bit_count())
+
+            cell: int = (
+                (uninstalled[from_sdk]
+                 & (installed_other_to1 | apps_without_installed))
+                | installed_other_to2
+            )
+            if from_sdk not in to_indices:
+                cell |= installed[from_sdk]
+
+            row_numbers.append(cell.bit_count())
+            numbers.append(row_numbers)
+
+        row_numbers: list[int] = []
+        for to_sdk in to_indices:
+            cell: int = installed[to_sdk]
+            if to_sdk in from_indices:
+                cell &= uninstalled_other_from
+
+            row_numbers.append(cell.bit_count())
+
+        cell: int = (
+            (installed_other_to1
+             & (uninstalled_other_from | installed_other_to2))
+            | installed_unselected
+            | (apps_without_installed & uninstalled_other_from)
+            | apps_without_sdk_rows
+        )
+        row_numbers.append(cell.bit_count())
+        numbers.append(row_numbers)
+
+        return selections.expand_numbers(numbers, from_indices, to_indices,
+                                         from_sdks, to_sdks)
+
+    def _get_installed(self, sdk: int) -> int:
+        bitset: bitsets.PackedBitset | None = self._installed.get(sdk)
+        return bitset.to_int() if bitset is not None else 0
+
+    def _get_uninstalled(self, sdk: int) -> int:
+        bitset: bitsets.PackedBitset | None = self._uninstalled.get(sdk)
+        return bitset.to_int() if bitset is not None else 0
+
+    def _get_apps_with_more(self,
+                            counter: list[int],
+                            other_counter: list[int],
+                            difference: int) -> int:
+        # Returns the apps where `counter` is greater than `other_counter`
+        # by at least `difference`.
+        threshold: list[int] = bitsets.add_counters(
+            other_counter,
+            bitsets.counter_from_constant(difference, self._num_apps)
+        )
+        return bitsets.greater_equal(counter, threshold, self._num_apps)
+
+
+def compute_numbers(from_sdks: list[int],
+                    to_sdks: list[int]) -> list[list[int]]:
+    """
+    Computes the competitive matrix from the bitmap index. The index gets
+    loaded on first use, and reloaded whenever the database changes.
+    """
+    index: BitmapIndex = versioning.get_versioned(_VERSIONED_KEY, load_index)
+    return index.compute_numbers(from_sdks, to_sdks)
+
+
+def load_index() -> BitmapIndex:
+    """
+    Loads the bitmap index from the `app` and `app_sdk` tables.
+    """
+    app_positions: dict[int, int] = {
+        app_id: position
+        for position, app_id in enumerate(
+            db.session.execute(
+                db.select(models.App.id).order_by(models.App.id)
+            ).scalars()
+        )
+    }
+
+    installed_positions: dict[int, list[int]] = {}
+    uninstalled_positions: dict[int, list[int]] = {}
+    num_installed: list[int] = [0] * len(app_positions)
+    num_uninstalled: list[int] = [0] * len(app_positions)
+    positions_with_sdk_rows: set[int] = set()
+
+    rows_query: Select = (
+        db
+        .select(models.AppSDK.app_id,
+                models.AppSDK.sdk_id,
+                models.AppSDK.installed)
+        .execution_options(yield_per=_LOAD_BATCH_SIZE)
+    )
+    for app_id, sdk_id, is_installed in db.session.execute(rows_query):
+        position: int | None = app_positions.get(app_id)
+        if position is None:
+            # The `app_sdk` table may refer to apps that are not in the `app`
+            # table. They still count in the matrix.
+            position = len(app_positions)
+            app_positions[app_id] = position
+            num_installed.append(0)
+            num_uninstalled.append(0)
+
+        positions_with_sdk_rows.add(position)
+        if is_installed:
+            installed_positions.setdefault(sdk_id, []).append(position)
+            num_installed[position] += 1
+        elif is_installed is not None:
+            uninstalled_positions.setdefault(sdk_id, []).append(position)
+            num_uninstalled[position] += 1
+
+    num_apps: int = len(app_positions)
+    return BitmapIndex(
+        num_apps,
+        {
+            sdk_id: bitsets.PackedBitset(positions, num_apps)
+            for sdk_id, positions in installed_positions.items()
+        },
+        {
+            sdk_id: bitsets.PackedBitset(positions, num_apps)
+            for sdk_id, positions in uninstalled_positions.items()
+        },
+        bitsets.counter_from_counts(num_installed),
+        bitsets.counter_from_counts(num_uninstalled),
+        bitsets.from_positions(positions_with_sdk_rows, num_apps)
+    )
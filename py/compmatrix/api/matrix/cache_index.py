@@ -0,0 +1,119 @@
+import threading
+import typing
+
+# The keys of the cache of matrices: the data version, the name of the
+# engine, and the sorted "from" and "to" SDKs of the matrix.
+MatrixKey = tuple[object, str, tuple[int, ...], tuple[int, ...]]
+
+
+class CachedMatrixIndex:
+    """
+    Finds the keys of the cached matrices that have a given cell, without
+    going through all of them. The numbers between two SDKs are in every
+    matrix with both SDKs, while the numbers in the "(none)" row and column
+    are only in the matrices with the exact same "from" or "to" SDKs.
+
+    Keys don't get removed when their matrices get evicted from the cache,
+    so the matrices of the keys that get found may be gone already. Call
+    `retain()` with the keys that are still cached every so often.
+    """
+
+    def __init__(self):
+        self._keys: set[MatrixKey] = set()
+
+        # Dicts are used as ordered sets of keys.
+        self._keys_by_from_sdk: dict[int, dict[MatrixKey, None]] = {}
+        self._keys_by_to_sdk: dict[int, dict[MatrixKey, None]] = {}
+        self._keys_by_from_sdks: dict[tuple[int, ...],
+                                      dict[MatrixKey, None]] = {}
+        self._keys_by_to_sdks: dict[tuple[int, ...],
+                                    dict[MatrixKey, None]] = {}
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, key: MatrixKey):
+        with self._lock:
+            if key in self._keys:
+                return
+
+            self._keys.add(key)
+
+            _, _, from_sdks, to_sdks = key
+            for sdk in from_sdks:
+                self._keys_by_from_sdk.setdefault(sdk, {})[key] = None
+            for sdk in to_sdks:
+                self._keys_by_to_sdk.setdefault(sdk, {})[key] = None
+
+            self._keys_by_from_sdks.setdefault(from_sdks, {})[key] = None
+            self._keys_by_to_sdks.setdefault(to_sdks, {})[key] = None
+
+    def find(self,
+             from_sdk: int | None,
+             to_sdk: int | None,
+             sorted_from_sdks: tuple[int, ...],
+             sorted_to_sdks: tuple[int, ...]) -> list[MatrixKey]:
+        """
+        Returns the keys of the matrices that have the given cell.
+
+        :param from_sdk: The "from" SDK of the cell, or None for the "(none)"
+                         row.
+        :param to_sdk: The "to" SDK of the cell, or None for the "(none)"
+                       column.
+        :param sorted_from_sdks: The sorted "from" SDKs of the matrix. Only
+                                 used for the "(none)" row.
+        :param sorted_to_sdks: The sorted "to" SDKs of the matrix. Only used
+                               for the "(none)" column.
+        :return: The keys, from the least to the most recently added one.
+        """
+        with self._lock:
+            if from_sdk is None:
+                from_keys: dict[MatrixKey, None] = (
+                    self._keys_by_from_sdks.get(sorted_from_sdks, {}))
+            else:
+                from_keys: dict[MatrixKey, None] = (
+                    self._keys_by_from_sdk.get(from_sdk, {}))
+
+            if to_sdk is None:
+                to_keys: dict[MatrixKey, None] = (
+                    self._keys_by_to_sdks.get(sorted_to_sdks, {}))
+            else:
+                to_keys: dict[MatrixKey, None] = (
+                    self._keys_by_to_sdk.get(to_sdk, {}))
+
+            if len(from_keys) <= len(to_keys):
+                return [key for key in from_keys if key in to_keys]
+            else:
+                return [key for key in to_keys if key in from_keys]
+
+    def retain(self, keys: typing.Iterable[MatrixKey]):
+        """
+        Removes every key that isn't one of the given keys.
+        """
+        kept_keys: set[MatrixKey] = set(keys)
+        with self._lock:
+            for key in self._keys - kept_keys:
+                self._remove(key)
+
+    def _remove(self, key: MatrixKey):
+        self._keys.remove(key)
+
+        _, _, from_sdks, to_sdks = key
+        for sdk in from_sdks:
+            self._discard_from(self._keys_by_from_sdk, sdk, key)
+        for sdk in to_sdks:
+            self._discard_from(self._keys_by_to_sdk, sdk, key)
+
+        self._discard_from(self._keys_by_from_sdks, from_sdks, key)
+        self._discard_from(self._keys_by_to_sdks, to_sdks, key)
+
+    @staticmethod
+    def _discard_from(keys_by_sdks: dict[object, dict[MatrixKey, None]],
+                      sdks: object,
+                      key: MatrixKey):
+        keys: dict[MatrixKey, None] = keys_by_sdks[sdks]
+        del keys[key]
+        if not keys:
+            del keys_by_sdks[sdks]
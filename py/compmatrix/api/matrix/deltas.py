@@ -0,0 +1,168 @@
+import dataclasses
+import typing
+
+from sqlalchemy import Delete, Select
+from sqlalchemy.dialects import sqlite
+
+from compmatrix import db
+from compmatrix.api import matrix, models, versioning
+from compmatrix.api.matrix import signatures
+
+
+@dataclasses.dataclass(frozen=True)
+class AppSDKChange:
+    """
+    A change to a row of `app_sdk`. Rows that don't exist yet get inserted,
+    while existing rows get updated.
+    """
+    app_id: int
+    sdk_id: int
+    # None if the row got deleted.
+    installed: bool | None
+
+
+def apply_changes(changes: list[AppSDKChange]) -> bool:
+    """
+    Applies the changes to `app_sdk`, and commits them. The structures that
+    were computed from the data before the changes get updated with just the
+    changes, instead of getting rebuilt:
+
+    * The `sdk_transition` table gets updated by its triggers, if it exists.
+    * The signature histogram gets the signatures of the affected apps moved.
+    * The cached matrices get the changes of their numbers added.
+
+    The work done only depends on the number of changed rows, and on the
+    number of SDKs of the affected apps. Structures that can't be updated,
+    like the bitmap index, get rebuilt on their next use.
+
+    Changes to the same row are applied in order, so the last one wins.
+
+    :param changes: The changes to `app_sdk`.
+    :return: Whether the structures got updated. They get rebuilt instead if
+             other changes got committed to the database at the same time.
+    """
+    base: versioning.CommitBase | None = versioning.get_commit_base()
+
+    affected_apps: set[int] = {c.app_id for c in changes}
+    old_rows: dict[int, dict[int, bool]] = _get_sdk_rows(affected_apps)
+    new_rows: dict[int, dict[int, bool]] = {
+        app_id: dict(sdk_rows) for app_id, sdk_rows in old_rows.items()
+    }
+    for change in changes:
+        sdk_rows: dict[int, bool] = new_rows.setdefault(change.app_id, {})
+        if change.installed is None:
+            sdk_rows.pop(change.sdk_id, None)
+        else:
+            sdk_rows[change.sdk_id] = change.installed
+
+    histogram_changes: signatures.SignatureHistogram = _get_histogram_changes(
+        affected_apps, old_rows, new_rows)
+
+    updaters: dict[str,
+                   typing.Callable[[object, versioning.DataVersion],
+                                   object]] = {
+        signatures.VERSIONED_KEY: _create_histogram_updater(histogram_changes)
+    }
+    if base is not None:
+        updaters[matrix.NUMBERS_CACHE_KEY] = (
+            matrix.create_numbers_cache_updater(
+                base.version, histogram_changes.compute_numbers)
+        )
+
+    for change in changes:
+        db.session.execute(_get_change_statement(change))
+
+    db.session.commit()
+
+    return versioning.advance_versioned(base, updaters)
+
+
+def _get_sdk_rows(app_ids: set[int]) -> dict[int, dict[int, bool]]:
+    query: Select = (
+        db
+        .select(models.AppSDK.app_id,
+                models.AppSDK.sdk_id,
+                models.AppSDK.installed)
+        .where(models.AppSDK.app_id.in_(app_ids))
+    )
+
+    sdk_rows: dict[int, dict[int, bool]] = {}
+    for app_id, sdk_id, installed in db.session.execute(query):
+        sdk_rows.setdefault(app_id, {})[sdk_id] = bool(installed)
+
+    return sdk_rows
+
+
+def _get_histogram_changes(
+        app_ids: set[int],
+        old_rows: dict[int, dict[int, bool]],
+        new_rows: dict[int, dict[int, bool]]
+) -> signatures.SignatureHistogram:
+    # Holds the change in the number of apps of each signature, so computing
+    # the matrix from it gives the change of the numbers of the matrix.
+    signature_count_changes: dict[signatures.Signature, int] = {}
+    num_apps_without_sdks_change: int = 0
+    for app_id in app_ids:
+        for sdk_rows, change in [(old_rows.get(app_id), -1),
+                                 (new_rows.get(app_id), 1)]:
+            if sdk_rows:
+                signature: signatures.Signature = _get_signature(sdk_rows)
+                signature_count_changes[signature] = (
+                    signature_count_changes.get(signature, 0) + change)
+            else:
+                num_apps_without_sdks_change += change
+
+    return signatures.SignatureHistogram(
+        {s: c for s, c in signature_count_changes.items() if c != 0},
+        num_apps_without_sdks_change
+    )
+
+
+def _get_signature(sdk_rows: dict[int, bool]) -> signatures.Signature:
+    return (
+        frozenset(s for s, installed in sdk_rows.items() if not installed),
+        frozenset(s for s, installed in sdk_rows.items() if installed)
+    )
+
+
+def _create_histogram_updater(
+        histogram_changes: signatures.SignatureHistogram
+) -> typing.Callable[[object, versioning.DataVersion], object]:
+    def update(histogram: signatures.SignatureHistogram,
+               new_version: versioning.DataVersion
+               ) -> signatures.SignatureHistogram:
+        histogram.apply_changes(histogram_changes.signature_counts,
+                                histogram_changes.num_apps_without_sdks)
+        signatures.save_histogram(histogram, new_version)
+
+        return histogram
+
+    return update
+
+
+def _get_change_statement(change: AppSDKChange) -> Delete | sqlite.Insert:
+    if change.installed is None:
+        return (
+            db
+            .delete(models.AppSDK)
+            .where(
+                db.and_(
+                    models.AppSDK.app_id == change.app_id,
+                    models.AppSDK.sdk_id == change.sdk_id
+                )
+            )
+        )
+
+    # An upsert fires the update triggers of `app_sdk` when the row already
+    # exists, and the insert triggers otherwise.
+    return (
+        sqlite
+        .insert(models.AppSDK)
+        .values(app_id=change.app_id,
+                sdk_id=change.sdk_id,
+                installed=change.installed)
+        .on_conflict_do_update(
+            index_elements=['app_id', 'sdk_id'],
+            set_={'installed': change.installed}
+        )
+    )
@@ -0,0 +1,105 @@
+import dataclasses
+from enum import Enum
+
+from compmatrix.api.matrix import selections
+
+
+class Normalization(Enum):
+    NONE = 'none'
+    ROW = 'row'
+    COLUMN = 'column'
+
+
+@dataclasses.dataclass(frozen=True)
+class SDKMetrics:
+    """
+    Metrics of an SDK that is both a "from" and a "to" SDK of a matrix. The
+    rates are None when no apps are in the row of the SDK.
+    """
+    # Share of the row of the SDK that stayed with the SDK.
+    retention_rate: float | None
+    # Share of the row of the SDK that went to the other columns.
+    churn_rate: float | None
+    # Apps that came from the other rows, minus the apps that went to the
+    # other columns.
+    net_acquisition: int
+
+
+@dataclasses.dataclass(frozen=True)
+class MatrixRow:
+    """
+    A row of a competitive matrix, together with its normalized numbers.
+    """
+    # None for the "(none)" row.
+    from_sdk: int | None
+    numbers: list[int]
+    row_normalized: list[float]
+    column_normalized: list[float]
+
+
+@dataclasses.dataclass(frozen=True)
+class MatrixNumbers:
+    """
+    The numbers of a competitive matrix, together with the numbers derived
+    from them.
+    """
+    numbers: list[list[int]]
+    row_normalized: list[list[float]]
+    column_normalized: list[list[float]]
+    # Only has the SDKs that are both "from" and "to" SDKs.
+    sdk_metrics: dict[int, SDKMetrics]
+
+
+def derive_numbers(numbers: list[list[int]],
+                   from_sdks: list[int],
+                   to_sdks: list[int]) -> MatrixNumbers:
+    """
+    Computes the normalized matrices and the SDK metrics of a matrix. The row
+    and column sums are computed once and shared by everything else. Rows and
+    columns without apps are normalized to zeroes.
+
+    :param numbers: The matrix for the distinct SDKs, with the "(none)" row
+                    and column at the end.
+    :param from_sdks: The distinct "from" SDKs, in the order of the rows.
+    :param to_sdks: The distinct "to" SDKs, in the order of the columns.
+    :return: The matrix and its derived numbers.
+    """
+    row_sums: list[int] = [sum(row) for row in numbers]
+    col_sums: list[int] = [sum(col) for col in zip(*numbers)]
+
+    row_normalized: list[list[float]] = [
+        [n / row_sum for n in row] if row_sum else [0.0] * len(row)
+        for row, row_sum in zip(numbers, row_sums)
+    ]
+    column_normalized: list[list[float]] = [
+        [
+            n / col_sum if col_sum else 0.0
+            for n, col_sum in zip(row, col_sums)
+        ]
+        for row in numbers
+    ]
+
+    to_indices: dict[int, int] = selections.get_distinct_indices(to_sdks)
+    sdk_metrics: dict[int, SDKMetrics] = {}
+    for row, sdk in enumerate(from_sdks):
+        col: int | None = to_indices.get(sdk)
+        if col is None:
+            continue
+
+        num_retained: int = numbers[row][col]
+        row_sum: int = row_sums[row]
+        if row_sum:
+            retention_rate: float | None = num_retained / row_sum
+            churn_rate: float | None = (row_sum - num_retained) / row_sum
+        else:
+            retention_rate: None = None
+            churn_rate: None = None
+
+        sdk_metrics[sdk] = SDKMetrics(retention_rate,
+                                      churn_rate,
+                                      col_sums[col] - row_sum)
+
+    return MatrixNumbers(numbers,
+                         row_normalized,
+                         column_normalized,
+                         sdk_metrics)
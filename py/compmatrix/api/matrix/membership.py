@@ -0,0 +1,220 @@
+import typing
+
+from sqlalchemy import ColumnElement, Select, TextClause
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.views import queries
+
+# The triggers keep the `app_sdk_count` table up-to-date whenever `app_sdk`
+# changes, by only adjusting the counts of the affected app. An update is
+# handled like a deletion of the old row followed by an insertion of the new
+# one. Apps whose counts drop to zero are kept, and are treated the same as
+# apps without any rows.
+_TRIGGERS: typing.Final[list[str]] = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS app_sdk_count_app_sdk_insert
+    AFTER INSERT ON app_sdk
+    BEGIN
+        INSERT INTO app_sdk_count (app_id, num_installed, num_uninstalled)
+        VALUES (
+            NEW.app_id,
+            CASE WHEN NEW.installed = 1 THEN 1 ELSE 0 END,
+            CASE WHEN NEW.installed = 1 THEN 0 ELSE 1 END
+        )
+        ON CONFLICT (app_id)
+        DO UPDATE SET
+            num_installed = num_installed + excluded.num_installed,
+            num_uninstalled = num_uninstalled + excluded.num_uninstalled;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS app_sdk_count_app_sdk_delete
+    AFTER DELETE ON app_sdk
+    BEGIN
+        UPDATE app_sdk_count
+        SET
+            num_installed = num_installed
+                - CASE WHEN OLD.installed = 1 THEN 1 ELSE 0 END,
+            num_uninstalled = num_uninstalled
+                - CASE WHEN OLD.installed = 1 THEN 0 ELSE 1 END
+        WHERE app_id = OLD.app_id;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS app_sdk_count_app_sdk_update
+    AFTER UPDATE OF app_id, installed ON app_sdk
+    BEGIN
+        UPDATE app_sdk_count
+        SET
+            num_installed = num_installed
+                - CASE WHEN OLD.installed = 1 THEN 1 ELSE 0 END,
+            num_uninstalled = num_uninstalled
+                - CASE WHEN OLD.installed = 1 THEN 0 ELSE 1 END
+        WHERE app_id = OLD.app_id;
+
+        INSERT INTO app_sdk_count (app_id, num_installed, num_uninstalled)
+        VALUES (
+            NEW.app_id,
+            CASE WHEN NEW.installed = 1 THEN 1 ELSE 0 END,
+            CASE WHEN NEW.installed = 1 THEN 0 ELSE 1 END
+        )
+        ON CONFLICT (app_id)
+        DO UPDATE SET
+            num_installed = num_installed + excluded.num_installed,
+            num_uninstalled = num_uninstalled + excluded.num_uninstalled;
+    END
+    '''
+]
+
+
+def create_table():
+    """
+    Creates the `app_sdk_count` table, along with the triggers that keep it
+    up-to-date and the indexes of `app_sdk` that the cell conditions use, if
+    they don't exist yet.
+    """
+    models.AppSDKCount.__table__.create(db.session.connection(),
+                                        checkfirst=True)
+    for index in models.AppSDK.__table__.indexes:
+        index.create(db.session.connection(), checkfirst=True)
+
+    for trigger in _TRIGGERS:
+        db.session.execute(db.text(trigger))
+
+
+def rebuild_table():
+    """
+    Recomputes the entire `app_sdk_count` table from `app_sdk`.
+    """
+    db.session.execute(db.delete(models.AppSDKCount))
+    db.session.execute(_get_rebuild_query())
+
+
+def get_cell_condition(from_sdk_id: int | None,
+                       to_sdk_id: int | None,
+                       other_from_sdks_ids: list[int],
+                       other_to_sdks_ids: list[int]) -> ColumnElement:
+    """
+    Creates the condition that an app in `app` must meet to be in a cell of
+    the competitive matrix. The cell is specified the same way as in the
+    `/sdk-compmatrix/apps` endpoint, where None is the "(none)" SDK. The
+    apps it selects are the same as the ones selected by the per-cell queries
+    in `compmatrix.api.views.queries`.
+
+    Each app gets checked on its own with index lookups, instead of grouping
+    all of `app_sdk`, so only the apps that get looked at are paid for. The
+    `app_sdk_count` table must have been built with `rebuild_table()`.
+    """
+    num_installed: ColumnElement = _get_num_sdks_of_app(True)
+    num_uninstalled: ColumnElement = _get_num_sdks_of_app(False)
+    if from_sdk_id is not None and to_sdk_id is not None:
+        if from_sdk_id == to_sdk_id:
+            return _has_sdk(to_sdk_id, True)
+
+        return db.and_(_has_sdk(from_sdk_id, False),
+                       _has_sdk(to_sdk_id, True))
+
+    if from_sdk_id is not None:
+        # The SDK to "(none)" cells. See `profiles.tally_profiles()` for how
+        # the counts come into play.
+        num_installed_other_to: ColumnElement = (
+            num_installed - _count_sdks_in(other_to_sdks_ids, True))
+        conditions: list[ColumnElement] = [
+            num_installed_other_to >= 2,
+            db.and_(
+                _has_sdk(from_sdk_id, False),
+                db.or_(num_installed_other_to >= 1, num_installed == 0)
+            )
+        ]
+        if from_sdk_id not in other_to_sdks_ids:
+            conditions.append(_has_sdk(from_sdk_id, True))
+
+        return db.or_(*conditions)
+
+    num_uninstalled_other_from: ColumnElement = (
+        num_uninstalled - _count_sdks_in(other_from_sdks_ids, False))
+    if to_sdk_id is not None:
+        if to_sdk_id not in other_from_sdks_ids:
+            return _has_sdk(to_sdk_id, True)
+
+        return db.and_(_has_sdk(to_sdk_id, True),
+                       num_uninstalled_other_from >= 1)
+
+    num_installed_other_to: ColumnElement = (
+        num_installed - _count_sdks_in(other_to_sdks_ids, True))
+    num_installed_unselected: ColumnElement = (
+        num_installed
+        - _count_sdks_in(list(set(other_from_sdks_ids + other_to_sdks_ids)),
+                         True)
+    )
+    return db.or_(
+        num_installed + num_uninstalled == 0,
+        num_installed_unselected >= 1,
+        db.and_(num_installed_other_to >= 1,
+                num_installed_other_to + num_uninstalled_other_from >= 2),
+        db.and_(num_installed == 0, num_uninstalled_other_from >= 1)
+    )
+
+
+def _get_num_sdks_of_app(installed: bool) -> ColumnElement:
+    column: ColumnElement = (
+        models.AppSDKCount.num_installed
+        if installed
+        else models.AppSDKCount.num_uninstalled
+    )
+    query: Select = (
+        db
+        .select(column)
+        .where(models.AppSDKCount.app_id == models.App.id)
+    )
+
+    # Apps without any rows in `app_sdk` don't have counts.
+    return db.func.coalesce(query.scalar_subquery(), 0)
+
+
+def _count_sdks_in(sdk_ids: list[int], installed: bool) -> ColumnElement:
+    if not sdk_ids:
+        return db.literal(0)
+
+    return (
+        db
+        .select(db.func.count('*'))
+        .select_from(models.AppSDK)
+        .where(
+            db.and_(
+                models.AppSDK.app_id == models.App.id,
+                models.AppSDK.installed == installed,
+                models.AppSDK.sdk_id.in_(
+                    queries.get_sdk_ids_selection(sdk_ids))
+            )
+        )
+        .scalar_subquery()
+    )
+
+
+def _has_sdk(sdk_id: int, installed: bool) -> ColumnElement:
+    return (
+        db
+        .select(models.AppSDK.app_id)
+        .where(
+            db.and_(
+                models.AppSDK.app_id == models.App.id,
+                models.AppSDK.sdk_id == sdk_id,
+                models.AppSDK.installed == installed
+            )
+        )
+        .exists()
+    )
+
+
+def _get_rebuild_query() -> TextClause:
+    return db.text(
+        'INSERT INTO app_sdk_count (app_id, num_installed, num_uninstalled) '
+        'SELECT '
+        '    app_id, '
+        '    SUM(CASE WHEN installed = 1 THEN 1 ELSE 0 END), '
+        '    SUM(CASE WHEN installed = 1 THEN 0 ELSE 1 END) '
+        'FROM app_sdk '
+        'GROUP BY app_id'
+    )
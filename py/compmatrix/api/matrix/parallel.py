@@ -0,0 +1,151 @@
+import os
+import queue
+import threading
+import typing
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+import sqlalchemy
+from flask import Flask, current_app
+from sqlalchemy import Select
+
+from compmatrix import db
+from compmatrix.api.matrix import per_cell
+
+_EXTENSION_KEY: typing.Final[str] = 'compmatrix.matrix.parallel'
+_EXTENSION_CREATION_LOCK: threading.Lock = threading.Lock()
+
+
+class _CellExecutor:
+    """
+    Runs the per-cell queries on a pool of threads. The scoped session of
+    Flask-SQLAlchemy can't be shared between threads, so the queries run on
+    read-only connections of their own instead. SQLite lets go of the GIL
+    while it runs a query, so the queries really do run in parallel.
+    """
+
+    def __init__(self, db_path: str, num_workers: int):
+        # Each matrix holds on to up to `num_workers` connections, so
+        # matrices that get computed at the same time need more of them.
+        self._engine = sqlalchemy.create_engine(
+            f'sqlite:///file:{db_path}?mode=ro&uri=true',
+            pool_size=num_workers,
+            max_overflow=-1)
+        self._num_workers = num_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_workers,
+            thread_name_prefix='compmatrix-cells')
+
+    def compute_numbers(self,
+                        from_sdks: list[int],
+                        to_sdks: list[int]) -> list[list[int]]:
+        count_queries: list[list[Select]] = per_cell.get_count_queries(
+            from_sdks, to_sdks)
+        num_cells: int = sum(len(row) for row in count_queries)
+
+        connections: queue.SimpleQueue[sqlalchemy.Connection] = (
+            queue.SimpleQueue())
+        opened_connections: list[sqlalchemy.Connection] = []
+        futures: list[list[Future]] = []
+        try:
+            # Every cell should read the same data, like the cells of a
+            # single query would. So, every connection starts reading before
+            # any cell gets counted, and keeps reading until all of them are.
+            # The shared lock of a reading connection keeps the other
+            # connections from committing changes in the meantime.
+            for _ in range(min(self._num_workers, num_cells)):
+                connection: sqlalchemy.Connection = self._engine.connect()
+                opened_connections.append(connection)
+                connection.exec_driver_sql('BEGIN')
+                connection.exec_driver_sql(
+                    'SELECT count(*) FROM sqlite_master')
+                connections.put(connection)
+
+            futures = [
+                [self._executor.submit(self._count, query, connections)
+                 for query in row]
+                for row in count_queries
+            ]
+
+            # Getting the results in order means that we raise the same
+            # error that the sequential per-cell engine would have raised.
+            return [[future.result() for future in row] for row in futures]
+        finally:
+            # The connections can only be let go of once none of the
+            # remaining cells are using them.
+            for row in futures:
+                for future in row:
+                    future.cancel()
+            wait([f for row in futures for f in row])
+
+            for connection in opened_connections:
+                connection.close()
+
+    def close(self):
+        """
+        Waits for the queries that are running, and closes every connection.
+        """
+        self._executor.shutdown(cancel_futures=True)
+        self._engine.dispose()
+
+    @staticmethod
+    def _count(query: Select,
+               connections: queue.SimpleQueue[sqlalchemy.Connection]) -> int:
+        connection: sqlalchemy.Connection = connections.get()
+        try:
+            return connection.execute(query).scalar_one()
+        finally:
+            connections.put(connection)
+
+
+def compute_numbers(from_sdks: list[int],
+                    to_sdks: list[int]) -> list[list[int]]:
+    """
+    Computes the competitive matrix by running the per-cell queries in
+    parallel, with `COMPMATRIX_NUMBERS_WORKERS` threads. The numbers, and any
+    errors raised, are the same as the ones of the per-cell engine. Every
+    cell reads the same data, even if changes get committed while the matrix
+    is being computed.
+    """
+    executor: _CellExecutor | None = _get_executor()
+    if executor is None:
+        # Other connections can't see an in-memory database.
+        return per_cell.compute_numbers(from_sdks, to_sdks)
+
+    return executor.compute_numbers(from_sdks, to_sdks)
+
+
+def _get_executor() -> _CellExecutor | None:
+    db_path: str | None = db.engine.url.database
+    if not db_path or db_path == ':memory:':
+        return None
+
+    app = current_app._get_current_object()
+    if _EXTENSION_KEY not in app.extensions:
+        with _EXTENSION_CREATION_LOCK:
+            if _EXTENSION_KEY not in app.extensions:
+                num_workers: int = (app.config['COMPMATRIX_NUMBERS_WORKERS']
+                                    or os.cpu_count()
+                                    or 1)
+                executor: _CellExecutor = _CellExecutor(db_path, num_workers)
+                app.extensions[_EXTENSION_KEY] = executor
+
+                # Also closes the executor when the app gets garbage
+                # collected, or when the interpreter exits.
+                weakref.finalize(app, executor.close)
+
+    return app.extensions[_EXTENSION_KEY]
+
+
+def close_executor(app: Flask):
+    """
+    Stops the threads of the parallel per-cell engine of the given app, and
+    closes their connections to the database. The engine starts over the
+    next time it gets used.
+    """
+    with _EXTENSION_CREATION_LOCK:
+        executor: _CellExecutor | None = app.extensions.pop(_EXTENSION_KEY,
+                                                            None)
+
+    if executor is not None:
+        executor.close()
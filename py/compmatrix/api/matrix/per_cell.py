@@ -0,0 +1,91 @@
+from sqlalchemy.sql.selectable import Select
+
+from compmatrix import db
+from compmatrix.api.views import queries
+
+
+def compute_numbers(from_sdks: list[int],
+                    to_sdks: list[int]) -> list[list[int]]:
+    """
+    Computes the competitive matrix by running one query per cell. This is
+    the slowest engine, but its queries define what goes into each cell. The
+    other engines must produce the exact same numbers as this one.
+    """
+    return [
+        [db.session.execute(query).scalar_one() for query in row_queries]
+        for row_queries in get_count_queries(from_sdks, to_sdks)
+    ]
+
+
+def get_count_queries(from_sdks: list[int],
+                      to_sdks: list[int]) -> list[list[Select]]:
+    """
+    Returns the query that counts the apps of each cell of the competitive
+    matrix, laid out like the matrix itself.
+    """
+    count_queries: list[list[Select]] = []
+    for from_sdk in from_sdks:
+        from_sdk_id: int = from_sdk
+        row_queries: list[Select] = []
+
+        # Get the numbers of apps from and to SDKs.
+        for to_sdk in to_sdks:
+            to_sdk_id: int = to_sdk
+            row_queries.append(
+                _get_count_query_for_from_to_sdks(from_sdk_id, to_sdk_id))
+
+        # And we're gonna add a column for "(none)", since we're also gonna
+        # count apps that used to have SDKs installed.
+        row_queries.append(
+            _get_count_query_for_from_sdk_to_none(from_sdk_id, to_sdks))
+
+        count_queries.append(row_queries)
+
+    # We're gonna have to add a row for apps with no SDKs and whose SDKs that
+    # were not specified.
+    row_queries: list[Select] = []
+    for to_sdk_id in to_sdks:
+        row_queries.append(
+            _get_count_query_for_none_to_to_sdk(to_sdk_id, from_sdks))
+
+    # And then make a column for "(none)" again, since the apps that no
+    # longer have SDKs installed are still counted.
+    row_queries.append(_get_count_query_for_none_to_none(from_sdks, to_sdks))
+
+    count_queries.append(row_queries)
+
+    return count_queries
+
+
+def _get_count_query_for_from_to_sdks(from_sdk_id: int,
+                                      to_sdk_id: int) -> Select:
+    query: Select = queries.get_query_for_from_to_sdks(from_sdk_id, to_sdk_id)
+    return db.select(db.func.count('*')).select_from(query.subquery())
+
+
+def _get_count_query_for_from_sdk_to_none(
+        from_sdk_id: int,
+        other_to_sdks_ids: list[int]
+) -> Select:
+    query: Select = queries.get_query_for_from_sdk_to_none(
+        from_sdk_id,
+        other_to_sdks_ids)
+    return db.select(db.func.count('*')).select_from(query.subquery())
+
+
+def _get_count_query_for_none_to_to_sdk(
+        to_sdk_id: int,
+        other_from_sdks_param: list[int]
+) -> Select:
+    query: Select = queries.get_query_for_none_to_to_sdk(to_sdk_id,
+                                                         other_from_sdks_param)
+    return db.select(db.func.count('*')).select_from(query.subquery())
+
+
+def _get_count_query_for_none_to_none(
+        other_from_sdks_param: list[int],
+        other_to_sdks_param: list[int]
+) -> Select:
+    query: Select = queries.get_query_for_none_to_none(other_from_sdks_param,
+                                                       other_to_sdks_param)
+    return db.select(db.func.count('*')).select_from(query.subquery())
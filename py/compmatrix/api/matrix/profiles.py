@@ -0,0 +1,118 @@
+import dataclasses
+import typing
+
+from compmatrix.api.matrix import selections
+
+
+@dataclasses.dataclass(frozen=True)
+class AppProfile:
+    """
+    A summary of the SDKs of a group of apps, relative to the SDKs selected
+    for a competitive matrix. It holds just enough information to know which
+    cells of the matrix the apps belong to.
+
+    The counts are expected to be capped at two, since the cell rules only
+    ever compare them against zero, one, or two.
+    """
+    # Selected "from" SDKs that the apps used to have installed.
+    uninstalled_from_sdks: frozenset[int]
+    # Selected "from" and "to" SDKs that the apps currently have installed.
+    installed_selected_sdks: frozenset[int]
+    # Number of installed SDKs that are not one of the "to" SDKs.
+    num_installed_other_to: int
+    # Number of uninstalled SDKs that are not one of the "from" SDKs.
+    num_uninstalled_other_from: int
+    # Whether the apps have an installed SDK that was not selected at all.
+    has_installed_unselected: bool
+    has_installed: bool
+    has_sdk_rows: bool
+    num_apps: int
+
+
+def tally_profiles(profiles: typing.Iterable[AppProfile],
+                   from_sdks: list[int],
+                   to_sdks: list[int]) -> list[list[int]]:
+    """
+    Creates the competitive matrix from app profiles. The rules used here
+    mirror the per-cell queries in `compmatrix.api.views.queries`, which
+    define what goes into each cell.
+
+    :param profiles: The app profiles, relative to `from_sdks` and `to_sdks`.
+    :param from_sdks: The IDs of the SDKs in the rows of the matrix.
+    :param to_sdks: The IDs of the SDKs in the columns of the matrix.
+    :return: The matrix, with the "(none)" row and column at the end.
+    """
+    from_indices: dict[int, int] = selections.get_distinct_indices(from_sdks)
+    to_indices: dict[int, int] = selections.get_distinct_indices(to_sdks)
+    none_row: int = len(from_indices)
+    none_col: int = len(to_indices)
+    numbers: list[list[int]] = [
+        [0] * (none_col + 1) for _ in range(none_row + 1)
+    ]
+
+    for profile in profiles:
+        num_apps: int = profile.num_apps
+        uninstalled: frozenset[int] = profile.uninstalled_from_sdks
+        installed: frozenset[int] = profile.installed_selected_sdks
+
+        for to_sdk in installed:
+            if to_sdk not in to_indices:
+                continue
+
+            col: int = to_indices[to_sdk]
+
+            # SDK to SDK. An app that still has the SDK installed is counted
+            # in the cell where the "from" and "to" SDKs are the same.
+            if to_sdk in from_indices:
+                numbers[from_indices[to_sdk]][col] += num_apps
+
+            for from_sdk in uninstalled:
+                numbers[from_indices[from_sdk]][col] += num_apps
+
+            # (none) to SDK.
+            if (to_sdk not in from_indices
+                    or profile.num_uninstalled_other_from >= 1):
+                numbers[none_row][col] += num_apps
+
+        # SDK to (none).
+        if profile.num_installed_other_to >= 2:
+            for row_numbers in numbers[:none_row]:
+                row_numbers[none_col] += num_apps
+        else:
+            rows: set[int] = set()
+            if (profile.num_installed_other_to >= 1
+                    or not profile.has_installed):
+                rows.update(from_indices[s] for s in uninstalled)
+
+            rows.update(
+                from_indices[s] for s in installed
+                if s in from_indices and s not in to_indices
+            )
+
+            for row in rows:
+                numbers[row][none_col] += num_apps
+
+        # (none) to (none).
+        if _is_none_to_none_profile(profile):
+            numbers[none_row][none_col] += num_apps
+
+    return selections.expand_numbers(numbers, from_indices, to_indices,
+                                     from_sdks, to_sdks)
+
+
+def _is_none_to_none_profile(profile: AppProfile) -> bool:
+    if not profile.has_sdk_rows:
+        return True
+
+    if profile.has_installed_unselected:
+        return True
+
+    num_other_sdks: int = (profile.num_installed_other_to
+                           + profile.num_uninstalled_other_from)
+    if profile.num_installed_other_to >= 1 and num_other_sdks >= 2:
+        return True
+
+    # Apps that no longer have any SDK installed, but used to have an SDK
+    # that does not have its own row.
+    return (not profile.has_installed
+            and profile.num_uninstalled_other_from >= 1)
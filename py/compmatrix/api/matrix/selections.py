@@ -0,0 +1,52 @@
+import typing
+
+
+def get_distinct_indices(sdks: list[int]) -> dict[int, int]:
+    """
+    Maps each distinct SDK to its index in the list of distinct SDKs, keeping
+    the order in which the SDKs first appear. Duplicate SDKs have the same
+    numbers in the matrix, so engines only need to compute them once.
+    """
+    return {sdk: i for i, sdk in enumerate(dict.fromkeys(sdks))}
+
+
+def expand_numbers(numbers: list[list[int]] | list[list[float]],
+                   from_indices: dict[int, int],
+                   to_indices: dict[int, int],
+                   from_sdks: list[int],
+                   to_sdks: list[int]) -> list[list[int]] | list[list[float]]:
+    """
+    Expands a matrix computed for the distinct SDKs into the matrix for the
+    SDKs as they were requested, including duplicates.
+
+    :param numbers: The matrix for the distinct SDKs, with the "(none)" row
+                    and column at the end.
+    :param from_indices: The row of each distinct "from" SDK.
+    :param to_indices: The column of each distinct "to" SDK.
+    :param from_sdks: The requested "from" SDKs.
+    :param to_sdks: The requested "to" SDKs.
+    :return: The expanded matrix.
+    """
+    return list(iter_expanded_rows(numbers,
+                                   from_indices,
+                                   to_indices,
+                                   from_sdks,
+                                   to_sdks))
+
+
+def iter_expanded_rows(
+        numbers: list[list[int]] | list[list[float]],
+        from_indices: dict[int, int],
+        to_indices: dict[int, int],
+        from_sdks: list[int],
+        to_sdks: list[int]
+) -> typing.Iterator[list[int] | list[float]]:
+    """
+    Like `expand_numbers()`, but only expands a row once it is needed.
+    """
+    none_row: int = len(from_indices)
+    none_col: int = len(to_indices)
+    row_order: list[int] = [from_indices[s] for s in from_sdks] + [none_row]
+    col_order: list[int] = [to_indices[s] for s in to_sdks] + [none_col]
+    for row in row_order:
+        yield [numbers[row][col] for col in col_order]
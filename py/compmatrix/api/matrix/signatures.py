@@ -0,0 +1,243 @@
+import json
+import os
+import threading
+import typing
+from pathlib import Path
+
+from flask import current_app
+
+from compmatrix import db
+from compmatrix.api import versioning
+from compmatrix.api.matrix import profiles
+from compmatrix.api.views import queries
+
+VERSIONED_KEY: typing.Final[str] = 'compmatrix.matrix.signatures'
+_FILE_FORMAT_VERSION: typing.Final[int] = 1
+
+# The SDKs an app used to have installed, and the SDKs it has installed.
+Signature = tuple[frozenset[int], frozenset[int]]
+
+
+class SignatureHistogram:
+    """
+    The number of apps that share each distinct signature. The signature of
+    an app is the set of SDKs it used to have installed together with the
+    set of SDKs it currently has installed. Many apps share a signature, so
+    computing the matrix from the histogram scales with the number of
+    distinct signatures instead of the number of apps.
+    """
+
+    def __init__(self,
+                 signature_counts: dict[Signature, int],
+                 num_apps_without_sdks: int):
+        self._signature_counts = signature_counts
+        self._num_apps_without_sdks = num_apps_without_sdks
+
+        # The histogram can be updated in-place by `apply_changes()`, while
+        # other threads are using it.
+        self._lock = threading.Lock()
+
+    @property
+    def signature_counts(self) -> dict[Signature, int]:
+        return self._signature_counts
+
+    @property
+    def num_apps_without_sdks(self) -> int:
+        return self._num_apps_without_sdks
+
+    def compute_numbers(self,
+                        from_sdks: list[int],
+                        to_sdks: list[int]) -> list[list[int]]:
+        with self._lock:
+            signature_counts: list[tuple[Signature, int]] = list(
+                self._signature_counts.items())
+            num_apps_without_sdks: int = self._num_apps_without_sdks
+
+        from_sdks_set: frozenset[int] = frozenset(from_sdks)
+        to_sdks_set: frozenset[int] = frozenset(to_sdks)
+        selected_sdks: frozenset[int] = from_sdks_set | to_sdks_set
+
+        app_profiles: list[profiles.AppProfile] = [
+            profiles.AppProfile(
+                uninstalled_from_sdks=uninstalled & from_sdks_set,
+                installed_selected_sdks=installed & selected_sdks,
+                num_installed_other_to=min(len(installed - to_sdks_set), 2),
+                num_uninstalled_other_from=min(
+                    len(uninstalled - from_sdks_set), 2),
+                has_installed_unselected=not installed <= selected_sdks,
+                has_installed=bool(installed),
+                has_sdk_rows=True,
+                num_apps=num_apps
+            )
+            for (uninstalled, installed), num_apps in signature_counts
+        ]
+        app_profiles.append(
+            profiles.AppProfile(
+                uninstalled_from_sdks=frozenset(),
+                installed_selected_sdks=frozenset(),
+                num_installed_other_to=0,
+                num_uninstalled_other_from=0,
+                has_installed_unselected=False,
+                has_installed=False,
+                has_sdk_rows=False,
+                num_apps=num_apps_without_sdks
+            )
+        )
+
+        return profiles.tally_profiles(app_profiles, from_sdks, to_sdks)
+
+    def apply_changes(self,
+                      signature_count_changes: dict[Signature, int],
+                      num_apps_without_sdks_change: int):
+        """
+        Adds the given changes to the number of apps of each signature, and
+        to the number of apps without SDKs. Signatures that no longer have
+        any apps get removed.
+        """
+        with self._lock:
+            for signature, change in signature_count_changes.items():
+                num_apps: int = (self._signature_counts.get(signature, 0)
+                                 + change)
+                if num_apps == 0:
+                    self._signature_counts.pop(signature, None)
+                else:
+                    self._signature_counts[signature] = num_apps
+
+            self._num_apps_without_sdks += num_apps_without_sdks_change
+
+    def to_dict(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                'signatures': [
+                    [sorted(uninstalled), sorted(installed), num_apps]
+                    for (uninstalled, installed), num_apps
+                    in self._signature_counts.items()
+                ],
+                'num_apps_without_sdks': self._num_apps_without_sdks
+            }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, object]) -> 'SignatureHistogram':
+        signature_counts: dict[Signature, int] = {
+            (frozenset(uninstalled), frozenset(installed)): num_apps
+            for uninstalled, installed, num_apps in data['signatures']
+        }
+        return cls(signature_counts, data['num_apps_without_sdks'])
+
+
+def compute_numbers(from_sdks: list[int],
+                    to_sdks: list[int]) -> list[list[int]]:
+    """
+    Computes the competitive matrix from the signature histogram. The
+    histogram is loaded on first use, and reloaded whenever the database
+    changes.
+    """
+    histogram: SignatureHistogram = versioning.get_versioned(VERSIONED_KEY,
+                                                             load_histogram)
+    return histogram.compute_numbers(from_sdks, to_sdks)
+
+
+def load_histogram() -> SignatureHistogram:
+    """
+    Loads the signature histogram from the file set in the
+    `COMPMATRIX_SIGNATURES_PATH` config. The histogram gets built from the
+    database, and saved to the file, if the file is missing or was built for
+    a different version of the database. Set the config to None to not use a
+    file at all.
+    """
+    path: str | None = current_app.config['COMPMATRIX_SIGNATURES_PATH']
+    version: versioning.DataVersion = versioning.get_data_version()
+    if path is not None:
+        histogram: SignatureHistogram | None = _read_histogram_file(
+            Path(path), version)
+        if histogram is not None:
+            return histogram
+
+    histogram: SignatureHistogram = build_histogram()
+    save_histogram(histogram, version)
+
+    return histogram
+
+
+def save_histogram(histogram: SignatureHistogram,
+                   version: versioning.DataVersion):
+    """
+    Saves the signature histogram to the file set in the
+    `COMPMATRIX_SIGNATURES_PATH` config, as the histogram of the given data
+    version. Nothing gets saved if the config is set to None.
+    """
+    path: str | None = current_app.config['COMPMATRIX_SIGNATURES_PATH']
+    if path is not None:
+        _write_histogram_file(Path(path), version, histogram)
+
+
+def build_histogram(max_app_hash: int | None = None) -> SignatureHistogram:
+    """
+    Builds the signature histogram from the database.
+
+    :param max_app_hash: Only counts the apps whose hash, from
+                         `queries.get_app_hash()`, is below this, if given.
+    """
+    signature_counts: dict[Signature, int] = {}
+    for uninstalled_ids, installed_ids, num_apps in db.session.execute(
+            queries.get_query_for_app_signatures(max_app_hash)):
+        signature: Signature = (
+            queries.parse_concatenated_ids(uninstalled_ids),
+            queries.parse_concatenated_ids(installed_ids)
+        )
+        signature_counts[signature] = (signature_counts.get(signature, 0)
+                                       + num_apps)
+
+    num_apps_without_sdks: int = db.session.execute(
+        queries.get_query_for_num_apps_without_sdks(max_app_hash)
+    ).scalar_one()
+
+    return SignatureHistogram(signature_counts, num_apps_without_sdks)
+
+
+def _read_histogram_file(
+        path: Path,
+        version: versioning.DataVersion
+) -> SignatureHistogram | None:
+    try:
+        with open(path, 'r') as f:
+            data: dict[str, object] = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # The `PRAGMA data_version` value only means something to the connection
+    # that got it, so we can only rely on the database file itself to know
+    # if the saved histogram is still up-to-date.
+    is_up_to_date: bool = (
+        data.get('format_version') == _FILE_FORMAT_VERSION
+        and data.get('db_file_mtime_ns') == version.file_mtime_ns
+        and data.get('db_file_size') == version.file_size
+    )
+    if not is_up_to_date:
+        return None
+
+    return SignatureHistogram.from_dict(data['histogram'])
+
+
+def _write_histogram_file(path: Path,
+                          version: versioning.DataVersion,
+                          histogram: SignatureHistogram):
+    data: dict[str, object] = {
+        'format_version': _FILE_FORMAT_VERSION,
+        'db_file_mtime_ns': version.file_mtime_ns,
+        'db_file_size': version.file_size,
+        'histogram': histogram.to_dict()
+    }
+
+    # Write to a temporary file first, so that other processes never read a
+    # partially-written file.
+    tmp_path: Path = path.with_name(f'{path.name}.tmp')
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+
+        os.replace(tmp_path, path)
+    except OSError:
+        # The histogram file is just there to speed up loading, so we can
+        # still go on without it.
+        pass
@@ -0,0 +1,32 @@
+from sqlalchemy import CompoundSelect
+
+from compmatrix import db
+from compmatrix.api.matrix import profiles
+from compmatrix.api.views import queries
+
+
+def compute_numbers(from_sdks: list[int],
+                    to_sdks: list[int]) -> list[list[int]]:
+    """
+    Computes the competitive matrix with a single query. The query groups
+    every app into a profile in one pass over `app_sdk`, and the profiles get
+    tallied into the cells here.
+    """
+    query: CompoundSelect = queries.get_query_for_matrix_profiles(from_sdks,
+                                                                  to_sdks)
+    app_profiles: list[profiles.AppProfile] = [
+        profiles.AppProfile(
+            uninstalled_from_sdks=queries.parse_concatenated_ids(row[0]),
+            installed_selected_sdks=queries.parse_concatenated_ids(row[1]),
+            num_installed_other_to=row[2],
+            num_uninstalled_other_from=row[3],
+            has_installed_unselected=bool(row[4]),
+            has_installed=bool(row[5]),
+            has_sdk_rows=bool(row[6]),
+            num_apps=row[7]
+        )
+        for row in db.session.execute(query)
+    ]
+
+    return profiles.tally_profiles(app_profiles, from_sdks, to_sdks)
+
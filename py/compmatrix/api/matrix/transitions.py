@@ -0,0 +1,198 @@
+import typing
+
+from sqlalchemy import Select, TextClause
+
+from compmatrix import db
+from compmatrix.api import models, tables
+
+# The triggers keep the `sdk_transition` table up-to-date whenever `app_sdk`
+# changes, by only adjusting the counts of the SDK pairs of the affected app.
+# An update is handled like a deletion of the old row followed by an
+# insertion of the new one. Pairs whose counts drop to zero are kept, since
+# they are likely to be used again, and they are treated the same as missing
+# pairs anyway.
+_TRIGGERS: typing.Final[list[str]] = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS sdk_transition_app_sdk_insert
+    AFTER INSERT ON app_sdk
+    BEGIN
+        INSERT INTO sdk_transition (from_sdk_id, to_sdk_id, app_count)
+        SELECT from_sdk_id, to_sdk_id, 1
+        FROM (
+            SELECT sdk_id AS from_sdk_id, NEW.sdk_id AS to_sdk_id
+            FROM app_sdk
+            WHERE
+                NEW.installed = 1
+                AND app_id = NEW.app_id
+                AND installed = 0
+            UNION ALL
+            SELECT NEW.sdk_id, sdk_id
+            FROM app_sdk
+            WHERE
+                NEW.installed = 0
+                AND app_id = NEW.app_id
+                AND installed = 1
+            UNION ALL
+            SELECT NEW.sdk_id, NEW.sdk_id
+            WHERE NEW.installed = 1
+        )
+        WHERE true
+        ON CONFLICT (from_sdk_id, to_sdk_id)
+        DO UPDATE SET app_count = app_count + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS sdk_transition_app_sdk_delete
+    AFTER DELETE ON app_sdk
+    BEGIN
+        UPDATE sdk_transition
+        SET app_count = app_count - 1
+        WHERE
+            (from_sdk_id, to_sdk_id) IN (
+                SELECT sdk_id, OLD.sdk_id
+                FROM app_sdk
+                WHERE
+                    OLD.installed = 1
+                    AND app_id = OLD.app_id
+                    AND installed = 0
+                UNION ALL
+                SELECT OLD.sdk_id, sdk_id
+                FROM app_sdk
+                WHERE
+                    OLD.installed = 0
+                    AND app_id = OLD.app_id
+                    AND installed = 1
+                UNION ALL
+                SELECT OLD.sdk_id, OLD.sdk_id
+                WHERE OLD.installed = 1
+            );
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS sdk_transition_app_sdk_update
+    AFTER UPDATE OF app_id, sdk_id, installed ON app_sdk
+    BEGIN
+        UPDATE sdk_transition
+        SET app_count = app_count - 1
+        WHERE
+            (from_sdk_id, to_sdk_id) IN (
+                SELECT sdk_id, OLD.sdk_id
+                FROM app_sdk
+                WHERE
+                    OLD.installed = 1
+                    AND app_id = OLD.app_id
+                    AND NOT (app_id = NEW.app_id AND sdk_id = NEW.sdk_id)
+                    AND installed = 0
+                UNION ALL
+                SELECT OLD.sdk_id, sdk_id
+                FROM app_sdk
+                WHERE
+                    OLD.installed = 0
+                    AND app_id = OLD.app_id
+                    AND NOT (app_id = NEW.app_id AND sdk_id = NEW.sdk_id)
+                    AND installed = 1
+                UNION ALL
+                SELECT OLD.sdk_id, OLD.sdk_id
+                WHERE OLD.installed = 1
+            );
+
+        INSERT INTO sdk_transition (from_sdk_id, to_sdk_id, app_count)
+        SELECT from_sdk_id, to_sdk_id, 1
+        FROM (
+            SELECT sdk_id AS from_sdk_id, NEW.sdk_id AS to_sdk_id
+            FROM app_sdk
+            WHERE
+                NEW.installed = 1
+                AND app_id = NEW.app_id
+                AND sdk_id != NEW.sdk_id
+                AND installed = 0
+            UNION ALL
+            SELECT NEW.sdk_id, sdk_id
+            FROM app_sdk
+            WHERE
+                NEW.installed = 0
+                AND app_id = NEW.app_id
+                AND sdk_id != NEW.sdk_id
+                AND installed = 1
+            UNION ALL
+            SELECT NEW.sdk_id, NEW.sdk_id
+            WHERE NEW.installed = 1
+        )
+        WHERE true
+        ON CONFLICT (from_sdk_id, to_sdk_id)
+        DO UPDATE SET app_count = app_count + 1;
+    END
+    '''
+]
+
+
+def get_transitions(from_sdks: list[int],
+                    to_sdks: list[int]) -> dict[tuple[int, int], int]:
+    """
+    Returns the number of apps that went from each of the "from" SDKs to each
+    of the "to" SDKs. SDK pairs with no apps are left out.
+
+    This isn't a numbers engine. The "(none)" row and column of a matrix
+    depend on the entire selection of SDKs, so computing them still takes a
+    pass over `app_sdk`, which is where nearly all the time of a matrix goes.
+    It's meant for looking up a few SDK to SDK cells without computing a
+    whole matrix.
+
+    The `sdk_transition` table must have been built beforehand, with
+    `create_table()` and `rebuild_table()`.
+    """
+    tables.check_table(models.SDKTransition.__tablename__, '--transitions')
+
+    query: Select = (
+        db
+        .select(models.SDKTransition)
+        .where(
+            db.and_(
+                models.SDKTransition.from_sdk_id.in_(from_sdks),
+                models.SDKTransition.to_sdk_id.in_(to_sdks)
+            )
+        )
+    )
+    return {
+        (t.from_sdk_id, t.to_sdk_id): t.app_count
+        for t in db.session.execute(query).scalars()
+    }
+
+
+def create_table():
+    """
+    Creates the `sdk_transition` table, along with the triggers that keep it
+    up-to-date, if they don't exist yet.
+    """
+    models.SDKTransition.__table__.create(db.session.connection(),
+                                          checkfirst=True)
+    for trigger in _TRIGGERS:
+        db.session.execute(db.text(trigger))
+
+
+def rebuild_table():
+    """
+    Recomputes the entire `sdk_transition` table from `app_sdk`.
+    """
+    db.session.execute(db.delete(models.SDKTransition))
+    db.session.execute(_get_rebuild_query())
+
+
+def _get_rebuild_query() -> TextClause:
+    # An app can only have one row per SDK, so an SDK can never be both
+    # installed and uninstalled in the same app. This means that the join
+    # never pairs an SDK with itself.
+    return db.text(
+        'INSERT INTO sdk_transition (from_sdk_id, to_sdk_id, app_count) '
+        'SELECT uninstalled.sdk_id, installed.sdk_id, COUNT(*) '
+        'FROM app_sdk AS uninstalled '
+        'JOIN app_sdk AS installed '
+        '    ON installed.app_id = uninstalled.app_id '
+        'WHERE uninstalled.installed = 0 AND installed.installed = 1 '
+        'GROUP BY uninstalled.sdk_id, installed.sdk_id '
+        'UNION ALL '
+        'SELECT sdk_id, sdk_id, COUNT(*) '
+        'FROM app_sdk '
+        'WHERE installed = 1 '
+        'GROUP BY sdk_id'
+    )
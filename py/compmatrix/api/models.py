@@ -1,8 +1,15 @@
+from sqlalchemy import ColumnElement
+
 from compmatrix import db
 
 
 class App(db.Model):
     __tablename__ = 'app'
+    __table_args__ = (
+        # Lets the apps of a cell be paged through by seeking in the index,
+        # instead of sorting all of the apps of the cell on every page.
+        db.Index('ix_app_name_seller_name_id', 'name', 'seller_name', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.Text)
@@ -20,6 +27,31 @@ class App(db.Model):
     sdks = db.relationship('AppSDK', back_populates='app', lazy='dynamic')
 
 
+# The keys that the apps of a cell can be sorted by, other than their names.
+# They are expressions instead of columns, so that existing databases don't
+# need new columns. Their indexes hold their precomputed values, and SQLite
+# only uses those when a query has the exact same expression, which is why
+# the expressions use literals instead of bound parameters.
+APP_TOTAL_RATINGS: ColumnElement = (
+    db.func.coalesce(App.five_star_ratings, db.literal_column('0'))
+    + db.func.coalesce(App.four_star_ratings, db.literal_column('0'))
+    + db.func.coalesce(App.three_star_ratings, db.literal_column('0'))
+    + db.func.coalesce(App.two_star_ratings, db.literal_column('0'))
+    + db.func.coalesce(App.one_star_ratings, db.literal_column('0'))
+)
+
+# Release dates are compared as they are stored, which is as text. Apps
+# without one come after the ones with one when the newest apps come first.
+APP_RELEASE_DATE_KEY: ColumnElement = db.func.coalesce(
+    db.type_coerce(App.release_date, db.Text),
+    db.literal_column("''"),
+    type_=db.Text
+)
+
+db.Index('ix_app_total_ratings_id', APP_TOTAL_RATINGS, App.id)
+db.Index('ix_app_release_date_key_id', APP_RELEASE_DATE_KEY, App.id)
+
+
 class SDK(db.Model):
     __tablename__ = 'sdk'
 
@@ -32,10 +64,30 @@ class SDK(db.Model):
     apps = db.relationship('AppSDK', back_populates='sdk', lazy='dynamic')
 
 
+# The keys that SDKs are sorted and searched by. Like in the list of all the
+# SDKs, names and slugs are compared without regard to the case of ASCII
+# letters. Searching for a prefix is a range scan over their indexes, since
+# every value that starts with a prefix sorts right after it.
+SDK_NAME_KEY: ColumnElement = db.collate(
+    db.func.coalesce(SDK.name, db.literal_column("''"), type_=db.Text),
+    'NOCASE'
+)
+SDK_SLUG_KEY: ColumnElement = db.collate(SDK.slug, 'NOCASE')
+
+db.Index('ix_sdk_name_key_id', SDK_NAME_KEY, SDK.id)
+db.Index('ix_sdk_slug_key', SDK_SLUG_KEY)
+
+
 class AppSDK(db.Model):
     __tablename__ = 'app_sdk'
     __table_args__ = (
         db.PrimaryKeyConstraint('app_id', 'sdk_id'),
+        # Covering indexes, which let the SDKs of an app, and the apps of an
+        # SDK, be looked up without touching the table itself.
+        db.Index('ix_app_sdk_app_id_installed_sdk_id',
+                 'app_id', 'installed', 'sdk_id'),
+        db.Index('ix_app_sdk_sdk_id_installed_app_id',
+                 'sdk_id', 'installed', 'app_id'),
     )
 
     app_id = db.Column(db.Integer, db.ForeignKey('app.id'), primary_key=True)
@@ -44,3 +96,38 @@ class AppSDK(db.Model):
 
     app = db.relationship('App', back_populates='sdks')
     sdk = db.relationship('SDK', back_populates='apps')
+
+
+class SDKTransition(db.Model):
+    """
+    The number of apps that went from one SDK to another, i.e. the numbers in
+    the cells of the competitive matrix that are not in the "(none)" row or
+    column. When both SDKs are the same, it is the number of apps that have
+    the SDK installed. See `compmatrix.api.matrix.transitions` for how the
+    table gets built and kept up-to-date.
+    """
+    __tablename__ = 'sdk_transition'
+    __table_args__ = (
+        db.PrimaryKeyConstraint('from_sdk_id', 'to_sdk_id'),
+    )
+
+    from_sdk_id = db.Column(db.Integer, db.ForeignKey('sdk.id'),
+                            primary_key=True)
+    to_sdk_id = db.Column(db.Integer, db.ForeignKey('sdk.id'),
+                          primary_key=True)
+    app_count = db.Column(db.Integer, nullable=False)
+
+
+class AppSDKCount(db.Model):
+    """
+    The number of SDKs each app has installed, and used to have installed.
+    Together with the indexes of `app_sdk`, it lets us check which cells of
+    the competitive matrix an app belongs to without grouping `app_sdk`. See
+    `compmatrix.api.matrix.membership` for how the table gets built and kept
+    up-to-date.
+    """
+    __tablename__ = 'app_sdk_count'
+
+    app_id = db.Column(db.Integer, db.ForeignKey('app.id'), primary_key=True)
+    num_installed = db.Column(db.Integer, nullable=False)
+    num_uninstalled = db.Column(db.Integer, nullable=False)
@@ -3,6 +3,8 @@ from flask import Blueprint
 from compmatrix import blueprints
 
 from compmatrix.api.routes import routes as api_routes
+from compmatrix.api.tables import MissingTableError
+from compmatrix.api.views import responses
 from compmatrix.client.routes import routes as index_routes
 
 client_blueprint: Blueprint = blueprints.create_blueprint('index',
@@ -13,3 +15,5 @@ api_blueprint: Blueprint = blueprints.create_blueprint('api',
                                                        __name__,
                                                        '/api',
                                                        api_routes)
+api_blueprint.register_error_handler(MissingTableError,
+                                     responses.create_missing_table_resp)
@@ -7,11 +7,18 @@ from compmatrix.api import views
 API_VERSION_STRING_V1: typing.Final[str] = 'v1'
 
 routes: list[Route] = [
+    Route('batch_v1',
+          f'/{API_VERSION_STRING_V1}/batch',
+          views.batch.index,
+          methods=['POST']),
     Route('sdks_v1', f'/{API_VERSION_STRING_V1}/sdks', views.sdks.index),
     Route('sdk_compmatrix_numbers_v1',
           f'/{API_VERSION_STRING_V1}/sdk-compmatrix/numbers',
           views.sdk_compmatrix.numbers.index),
     Route('sdk_compmatrix_apps_v1',
           f'/{API_VERSION_STRING_V1}/sdk-compmatrix/apps',
-          views.sdk_compmatrix.apps.index)
+          views.sdk_compmatrix.apps.index),
+    Route('sdk_compmatrix_apps_export_v1',
+          f'/{API_VERSION_STRING_V1}/sdk-compmatrix/apps/export',
+          views.sdk_compmatrix.apps.export)
 ]
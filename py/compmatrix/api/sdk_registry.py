@@ -0,0 +1,64 @@
+import array
+import bisect
+import typing
+
+from sqlalchemy import Select
+
+from compmatrix import db
+from compmatrix.api import models, versioning
+
+_VERSIONED_KEY: typing.Final[str] = 'compmatrix.sdk_registry'
+_LOAD_BATCH_SIZE: typing.Final[int] = 10000
+
+
+class SDKRegistry:
+    """
+    The IDs of all the SDKs, which lets SDK IDs be checked without querying
+    the database. The IDs are kept sorted in an array of 64-bit integers,
+    which takes 8 bytes per SDK, and are looked up with a binary search.
+    """
+
+    def __init__(self, sdk_ids: array.array):
+        self._sdk_ids = sdk_ids
+
+    def __len__(self) -> int:
+        return len(self._sdk_ids)
+
+    def __contains__(self, sdk_id: int) -> bool:
+        index: int = bisect.bisect_left(self._sdk_ids, sdk_id)
+        return index < len(self._sdk_ids) and self._sdk_ids[index] == sdk_id
+
+    def get_unknown_ids(self, ids: list[int]) -> list[int]:
+        """
+        Returns the IDs that don't refer to any SDK, in the order they are
+        given.
+        """
+        return [_id for _id in ids if _id not in self]
+
+
+def get_registry() -> SDKRegistry:
+    """
+    Returns the registry of the SDK IDs. The registry is loaded on first use,
+    and reloaded whenever the database changes.
+    """
+    return versioning.get_versioned(_VERSIONED_KEY, load_registry)
+
+
+def load_registry() -> SDKRegistry:
+    """
+    Loads the IDs of all the SDKs from the `sdk` table.
+    """
+    ids_query: Select = (
+        db
+        .select(models.SDK.id)
+        .order_by(models.SDK.id)
+        .execution_options(yield_per=_LOAD_BATCH_SIZE)
+    )
+
+    # The array only ever holds the IDs themselves, instead of a Python
+    # object for each of them.
+    sdk_ids: array.array = array.array('q')
+    for partition in db.session.execute(ids_query).scalars().partitions():
+        sdk_ids.extend(partition)
+
+    return SDKRegistry(sdk_ids)
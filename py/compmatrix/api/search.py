@@ -0,0 +1,111 @@
+import re
+import typing
+
+from sqlalchemy import Select
+
+from compmatrix import db
+from compmatrix.api import tables
+
+# The `app_search` table is an FTS5 index over the names and seller names of
+# the apps. It doesn't hold a copy of them, and reads them from `app` when
+# needed instead. The prefix indexes make searching for the first few
+# letters of a word fast.
+_TABLE: typing.Final[str] = '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS app_search USING fts5(
+        name,
+        seller_name,
+        content='app',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+'''
+
+# The triggers keep the index up-to-date whenever `app` changes. Since the
+# index doesn't hold a copy of the apps, the old values must be given to it
+# to remove an app.
+_TRIGGERS: typing.Final[list[str]] = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS app_search_app_insert
+    AFTER INSERT ON app
+    BEGIN
+        INSERT INTO app_search (rowid, name, seller_name)
+        VALUES (NEW.id, NEW.name, NEW.seller_name);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS app_search_app_delete
+    AFTER DELETE ON app
+    BEGIN
+        INSERT INTO app_search (app_search, rowid, name, seller_name)
+        VALUES ('delete', OLD.id, OLD.name, OLD.seller_name);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS app_search_app_update
+    AFTER UPDATE OF id, name, seller_name ON app
+    BEGIN
+        INSERT INTO app_search (app_search, rowid, name, seller_name)
+        VALUES ('delete', OLD.id, OLD.name, OLD.seller_name);
+
+        INSERT INTO app_search (rowid, name, seller_name)
+        VALUES (NEW.id, NEW.name, NEW.seller_name);
+    END
+    '''
+]
+
+_WORD_PATTERN: typing.Final[re.Pattern] = re.compile(r'\w+')
+
+
+def create_table():
+    """
+    Creates the `app_search` table, along with the triggers that keep it
+    up-to-date, if they don't exist yet.
+    """
+    db.session.execute(db.text(_TABLE))
+    for trigger in _TRIGGERS:
+        db.session.execute(db.text(trigger))
+
+
+def rebuild_table():
+    """
+    Recomputes the entire `app_search` table from `app`.
+    """
+    db.session.execute(
+        db.text("INSERT INTO app_search (app_search) VALUES ('rebuild')"))
+
+
+def create_match_query(search_text: str) -> str | None:
+    """
+    Turns text from users into an FTS5 query that matches the apps whose name
+    or seller name has words starting with every word in the text. Each word
+    is quoted, so the text can't use the FTS5 query syntax.
+
+    :param search_text: The text to search for.
+    :return: The FTS5 query, or None if the text has no words.
+    """
+    words: list[str] = _WORD_PATTERN.findall(search_text)
+    if not words:
+        return None
+
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def get_query_for_matching_app_ids(match_query: str) -> Select:
+    """
+    Gets the IDs of the apps that match an FTS5 query from
+    `create_match_query()`. The `app_search` table must have been built with
+    `rebuild_table()`, or a `MissingTableError` gets raised.
+    """
+    tables.check_table('app_search', '--search')
+
+    search_table = db.table('app_search', db.column('rowid'))
+    return (
+        db
+        .select(search_table.c.rowid)
+        .where(
+            db
+            .text('app_search MATCH :match_query')
+            .bindparams(match_query=match_query)
+        )
+    )
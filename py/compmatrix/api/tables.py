@@ -0,0 +1,44 @@
+from compmatrix import db
+from compmatrix.api import versioning
+
+
+class MissingTableError(Exception):
+    """
+    Raised when a table derived from the database is needed, but hasn't been
+    built yet. The API responds with an HTTP 503 when this gets raised.
+    """
+    def __init__(self, table: str, build_flag: str):
+        """
+        :param table: The name of the missing table.
+        :param build_flag: The flag of `build-derived-data.py` that builds the
+                           table.
+        """
+        super().__init__(f'The `{table}` table has not been built. Build it '
+                         f'with `python build-derived-data.py {build_flag}`.')
+        self.table = table
+        self.build_flag = build_flag
+
+
+def has_table(table: str) -> bool:
+    """
+    Returns whether the database has the given table. Creating or dropping a
+    table changes the data version, so this only gets checked once per data
+    version.
+    """
+    return versioning.get_versioned(
+        f'compmatrix.tables.{table}',
+        lambda: db.inspect(db.session.connection()).has_table(table)
+    )
+
+
+def check_table(table: str, build_flag: str):
+    """
+    Raises a `MissingTableError` if the database doesn't have the given
+    table.
+
+    :param table: The name of the table.
+    :param build_flag: The flag of `build-derived-data.py` that builds the
+                       table.
+    """
+    if not has_table(table):
+        raise MissingTableError(table, build_flag)
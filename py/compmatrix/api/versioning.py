@@ -0,0 +1,303 @@
+import dataclasses
+import os
+import sqlite3
+import threading
+import typing
+
+from flask import current_app
+
+from compmatrix import db
+from compmatrix.utils import caching
+
+T = typing.TypeVar('T')
+
+_EXTENSION_KEY: typing.Final[str] = 'compmatrix.versioning'
+_EXTENSION_CREATION_LOCK: threading.Lock = threading.Lock()
+
+# Location of the file change counter in the header of an SQLite database.
+# See https://www.sqlite.org/fileformat.html#file_change_counter.
+_FILE_CHANGE_COUNTER_OFFSET: typing.Final[int] = 24
+
+
+@dataclasses.dataclass(frozen=True, order=True)
+class DataVersion:
+    """
+    Identifies a version of the data in the database. Two data versions are
+    equal only if no changes were committed to the database in between.
+    Later data versions compare greater than earlier ones, since the watcher
+    connection never writes, and sees every commit.
+    """
+    # From `PRAGMA data_version`, which changes whenever another connection
+    # commits changes to the database.
+    pragma_version: int
+    file_mtime_ns: int
+    file_size: int
+
+
+class _VersionWatcher:
+    def __init__(self, db_path: str | None):
+        self._db_path = db_path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.RLock()
+        self._versioned_objects: dict[str, tuple[DataVersion, object]] = {}
+        self._caches: dict[str, tuple[DataVersion, caching.LRUCache]] = {}
+        self._build_locks: dict[str, threading.RLock] = {}
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    @property
+    def versioned_objects(self) -> dict[str, tuple[DataVersion, object]]:
+        return self._versioned_objects
+
+    @property
+    def caches(self) -> dict[str, tuple[DataVersion, caching.LRUCache]]:
+        return self._caches
+
+    def get_build_lock(self, key: str) -> threading.RLock:
+        with self._lock:
+            return self._build_locks.setdefault(key, threading.RLock())
+
+    def get_data_version(self) -> DataVersion:
+        if not self._db_path or not os.path.exists(self._db_path):
+            # In-memory databases can only be changed by our own connections,
+            # so there is nothing for us to watch.
+            return DataVersion(0, 0, 0)
+
+        with self._lock:
+            if self._connection is None:
+                # `PRAGMA data_version` only reports changes made by *other*
+                # connections. So, we need a connection of our own that
+                # never writes anything, since each of the connections in the
+                # pool will see a different value.
+                self._connection = sqlite3.connect(
+                    f'file:{self._db_path}?mode=ro',
+                    uri=True,
+                    check_same_thread=False)
+
+            pragma_version: int = self._connection.execute(
+                'PRAGMA data_version'
+            ).fetchone()[0]
+
+        stat: os.stat_result = os.stat(self._db_path)
+        return DataVersion(pragma_version, stat.st_mtime_ns, stat.st_size)
+
+    def get_file_change_counter(self) -> int | None:
+        if not self._db_path or not os.path.exists(self._db_path):
+            return None
+
+        try:
+            with open(self._db_path, 'rb') as f:
+                f.seek(_FILE_CHANGE_COUNTER_OFFSET)
+                counter_bytes: bytes = f.read(4)
+        except OSError:
+            return None
+
+        if len(counter_bytes) != 4:
+            return None
+
+        return int.from_bytes(counter_bytes, 'big')
+
+
+@dataclasses.dataclass(frozen=True)
+class CommitBase:
+    """
+    The data version, and the file change counter, of the database right
+    before a commit whose changes are known.
+    """
+    version: DataVersion
+    file_change_counter: int
+
+
+def get_data_version() -> DataVersion:
+    """
+    Returns the current version of the data in the database of the current
+    app.
+    """
+    return _get_watcher().get_data_version()
+
+
+def get_versioned(key: str, build: typing.Callable[[], T]) -> T:
+    """
+    Returns the object stored under `key` for the current data version of the
+    database. The object gets built with `build` when there is no such
+    object yet, or when the database has changed since it was last built.
+
+    :param key: The key the object is stored under.
+    :param build: Creates the object. It will be called with the app context
+                  of the current app.
+    :return: The object for the current data version.
+    """
+    watcher: _VersionWatcher = _get_watcher()
+
+    # We get the version before building so that changes committed while we
+    # are building will cause a rebuild the next time around.
+    version: DataVersion = watcher.get_data_version()
+    with watcher.lock:
+        entry: tuple[DataVersion, object] | None = (
+            watcher.versioned_objects.get(key)
+        )
+
+    if entry is not None and entry[0] == version:
+        return typing.cast(T, entry[1])
+
+    # Objects are built outside the lock of the watcher, so that requests
+    # that need other objects don't wait on slow builds. Requests that need
+    # the same object wait for it to be built once instead.
+    with watcher.get_build_lock(key):
+        with watcher.lock:
+            entry = watcher.versioned_objects.get(key)
+
+        if entry is not None and entry[0] == version:
+            return typing.cast(T, entry[1])
+
+        obj: T = build()
+        with watcher.lock:
+            # The object may have been moved to a newer data version while
+            # we were building, in which case ours is already out of date.
+            entry = watcher.versioned_objects.get(key)
+            if entry is None or entry[0] < version:
+                watcher.versioned_objects[key] = (version, obj)
+
+    return obj
+
+
+def get_versioned_cache(
+        key: str,
+        max_entries: int,
+        max_bytes: int
+) -> tuple[DataVersion, caching.LRUCache]:
+    """
+    Returns the cache stored under `key`, creating it if it doesn't exist
+    yet. The cache gets cleared whenever the database changes. The size
+    limits are only used when the cache gets created.
+
+    The current data version is returned as well. It should be made part of
+    the keys of the cache entries, so that entries computed from older data
+    can never be mistaken for current ones, even if they get put in the cache
+    after it was cleared.
+
+    :param key: The key the cache is stored under.
+    :param max_entries: The maximum number of entries the cache will hold.
+    :param max_bytes: The maximum total size of the entries in the cache.
+    :return: The current data version, and the cache.
+    """
+    watcher: _VersionWatcher = _get_watcher()
+    version: DataVersion = watcher.get_data_version()
+    with watcher.lock:
+        entry: tuple[DataVersion, caching.LRUCache] | None = (
+            watcher.caches.get(key)
+        )
+        if entry is None:
+            cache: caching.LRUCache = caching.LRUCache(max_entries, max_bytes)
+        else:
+            cache_version, cache = entry
+            if cache_version != version:
+                cache.clear()
+
+        watcher.caches[key] = (version, cache)
+
+    return version, cache
+
+
+def get_commit_base() -> CommitBase | None:
+    """
+    Returns the current data version together with the file change counter
+    of the database. Pass it to `advance_versioned()` after committing
+    changes, so that the versioned objects can be updated with the changes
+    instead of getting rebuilt.
+
+    Returns None if we can't tell which version the counter belongs to, i.e.
+    if the database changed while we were reading them, or if the database is
+    not a file.
+    """
+    watcher: _VersionWatcher = _get_watcher()
+    counter: int | None = watcher.get_file_change_counter()
+    version: DataVersion = watcher.get_data_version()
+    if counter is None or watcher.get_file_change_counter() != counter:
+        return None
+
+    return CommitBase(version, counter)
+
+
+def advance_versioned(
+        base: CommitBase | None,
+        updaters: dict[str, typing.Callable[[object, DataVersion], object]]
+) -> bool:
+    """
+    Moves the versioned objects and caches of the data version in `base` to
+    the current data version, after committing changes to the database. The
+    ones with an updater are updated with it, while the rest are dropped so
+    that they get rebuilt on their next use.
+
+    This only works if our commit was the only one since `base` was taken.
+    The file change counter of the database goes up by one for every commit,
+    so we can check for that. Everything of the old data version gets dropped
+    if there were other commits, or if we can't tell, since we can't know
+    what the other commits changed. This is always the case for databases in
+    WAL mode, since they don't update the file change counter.
+
+    :param base: The commit base taken before the changes were made.
+    :param updaters: Maps the keys of the versioned objects and caches to a
+                     function that takes the object of the old data version,
+                     and the new data version, and returns the updated
+                     object. Caches can be updated in-place.
+    :return: Whether the objects and caches were updated.
+    """
+    watcher: _VersionWatcher = _get_watcher()
+    new_base: CommitBase | None = get_commit_base()
+    if new_base is not None and new_base == base:
+        # Nothing got committed after all.
+        return True
+
+    can_advance: bool = (
+        base is not None
+        and new_base is not None
+        and new_base.file_change_counter == base.file_change_counter + 1
+    )
+
+    with watcher.lock:
+        if base is None:
+            # We don't know which objects were up-to-date before the commit,
+            # so none of them can be trusted anymore.
+            watcher.versioned_objects.clear()
+            for _, cache in watcher.caches.values():
+                cache.clear()
+
+            return False
+
+        for key, (version, obj) in list(watcher.versioned_objects.items()):
+            if version != base.version:
+                continue
+
+            if can_advance and key in updaters:
+                watcher.versioned_objects[key] = (
+                    new_base.version,
+                    updaters[key](obj, new_base.version)
+                )
+            else:
+                del watcher.versioned_objects[key]
+
+        for key, (version, cache) in list(watcher.caches.items()):
+            if version != base.version:
+                continue
+
+            if can_advance and key in updaters:
+                updaters[key](cache, new_base.version)
+                watcher.caches[key] = (new_base.version, cache)
+            else:
+                cache.clear()
+
+    return can_advance
+
+
+def _get_watcher() -> _VersionWatcher:
+    app = current_app._get_current_object()
+    if _EXTENSION_KEY not in app.extensions:
+        with _EXTENSION_CREATION_LOCK:
+            if _EXTENSION_KEY not in app.extensions:
+                app.extensions[_EXTENSION_KEY] = _VersionWatcher(
+                    db.engine.url.database)
+
+    return app.extensions[_EXTENSION_KEY]
@@ -1,2 +1,3 @@
+from . import batch
 from . import sdks
 from . import sdk_compmatrix
@@ -0,0 +1,208 @@
+import typing
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit, SplitResult
+
+from flask import Response, current_app, request
+from werkzeug.exceptions import HTTPException
+
+from compmatrix import db
+from compmatrix.api.views import checks, messages
+from compmatrix.api.views.codes import AnomalyCode
+
+_MAX_NUM_REQUESTS: typing.Final[int] = 50
+
+
+def index():
+    """
+    Runs many requests to the other API endpoints at once. The body must be a
+    JSON object with a "requests" list, where each request has a "path", and
+    optionally "params", which maps parameter names to a value or a list of
+    values. For example:
+
+        {
+            "requests": [
+                {"path": "/api/v1/sdks"},
+                {
+                    "path": "/api/v1/sdk-compmatrix/numbers",
+                    "params": {"from_sdks": [1, 2], "to_sdks": [1, 2]}
+                }
+            ]
+        }
+
+    The requests are run in order, in the same app context, and within one
+    database transaction, so that all of them see the same data. The
+    responses come back in the same order, each with its own status.
+
+    Requests with streamed responses, like exports and matrices in the
+    "ndjson" format, can't be part of a batch, since their bodies would have
+    to be read into the body of the batch all at once.
+    """
+    resp: dict[str, object | list] = {}
+
+    body: object = request.get_json(silent=True)
+    if not isinstance(body, dict) or 'requests' not in body:
+        resp['errors'] = [{
+            'message': messages.create_missing_params_message(['requests']),
+            'code': AnomalyCode.MISSING_FIELD,
+            'parameters': ['requests']
+        }]
+
+        return resp, HTTPStatus.UNPROCESSABLE_ENTITY
+
+    sub_requests: object = body['requests']
+    if isinstance(sub_requests, list):
+        invalid_indices: list[int] = [
+            i for i, r in enumerate(sub_requests) if not _is_valid_request(r)
+        ]
+        num_invalid_requests: int = len(invalid_indices)
+        if len(sub_requests) > _MAX_NUM_REQUESTS:
+            num_invalid_requests += len(sub_requests) - _MAX_NUM_REQUESTS
+    else:
+        invalid_indices: list[int] = []
+        num_invalid_requests: int = 1
+
+    if num_invalid_requests != 0:
+        resp['errors'] = [{
+            'message': messages.create_invalid_batch_requests_message(
+                num_invalid_requests, _MAX_NUM_REQUESTS),
+            'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+            'parameters': ['requests'],
+            'diagnostics': {
+                'requests': invalid_indices
+            }
+        }]
+
+        return resp, HTTPStatus.UNPROCESSABLE_ENTITY
+
+    sub_responses: list[dict[str, object]] = []
+
+    # The savepoint makes SQLite start a transaction, which keeps a read lock
+    # on the database until we're done. Nothing gets written, so we just roll
+    # it back afterwards.
+    with db.session.begin_nested() as savepoint:
+        with checks.sharing_sdk_id_checks():
+            for sub_request in sub_requests:
+                sub_responses.append(_run_request(sub_request))
+
+        savepoint.rollback()
+
+    resp['data'] = {
+        'responses': sub_responses
+    }
+
+    return resp
+
+
+def _is_valid_request(sub_request: object) -> bool:
+    if not isinstance(sub_request, dict):
+        return False
+
+    if not isinstance(sub_request.get('path'), str):
+        return False
+
+    params: object = sub_request.get('params', {})
+    if not isinstance(params, dict):
+        return False
+
+    for value in params.values():
+        values: list = value if isinstance(value, list) else [value]
+        if any(isinstance(v, (dict, list)) for v in values):
+            return False
+
+    return True
+
+
+def _run_request(sub_request: dict[str, object]) -> dict[str, object]:
+    path: str = sub_request['path']
+    split_path: SplitResult = urlsplit(path)
+
+    url_adapter = current_app.url_map.bind('')
+    try:
+        endpoint, _ = url_adapter.match(split_path.path, method='GET')
+    except HTTPException:
+        endpoint: None = None
+
+    if endpoint is None or not _is_batchable_endpoint(endpoint):
+        return {
+            'path': path,
+            'status': HTTPStatus.NOT_FOUND,
+            'body': {
+                'errors': [{
+                    'message': messages.create_unknown_endpoint_message(path),
+                    'code': AnomalyCode.UNKNOWN_ENDPOINT
+                }]
+            }
+        }
+
+    query_params: list[tuple[str, str]] = parse_qsl(split_path.query,
+                                                    keep_blank_values=True)
+    for name, value in sub_request.get('params', {}).items():
+        values: list = value if isinstance(value, list) else [value]
+        query_params.extend((name, _to_param_value(v)) for v in values)
+
+    # The request context reuses our app context, and so our database
+    # session. Dispatching it fully runs the request hooks and error handlers
+    # of the app, like for any other request.
+    with current_app.test_request_context(split_path.path,
+                                          method='GET',
+                                          query_string=query_params):
+        try:
+            sub_response: Response = current_app.full_dispatch_request()
+        except Exception:
+            # A failing request shouldn't take the rest of the batch down
+            # with it.
+            current_app.logger.exception('Error in batched request to %s.',
+                                         path)
+
+            return {
+                'path': path,
+                'status': HTTPStatus.INTERNAL_SERVER_ERROR,
+                'body': {
+                    'errors': [{
+                        'message': messages.create_internal_error_message(),
+                        'code': AnomalyCode.INTERNAL_ERROR
+                    }]
+                }
+            }
+
+        if sub_response.is_streamed:
+            # Nothing of the stream has been generated yet, so closing it
+            # only throws the generator away.
+            sub_response.close()
+
+            return {
+                'path': path,
+                'status': HTTPStatus.UNPROCESSABLE_ENTITY,
+                'body': {
+                    'errors': [{
+                        'message': messages.create_streamed_request_message(
+                            path),
+                        'code': AnomalyCode.STREAMED_REQUEST
+                    }]
+                }
+            }
+
+        if sub_response.is_json:
+            sub_response_body: object = sub_response.get_json()
+        else:
+            sub_response_body: object = sub_response.get_data(as_text=True)
+
+    return {
+        'path': path,
+        'status': sub_response.status_code,
+        'body': sub_response_body
+    }
+
+
+def _is_batchable_endpoint(endpoint: str) -> bool:
+    # Batches can't be nested.
+    return endpoint.startswith('api.') and endpoint != request.endpoint
+
+
+def _to_param_value(value: object) -> str:
+    if value is None:
+        return ''
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    else:
+        return str(value)
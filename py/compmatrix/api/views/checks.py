@@ -1,10 +1,32 @@
+import contextlib
+import typing
 from collections import OrderedDict
 
+from flask import g
 from werkzeug.datastructures import MultiDict
 
-from compmatrix.api.views import queries, messages
+from compmatrix.api import sdk_registry
+from compmatrix.api.views import messages
 from compmatrix.api.views.codes import AnomalyCode
 
+_SDK_ID_CHECKS_KEY: typing.Final[str] = 'compmatrix_sdk_id_checks'
+
+
+@contextlib.contextmanager
+def sharing_sdk_id_checks():
+    """
+    Makes the checks for unknown SDK IDs within the block use the same SDK
+    registry, so that the data version only gets checked once, and all the
+    checks agree with each other. The registry is kept in `g`, and is
+    forgotten once the block ends, since SDKs may get added or removed
+    afterwards.
+    """
+    setattr(g, _SDK_ID_CHECKS_KEY, sdk_registry.get_registry())
+    try:
+        yield
+    finally:
+        g.pop(_SDK_ID_CHECKS_KEY, None)
+
 
 def check_for_unknown_params(resp: dict[str, object | list],
                              known_params: list[str],
@@ -59,7 +81,7 @@ def check_for_unknown_ids_in_params(resp: dict[str, object | list],
         else:
             param_value = [value]
 
-        unknown_ids: list[int] = queries.get_unknown_ids_in_list(param_value)
+        unknown_ids: list[int] = _get_unknown_ids(param_value)
         if unknown_ids:
             params_with_unknown_ids.append(name)
             unknown_ids_per_param[name] = unknown_ids
@@ -90,3 +112,11 @@ def check_for_unknown_ids_in_params(resp: dict[str, object | list],
             'parameters': params_with_unknown_ids,
             'diagnostics': diagnostics
         })
+
+
+def _get_unknown_ids(ids: list[int]) -> list[int]:
+    registry: sdk_registry.SDKRegistry | None = g.get(_SDK_ID_CHECKS_KEY)
+    if registry is None:
+        registry = sdk_registry.get_registry()
+
+    return registry.get_unknown_ids(ids)
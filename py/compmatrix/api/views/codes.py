@@ -1,6 +1,10 @@
 class AnomalyCode:
+    INTERNAL_ERROR = 'internal_error'
     INVALID_PARAMETER_VALUE = 'invalid_parameter_value'
     MISSING_FIELD = 'missing_field'
+    MISSING_TABLE = 'missing_table'
     MISUSED_PARAMETER = 'misused_field'
+    STREAMED_REQUEST = 'streamed_request'
+    UNKNOWN_ENDPOINT = 'unknown_endpoint'
     UNKNOWN_ID = 'unknown_id'
     UNRECOGNIZED_FIELD = 'unrecognized_field'
@@ -1,10 +1,15 @@
 import dataclasses
+import functools
+import typing
 from enum import Enum
 
-from compmatrix.api.views.parameters import ParamPartnership
-from compmatrix.api.views.sdk_compmatrix.apps import MisusedParamGroup
+from compmatrix.api.views.parameters import MisusedParamGroup, ParamPartnership
 from compmatrix.utils import writing
 
+# The same errors keep on getting made, so the messages of the most recent
+# ones are kept around instead of being put together again.
+_MESSAGE_CACHE_SIZE: typing.Final[int] = 256
+
 
 class ParamType(Enum):
     UNARY = 0  # Parameter will only hold one value.
@@ -20,6 +25,11 @@ class Param:
 
 
 def create_missing_params_message(missing_params: list[str]):
+    return _create_missing_params_message(tuple(missing_params))
+
+
+@functools.lru_cache(maxsize=_MESSAGE_CACHE_SIZE)
+def _create_missing_params_message(missing_params: tuple[str, ...]) -> str:
     message: str = 'Required '
     if len(missing_params) == 1:
         message += 'parameter, '
@@ -44,11 +54,19 @@ def create_missing_params_message(missing_params: list[str]):
 
 def create_misused_params_message(misused_params_group: MisusedParamGroup,
                                   partner_params: dict[str, str]) -> str:
-    params: list[str] = misused_params_group.parameters
-    tangled_params: list[str] = []
-    for param in params:
-        tangled_params.append(partner_params[param])
+    params: tuple[str, ...] = tuple(misused_params_group.parameters)
+    tangled_params: tuple[str, ...] = tuple(
+        partner_params[param] for param in params)
+
+    return _create_misused_params_message(params,
+                                          tangled_params,
+                                          misused_params_group.partnership)
+
 
+@functools.lru_cache(maxsize=_MESSAGE_CACHE_SIZE)
+def _create_misused_params_message(params: tuple[str, ...],
+                                   tangled_params: tuple[str, ...],
+                                   partnership: ParamPartnership) -> str:
     if len(params) == 1:
         parameter_word: str = 'parameter'
     else:
@@ -66,7 +84,7 @@ def create_misused_params_message(misused_params_group: MisusedParamGroup,
 
     auxiliary_verb: str = 'is' if len(params) == 1 else 'are'
 
-    if misused_params_group.partnership == ParamPartnership.COUPLED:
+    if partnership == ParamPartnership.COUPLED:
         specification: str = 'specified'
     else:
         specification: str = 'unspecified'
@@ -85,7 +103,25 @@ def create_misused_params_message(misused_params_group: MisusedParamGroup,
     return message
 
 
-def create_wrong_valued_params_message(params_list: list[str]) -> str:
+def create_wrong_valued_params_message(
+        params_list: list[str],
+        formats: list[str] | None = None,
+        field_owners: str = 'apps') -> str:
+    # Endpoints support different formats, so the ones allowed in "format"
+    # can be given. It's "json" and "ndjson" by default. Likewise, the
+    # "fields" of endpoints are the fields of apps, unless told otherwise.
+    if formats is None:
+        formats = ['json', 'ndjson']
+
+    return _create_wrong_valued_params_message(tuple(params_list),
+                                               tuple(formats),
+                                               field_owners)
+
+
+@functools.lru_cache(maxsize=_MESSAGE_CACHE_SIZE)
+def _create_wrong_valued_params_message(params_list: tuple[str, ...],
+                                        formats: tuple[str, ...],
+                                        field_owners: str) -> str:
     int_params_set: set[str] = {
         'from_sdk',
         'from_sdks',
@@ -120,11 +156,12 @@ def create_wrong_valued_params_message(params_list: list[str]) -> str:
             # No need to worry if params is empty since this part of the code
             # won't even run if it is empty.
             if len(params_list) == 1:
-                sentence: str = ('The correct format is '
-                                 '"<app name>;<app seller name>".')
+                sentence: str = ('It must be a "start_cursor" or '
+                                 '"end_cursor" from a previous response.')
             else:
-                sentence: str = ('The correct format for the value of '
-                                 '"cursor" is "<app name>;<app seller name>".')
+                sentence: str = ('The value of "cursor" must be a '
+                                 '"start_cursor" or "end_cursor" from a '
+                                 'previous response.')
             message_parts.append(sentence)
 
             params.append(Param(param, ParamType.UNARY))
@@ -139,6 +176,86 @@ def create_wrong_valued_params_message(params_list: list[str]) -> str:
                                  'either "previous" or "next".')
             message_parts.append(sentence)
 
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'fields':
+            if len(params_list) == 1:
+                sentence: str = (f'It must only have fields of '
+                                 f'{field_owners}, separated by commas.')
+            else:
+                sentence: str = ('The value of "fields" must only have '
+                                 f'fields of {field_owners}, separated by '
+                                 'commas.')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'q':
+            if len(params_list) == 1:
+                sentence: str = 'It must have at least one letter or number.'
+            else:
+                sentence: str = ('The value of "q" must have at least one '
+                                 'letter or number.')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'sort':
+            if len(params_list) == 1:
+                sentence: str = ('It must only be either "name", "ratings", '
+                                 'or "release_date".')
+            else:
+                sentence: str = ('The value of "sort" must only be either '
+                                 '"name", "ratings", or "release_date".')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'facets':
+            if len(params_list) == 1:
+                sentence: str = ('It must only have "genre_id", '
+                                 '"release_year", or "rating_band", '
+                                 'separated by commas.')
+            else:
+                sentence: str = ('The value of "facets" must only have '
+                                 '"genre_id", "release_year", or '
+                                 '"rating_band", separated by commas.')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'normalize':
+            if len(params_list) == 1:
+                sentence: str = ('It must only be either "row", "column", or '
+                                 '"none".')
+            else:
+                sentence: str = ('The value of "normalize" must only be '
+                                 'either "row", "column", or "none".')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'derived':
+            if len(params_list) == 1:
+                sentence: str = 'It must only be either "true" or "false".'
+            else:
+                sentence: str = ('The value of "derived" must only be either '
+                                 '"true" or "false".')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'format':
+            formats_list_str: str = ' or '.join(f'"{f}"' for f in formats)
+            if len(params_list) == 1:
+                sentence: str = f'It must only be either {formats_list_str}.'
+            else:
+                sentence: str = ('The value of "format" must only be either '
+                                 f'{formats_list_str}.')
+            message_parts.append(sentence)
+
+            params.append(Param(param, ParamType.UNARY))
+        elif param == 'mode':
+            if len(params_list) == 1:
+                sentence: str = 'It must only be either "exact" or "approx".'
+            else:
+                sentence: str = ('The value of "mode" must only be either '
+                                 '"exact" or "approx".')
+            message_parts.append(sentence)
+
             params.append(Param(param, ParamType.UNARY))
 
     int_params_msg: str = _create_wrong_valued_int_params_message(int_params)
@@ -153,6 +270,11 @@ def create_wrong_valued_params_message(params_list: list[str]) -> str:
 
 
 def create_unknown_params_message(params: list[str]) -> str:
+    return _create_unknown_params_message(tuple(params))
+
+
+@functools.lru_cache(maxsize=_MESSAGE_CACHE_SIZE)
+def _create_unknown_params_message(params: tuple[str, ...]) -> str:
     if len(params) == 1:
         message: str = 'Unrecognized parameter, '
     else:
@@ -167,6 +289,13 @@ def create_unknown_params_message(params: list[str]) -> str:
 
 def create_unknown_ids_params_message(affected_params: list[str],
                                       num_unknown_ids: int) -> str:
+    return _create_unknown_ids_params_message(tuple(affected_params),
+                                              num_unknown_ids)
+
+
+@functools.lru_cache(maxsize=_MESSAGE_CACHE_SIZE)
+def _create_unknown_ids_params_message(affected_params: tuple[str, ...],
+                                       num_unknown_ids: int) -> str:
     oxfordify: bool = len(affected_params) != 2
     message: str = writing.humanize_list(affected_params, oxfordify, True)
 
@@ -189,6 +318,40 @@ def create_unknown_ids_params_message(affected_params: list[str],
     return message
 
 
+def create_invalid_batch_requests_message(num_invalid_requests: int,
+                                          max_num_requests: int) -> str:
+    if num_invalid_requests == 1:
+        message: str = 'A request in "requests" is invalid. '
+    else:
+        message: str = 'Some requests in "requests" are invalid. '
+
+    message += (
+        'Each request must be an object with a "path" string, and an '
+        'optional "params" object. There can only be up to '
+        f'{max_num_requests} requests.'
+    )
+
+    return message
+
+
+def create_unknown_endpoint_message(path: str) -> str:
+    return f'Path, "{path}", does not refer to an API endpoint.'
+
+
+def create_streamed_request_message(path: str) -> str:
+    return (f'Path, "{path}", refers to a streamed response, which cannot '
+            'be part of a batch.')
+
+
+def create_internal_error_message() -> str:
+    return 'Something went wrong while responding to this request.'
+
+
+def create_missing_table_message(table: str) -> str:
+    return (f'Data needed by this request, "{table}", has not been built '
+            'yet. Please try again later.')
+
+
 def _create_wrong_valued_int_params_message(
         params: list[Param]
 ) -> str | None:
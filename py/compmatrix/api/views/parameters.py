@@ -1,3 +1,4 @@
+import dataclasses
 from enum import Enum
 
 
@@ -9,3 +10,9 @@ class ParamPartnership(Enum):
     """
     COUPLED = 0
     INVERSE = 1
+
+
+@dataclasses.dataclass
+class MisusedParamGroup:
+    parameters: list[str]
+    partnership: ParamPartnership
@@ -1,48 +1,100 @@
-from sqlalchemy import Select, CompoundSelect
+import functools
+import json
+import typing
+
+from flask import current_app
+from sqlalchemy import BindParameter, Select, CompoundSelect, Subquery
 
 from compmatrix import db
 from compmatrix.api import models
 
+# Used by `get_app_hash()`. The IDs are reduced by the modulus before they
+# get multiplied, so that the product always fits in SQLite's 64-bit
+# integers.
+APP_HASH_MULTIPLIER: typing.Final[int] = 2654435761
+APP_HASH_MODULUS: typing.Final[int] = 2 ** 31
+
+# The queries for the cells of the matrix only come in a few shapes, so each
+# shape gets built once, with bind parameters in place of the SDK IDs, and
+# the IDs get bound to it whenever it's needed. The lists of IDs are
+# expanding parameters, so they can have any length without changing the
+# shape. Binding is much cheaper than building the query all over again, and
+# since the SQL of a shape stays the same, SQLAlchemy only ever compiles it
+# once.
+#
+# Large selections of SDKs are bound as a single JSON array instead, which
+# SQLite reads with `json_each()`. A long list of IDs would otherwise need
+# one variable per ID, and SQLite limits the number of variables a statement
+# can have. See `get_sdk_ids_selection()`.
+
+# What an `IN` or `NOT IN` gets checked against: an expanding parameter for
+# the list of IDs, or a subquery over the JSON array of the IDs.
+SDKIDsParam = BindParameter | Select
+
 
 def get_query_for_from_to_sdks(from_sdk_id: int, to_sdk_id: int) -> Select:
     if from_sdk_id == to_sdk_id:
-        sdk_id: int = from_sdk_id  # Can be `to_sdk` too if you prefer.
-        query: Select = (
-            db
-            .select(models.AppSDK)
-            .where(
-                db.and_(
-                    models.AppSDK.sdk_id == sdk_id,
-                    models.AppSDK.installed == True
-                )
+        return _get_query_for_same_sdks().params(sdk_id=from_sdk_id)
+
+    return _get_query_for_different_sdks().params(from_sdk_id=from_sdk_id,
+                                                  to_sdk_id=to_sdk_id)
+
+
+@functools.cache
+def _get_query_for_same_sdks() -> Select:
+    return (
+        db
+        .select(models.AppSDK)
+        .where(
+            db.and_(
+                models.AppSDK.sdk_id == db.bindparam('sdk_id'),
+                models.AppSDK.installed == True
             )
-            .group_by(models.AppSDK.app_id)
         )
-    else:
-        query: Select = (
-            db
-            .select(models.AppSDK)
-            .where(
-                db.or_(
-                    db.and_(
-                        models.AppSDK.sdk_id == from_sdk_id,
-                        models.AppSDK.installed == False
-                    ),
-                    db.and_(
-                        models.AppSDK.sdk_id == to_sdk_id,
-                        models.AppSDK.installed == True
-                    ),
-                )
+        .group_by(models.AppSDK.app_id)
+    )
+
+
+@functools.cache
+def _get_query_for_different_sdks() -> Select:
+    return (
+        db
+        .select(models.AppSDK)
+        .where(
+            db.or_(
+                db.and_(
+                    models.AppSDK.sdk_id == db.bindparam('from_sdk_id'),
+                    models.AppSDK.installed == False
+                ),
+                db.and_(
+                    models.AppSDK.sdk_id == db.bindparam('to_sdk_id'),
+                    models.AppSDK.installed == True
+                ),
             )
-            .group_by(models.AppSDK.app_id)
-            .having(db.func.count(models.AppSDK.sdk_id) > 1)
         )
-
-    return query
+        .group_by(models.AppSDK.app_id)
+        .having(db.func.count(models.AppSDK.sdk_id) > 1)
+    )
 
 
 def get_query_for_from_sdk_to_none(from_sdk_id: int,
                                    other_to_sdks_ids: list[int]) -> Select:
+    is_large: bool = is_large_selection(other_to_sdks_ids)
+    query: Select = _get_query_for_from_sdk_to_none(
+        from_sdk_id not in other_to_sdks_ids, is_large)
+    return query.params(
+        from_sdk_id=from_sdk_id,
+        other_to_sdks_ids=_get_sdk_ids_value(other_to_sdks_ids, is_large)
+    )
+
+
+@functools.cache
+def _get_query_for_from_sdk_to_none(is_from_sdk_in_none: bool,
+                                    is_large: bool) -> Select:
+    from_sdk_id: BindParameter = db.bindparam('from_sdk_id')
+    other_to_sdks_ids: SDKIDsParam = _get_sdk_ids_param('other_to_sdks_ids',
+                                                        is_large)
+
     inner_query1: Select = (
         db
         .select(models.AppSDK)
@@ -93,7 +145,7 @@ def get_query_for_from_sdk_to_none(from_sdk_id: int,
 
     unionable_queries: list[Select] = [inner_query2]
 
-    if from_sdk_id not in other_to_sdks_ids:
+    if is_from_sdk_in_none:
         # The current SDK was not specified in the to_sdks parameter.
         # So, it's part of the "(none)" column. We need this separate
         # query since the prior query does not include apps that have
@@ -117,6 +169,19 @@ def get_query_for_from_sdk_to_none(from_sdk_id: int,
 
 def get_query_for_none_to_to_sdk(to_sdk_id: int,
                                  other_from_sdks_param: list[int]) -> Select:
+    is_large: bool = is_large_selection(other_from_sdks_param)
+    query: Select = _get_query_for_none_to_to_sdk(
+        to_sdk_id in other_from_sdks_param, is_large)
+    return query.params(
+        to_sdk_id=to_sdk_id,
+        other_from_sdks_ids=_get_sdk_ids_value(other_from_sdks_param,
+                                               is_large)
+    )
+
+
+@functools.cache
+def _get_query_for_none_to_to_sdk(is_to_sdk_in_from_sdks: bool,
+                                  is_large: bool) -> Select:
     # Since the `to_sdk` already has its own row in the matrix, we
     # shouldn't include them in the counting. Note that this condition
     # works because our query will initially include:
@@ -136,7 +201,7 @@ def get_query_for_none_to_to_sdk(to_sdk_id: int,
     # app has only one SDK that is also currently installed (note that
     # we are ignoring apps with no SDKs installed), then the app group
     # for that app will only have one row.
-    if to_sdk_id in other_from_sdks_param:
+    if is_to_sdk_in_from_sdks:
         # We should not include apps where it only has one SDK
         # currently installed and that SDK is the one being referred to
         # by `to_sdk_id`, because they should be counted in the row
@@ -157,11 +222,12 @@ def get_query_for_none_to_to_sdk(to_sdk_id: int,
         .where(
             db.or_(
                 db.and_(
-                    models.AppSDK.sdk_id.not_in(other_from_sdks_param),
+                    models.AppSDK.sdk_id.not_in(
+                        _get_sdk_ids_param('other_from_sdks_ids', is_large)),
                     models.AppSDK.installed == False
                 ),
                 db.and_(
-                    models.AppSDK.sdk_id == to_sdk_id,
+                    models.AppSDK.sdk_id == db.bindparam('to_sdk_id'),
                     models.AppSDK.installed == True
                 ),
             )
@@ -187,6 +253,21 @@ def get_query_for_none_to_to_sdk(to_sdk_id: int,
 
 def get_query_for_none_to_none(other_from_sdks_param: list[int],
                                other_to_sdks_param: list[int]) -> Select:
+    all_sdks_specified: list[int] = list(
+        set(other_from_sdks_param + other_to_sdks_param)
+    )
+
+    is_large: bool = is_large_selection(all_sdks_specified)
+    return _get_query_for_none_to_none(is_large).params(
+        other_from_sdks_ids=_get_sdk_ids_value(other_from_sdks_param,
+                                               is_large),
+        other_to_sdks_ids=_get_sdk_ids_value(other_to_sdks_param, is_large),
+        all_sdks_ids=_get_sdk_ids_value(all_sdks_specified, is_large)
+    )
+
+
+@functools.cache
+def _get_query_for_none_to_none(is_large: bool) -> Select:
     # Expected Rough Equivalent SQL Query:
     #
     # SELECT *
@@ -229,6 +310,12 @@ def get_query_for_none_to_none(other_from_sdks_param: list[int],
     #     );
     # )
     # GROUP BY app_id -- [^.^]
+    other_from_sdks_param: SDKIDsParam = _get_sdk_ids_param(
+        'other_from_sdks_ids', is_large)
+    other_to_sdks_param: SDKIDsParam = _get_sdk_ids_param(
+        'other_to_sdks_ids', is_large)
+    all_sdks_specified: SDKIDsParam = _get_sdk_ids_param('all_sdks_ids',
+                                                         is_large)
 
     # First, get all the apps that had previous SDKs that are not part
     # of the `other_from_sdks_param` but are now using SDKs that are not part
@@ -270,10 +357,6 @@ def get_query_for_none_to_none(other_from_sdks_param: list[int],
     )
     query1: CompoundSelect = db.select(query1.subquery())
 
-    all_sdks_specified: list[int] = list(
-        set(other_from_sdks_param + other_to_sdks_param)
-    )
-
     # This query will get all apps that have SDKs that are not
     # specified in either `other_from_sdk_params` or `other_to_sdk_params`.
     # This will also capture apps that we already have in the previous
@@ -347,26 +430,313 @@ def get_query_for_none_to_none(other_from_sdks_param: list[int],
     return db.select(query.subquery()).group_by('app_id')
 
 
-def get_unknown_ids_in_list(ids: list[int]) -> list[int]:
-    # As of August 2024, SQLAlchemy 2.0 does not have proper support for CTEs
-    # for VALUES() rows. You would still need to use a SELECT FROM VALUES()
-    # query inside the CTE just to make things work with SQLAlchemy. I'm also
-    # having difficulty with such a query form in SQLite, where I am getting
-    # syntax errors. So, we're just gonna use a raw SQL query for this one.
-    query = db.text(
-        'WITH id_list(id) AS :ids '
-        'SELECT id '
-        'FROM id_list '
-        'WHERE NOT EXISTS ('
-        '    SELECT * '
-        '    FROM sdk '
-        '    WHERE sdk.id = id_list.id'
-        ')'
+def get_query_for_matrix_profiles(from_sdks_ids: list[int],
+                                  to_sdks_ids: list[int]) -> CompoundSelect:
+    selected_sdks: list[int] = list(set(from_sdks_ids + to_sdks_ids))
+
+    is_large: bool = is_large_selection(selected_sdks)
+    return _get_query_for_matrix_profiles(is_large).params(
+        from_sdks_ids=_get_sdk_ids_value(from_sdks_ids, is_large),
+        to_sdks_ids=_get_sdk_ids_value(to_sdks_ids, is_large),
+        selected_sdks_ids=_get_sdk_ids_value(selected_sdks, is_large)
+    )
+
+
+@functools.cache
+def _get_query_for_matrix_profiles(is_large: bool) -> CompoundSelect:
+    # Expected Rough Equivalent SQL Query:
+    #
+    # SELECT
+    #     uninstalled_from_sdks,
+    #     installed_selected_sdks,
+    #     MIN(num_installed_other_to, 2),
+    #     MIN(num_uninstalled_other_from, 2),
+    #     num_installed_unselected > 0,
+    #     num_installed > 0,
+    #     1 AS has_sdk_rows,
+    #     COUNT(*) AS num_apps
+    # FROM (
+    #     SELECT
+    #         app_id,
+    #         GROUP_CONCAT(
+    #             CASE
+    #                 WHEN installed = 0 AND sdk_id IN (from_sdks)
+    #                 THEN sdk_id
+    #             END
+    #         ) AS uninstalled_from_sdks,
+    #         GROUP_CONCAT(
+    #             CASE
+    #                 WHEN installed = 1 AND sdk_id IN (from_sdks + to_sdks)
+    #                 THEN sdk_id
+    #             END
+    #         ) AS installed_selected_sdks,
+    #         SUM(installed = 1 AND sdk_id NOT IN (to_sdks))
+    #             AS num_installed_other_to,
+    #         SUM(installed = 0 AND sdk_id NOT IN (from_sdks))
+    #             AS num_uninstalled_other_from,
+    #         SUM(installed = 1 AND sdk_id NOT IN (from_sdks + to_sdks))
+    #             AS num_installed_unselected,
+    #         SUM(installed = 1) AS num_installed
+    #     FROM app_sdk
+    #     GROUP BY app_id
+    # )
+    # GROUP BY 1, 2, 3, 4, 5, 6
+    # UNION ALL
+    # SELECT NULL, NULL, 0, 0, 0, 0, 0 AS has_sdk_rows, COUNT(*)
+    # FROM app
+    # WHERE id NOT IN (SELECT app_id FROM app_sdk)
+    #
+    # Every app gets summarized into a "profile" in one pass over `app_sdk`,
+    # and apps sharing the same profile get collapsed into one row. Each
+    # profile holds just enough information to tell which cells of the
+    # competitive matrix an app belongs to. The counts are capped at two
+    # since the cell rules only ever compare them against zero, one, or two.
+    # Note that the order of the IDs in the GROUP_CONCAT() results is not
+    # guaranteed, so the same profile may come back in more than one row.
+    # That is fine, since the rows will just be tallied up anyway.
+    from_sdks_ids: SDKIDsParam = _get_sdk_ids_param('from_sdks_ids',
+                                                    is_large)
+    to_sdks_ids: SDKIDsParam = _get_sdk_ids_param('to_sdks_ids', is_large)
+    selected_sdks: SDKIDsParam = _get_sdk_ids_param('selected_sdks_ids',
+                                                    is_large)
+
+    per_app_query: Subquery = (
+        db
+        .select(
+            models.AppSDK.app_id,
+            db.func.group_concat(
+                db.case(
+                    (
+                        db.and_(
+                            models.AppSDK.installed == False,
+                            models.AppSDK.sdk_id.in_(from_sdks_ids)
+                        ),
+                        models.AppSDK.sdk_id
+                    )
+                )
+            ).label('uninstalled_from_sdks'),
+            db.func.group_concat(
+                db.case(
+                    (
+                        db.and_(
+                            models.AppSDK.installed == True,
+                            models.AppSDK.sdk_id.in_(selected_sdks)
+                        ),
+                        models.AppSDK.sdk_id
+                    )
+                )
+            ).label('installed_selected_sdks'),
+            _count_rows_where(
+                db.and_(
+                    models.AppSDK.installed == True,
+                    models.AppSDK.sdk_id.not_in(to_sdks_ids)
+                )
+            ).label('num_installed_other_to'),
+            _count_rows_where(
+                db.and_(
+                    models.AppSDK.installed == False,
+                    models.AppSDK.sdk_id.not_in(from_sdks_ids)
+                )
+            ).label('num_uninstalled_other_from'),
+            _count_rows_where(
+                db.and_(
+                    models.AppSDK.installed == True,
+                    models.AppSDK.sdk_id.not_in(selected_sdks)
+                )
+            ).label('num_installed_unselected'),
+            _count_rows_where(
+                models.AppSDK.installed == True
+            ).label('num_installed')
+        )
+        .group_by(models.AppSDK.app_id)
+        .subquery()
+    )
+
+    profile_columns: list = [
+        per_app_query.c.uninstalled_from_sdks,
+        per_app_query.c.installed_selected_sdks,
+        db.func.min(per_app_query.c.num_installed_other_to, 2),
+        db.func.min(per_app_query.c.num_uninstalled_other_from, 2),
+        per_app_query.c.num_installed_unselected > 0,
+        per_app_query.c.num_installed > 0
+    ]
+    profiles_query: Select = (
+        db
+        .select(
+            *profile_columns,
+            db.literal(True).label('has_sdk_rows'),
+            db.func.count('*').label('num_apps')
+        )
+        .group_by(*profile_columns)
+    )
+
+    # Apps without any row in `app_sdk` never show up in the query above,
+    # so they get their own profile.
+    no_sdk_rows_apps_query: Select = (
+        db
+        .select(
+            db.literal_column('NULL'),
+            db.literal_column('NULL'),
+            db.literal(0),
+            db.literal(0),
+            db.literal(False),
+            db.literal(False),
+            db.literal(False),
+            db.func.count('*')
+        )
+        .select_from(models.App)
+        .where(
+            models.App.id.not_in(db.select(models.AppSDK.app_id))
+        )
     )
-    query = query.bindparams(db.bindparam('ids', expanding=True))
-    params: dict = {
-        'ids': [(_id,) for _id in ids]
-    }
-    unknown_id_results: list = db.session.execute(query, params).fetchall()
-    unknown_ids: list[int] = [result[0] for result in unknown_id_results]
-    return unknown_ids
+
+    return profiles_query.union_all(no_sdk_rows_apps_query)
+
+
+def get_query_for_app_signatures(max_app_hash: int | None = None) -> Select:
+    """
+    Gets the number of apps with each set of uninstalled and installed SDKs.
+
+    :param max_app_hash: Only counts the apps whose hash, from
+                         `get_app_hash()`, is below this, if given.
+    """
+    # Expected Rough Equivalent SQL Query:
+    #
+    # SELECT uninstalled_sdks, installed_sdks, COUNT(*) AS num_apps
+    # FROM (
+    #     SELECT
+    #         app_id,
+    #         GROUP_CONCAT(CASE WHEN installed = 0 THEN sdk_id END)
+    #             AS uninstalled_sdks,
+    #         GROUP_CONCAT(CASE WHEN installed = 1 THEN sdk_id END)
+    #             AS installed_sdks
+    #     FROM app_sdk
+    #     GROUP BY app_id
+    # )
+    # GROUP BY uninstalled_sdks, installed_sdks
+    #
+    # As with the matrix profiles query, the order of the IDs from
+    # GROUP_CONCAT() is not guaranteed, so a signature may come back in more
+    # than one row.
+    per_app_query: Select = (
+        db
+        .select(
+            models.AppSDK.app_id,
+            db.func.group_concat(
+                db.case(
+                    (models.AppSDK.installed == False, models.AppSDK.sdk_id)
+                )
+            ).label('uninstalled_sdks'),
+            db.func.group_concat(
+                db.case(
+                    (models.AppSDK.installed == True, models.AppSDK.sdk_id)
+                )
+            ).label('installed_sdks')
+        )
+        .group_by(models.AppSDK.app_id)
+    )
+    if max_app_hash is not None:
+        per_app_query = per_app_query.where(
+            get_app_hash(models.AppSDK.app_id) < max_app_hash)
+
+    per_app_subquery: Subquery = per_app_query.subquery()
+
+    return (
+        db
+        .select(
+            per_app_subquery.c.uninstalled_sdks,
+            per_app_subquery.c.installed_sdks,
+            db.func.count('*').label('num_apps')
+        )
+        .group_by(per_app_subquery.c.uninstalled_sdks,
+                  per_app_subquery.c.installed_sdks)
+    )
+
+
+def get_query_for_num_apps_without_sdks(
+        max_app_hash: int | None = None
+) -> Select:
+    query: Select = (
+        db
+        .select(db.func.count('*'))
+        .select_from(models.App)
+        .where(
+            models.App.id.not_in(db.select(models.AppSDK.app_id))
+        )
+    )
+    if max_app_hash is not None:
+        query = query.where(get_app_hash(models.App.id) < max_app_hash)
+
+    return query
+
+
+def get_query_for_num_apps_with_sdks() -> Select:
+    return db.select(db.func.count(db.distinct(models.AppSDK.app_id)))
+
+
+def get_app_hash(app_id_column):
+    """
+    Hashes the IDs of apps into numbers from 0 to 2^31 - 1, with Knuth's
+    multiplicative hash. Apps whose hash is below a threshold make up a
+    sample of the apps that is spread evenly across the IDs.
+    """
+    return (((app_id_column % APP_HASH_MODULUS) * APP_HASH_MULTIPLIER)
+            % APP_HASH_MODULUS)
+
+
+def parse_concatenated_ids(concatenated_ids: str | None) -> frozenset[int]:
+    """
+    Parses the IDs concatenated by GROUP_CONCAT(), which gives us a
+    comma-separated string, or NULL if there were no IDs.
+    """
+    if concatenated_ids is None:
+        return frozenset()
+
+    return frozenset(int(s) for s in str(concatenated_ids).split(','))
+
+
+def is_large_selection(sdk_ids: list[int]) -> bool:
+    """
+    Checks if a selection of SDKs has at least
+    `COMPMATRIX_LARGE_SELECTION_SIZE` IDs, in which case queries should pass
+    the IDs as a JSON array.
+    """
+    min_size: int | None = current_app.config[
+        'COMPMATRIX_LARGE_SELECTION_SIZE']
+    return min_size is not None and len(sdk_ids) >= min_size
+
+
+def get_sdk_ids_selection(sdk_ids: list[int]) -> list[int] | Select:
+    """
+    Gets what to check a column against in an `IN` or `NOT IN` for the IDs.
+    Small selections are given as they are, while large ones are turned into
+    a subquery over the JSON array of the IDs, which takes just one variable
+    no matter how many IDs there are.
+    """
+    if not is_large_selection(sdk_ids):
+        return sdk_ids
+
+    return _select_from_json_ids(db.literal(json.dumps(sdk_ids)))
+
+
+def _get_sdk_ids_param(name: str, is_large: bool) -> SDKIDsParam:
+    if not is_large:
+        return db.bindparam(name, expanding=True)
+
+    return _select_from_json_ids(db.bindparam(name))
+
+
+def _get_sdk_ids_value(sdk_ids: list[int], is_large: bool) -> list[int] | str:
+    return json.dumps(sdk_ids) if is_large else sdk_ids
+
+
+def _select_from_json_ids(json_ids) -> Select:
+    # SQLite builds a temporary index out of the results of the subquery
+    # before the IDs get looked up, since the subquery doesn't depend on the
+    # outer query. Each lookup is then O(log n).
+    ids = db.func.json_each(json_ids).table_valued('value')
+    return db.select(ids.c.value)
+
+
+def _count_rows_where(condition):
+    return db.func.sum(db.case((condition, 1), else_=0))
@@ -1,16 +1,41 @@
+from http import HTTPStatus
+
+from flask import current_app
+
+from compmatrix.api.tables import MissingTableError
 from compmatrix.api.views import messages
 from compmatrix.api.views.codes import AnomalyCode
 
 
-def generate_wrong_valued_params_resp_error(resp: dict[str, object | list],
-                                            params: list[str]):
+def generate_wrong_valued_params_resp_error(
+        resp: dict[str, object | list],
+        params: list[str],
+        formats: list[str] | None = None,
+        field_owners: str = 'apps'):
     # TODO: Add diagnostics field here, but not for now, due to time
     #       constraints.
     if 'errors' not in resp:
         resp['errors'] = []
 
     resp['errors'].append({
-        'message': messages.create_wrong_valued_params_message(params),
+        'message': messages.create_wrong_valued_params_message(
+            params, formats, field_owners),
         'code': AnomalyCode.INVALID_PARAMETER_VALUE,
         'parameters': params
     })
+
+
+def create_missing_table_resp(
+        error: MissingTableError
+) -> tuple[dict[str, object | list], HTTPStatus]:
+    # The database is fine, but it's missing data that has to be built by
+    # whoever runs the server, so the server can't respond to the request
+    # for now. The error tells them how to build it.
+    current_app.logger.error(str(error))
+
+    return {
+        'errors': [{
+            'message': messages.create_missing_table_message(error.table),
+            'code': AnomalyCode.MISSING_TABLE
+        }]
+    }, HTTPStatus.SERVICE_UNAVAILABLE
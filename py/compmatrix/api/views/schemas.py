@@ -0,0 +1,275 @@
+import dataclasses
+import typing
+from collections import OrderedDict
+
+from werkzeug.datastructures import MultiDict
+
+from compmatrix.api.views import checks, messages, responses
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.api.views.parameters import (
+    MisusedParamGroup,
+    ParamPartnership
+)
+
+# Turns the values of a parameter into the value the view uses. The values of
+# the parameters declared before it are given as well. Raises a ValueError if
+# the values are invalid.
+ParamParser = typing.Callable[[list[str], dict[str, object]], object]
+
+
+class InvalidParamValuesError(ValueError):
+    """
+    Raised by the parsers of parameters with many values when some of the
+    values are invalid.
+
+    :param valid_value: The value made from the valid values. It still gets
+                        checked for unknown SDK IDs.
+    :param invalid_values: The invalid values.
+    """
+
+    def __init__(self, valid_value: object, invalid_values: list[str]):
+        super().__init__(f'Invalid values: {invalid_values}')
+        self.valid_value = valid_value
+        self.invalid_values = invalid_values
+
+
+@dataclasses.dataclass(frozen=True)
+class ParamSpec:
+    """
+    A parameter of an endpoint.
+
+    :param name: The name of the parameter.
+    :param parse: Turns the values of the parameter into its value. It is
+                  only called when the parameter is specified.
+    :param default: The value of the parameter when it isn't specified.
+    :param default_factory: Creates the value of the parameter when it isn't
+                            specified, for values that shouldn't be shared.
+    :param is_required: Whether the parameter must be given.
+    :param ignores_empty: Whether a parameter with an empty first value is
+                          treated as not specified.
+    :param has_sdk_ids: Whether the value has SDK IDs, which must all refer
+                        to SDKs.
+    :param diagnoses_invalid_values: Whether the invalid values get listed
+                                     in the diagnostics of the error.
+    """
+    name: str
+    parse: ParamParser
+    default: object = None
+    default_factory: typing.Callable[[], object] | None = None
+    is_required: bool = False
+    ignores_empty: bool = False
+    has_sdk_ids: bool = False
+    diagnoses_invalid_values: bool = False
+
+
+@dataclasses.dataclass(frozen=True)
+class ParamPartners:
+    """
+    A partnership between a parameter and its partner. In a coupled
+    partnership, the partner must be given if, and only if, the parameter is
+    specified. In an inverse partnership, the partner must only be given if
+    the parameter is unspecified.
+    """
+    param: str
+    partner: str
+    partnership: ParamPartnership
+
+
+@dataclasses.dataclass
+class ParsedParams:
+    """
+    The values of the parameters of a request, and the errors found in them.
+    The values shouldn't be used if there are errors.
+    """
+    values: dict[str, object]
+    errors: list[dict[str, object]]
+
+
+class ParamSchema:
+    """
+    The parameters of an endpoint, which get parsed and checked in a single
+    pass. Everything that doesn't depend on a request is worked out when the
+    schema is created, so schemas should be created once, at import time.
+
+    The errors come in the same order for every endpoint. Missing
+    parameters come first, then unknown parameters, partners that are
+    missing, invalid values, unknown SDK IDs, and finally misused
+    partners.
+    """
+
+    def __init__(self,
+                 specs: list[ParamSpec],
+                 partners: list[ParamPartners] | None = None,
+                 formats: list[str] | None = None,
+                 field_owners: str = 'apps'):
+        """
+        :param specs: The parameters. Parameters get parsed in this order,
+                      which is also the order of the invalid parameters in
+                      errors.
+        :param partners: The partnerships between the parameters.
+        :param formats: The values allowed in the "format" parameter, for
+                        the error messages.
+        :param field_owners: What the values of the "fields" parameter are
+                             the fields of, for the error messages.
+        """
+        self._specs: tuple[ParamSpec, ...] = tuple(specs)
+        self._known_params: list[str] = [spec.name for spec in specs]
+        self._required_params: list[str] = [
+            spec.name for spec in specs if spec.is_required
+        ]
+        self._partners: tuple[ParamPartners, ...] = tuple(partners or [])
+
+        # The misused parameters are always the partners.
+        self._partner_params: dict[str, str] = {
+            p.partner: p.param for p in self._partners
+        }
+        self._formats: list[str] | None = formats
+        self._field_owners: str = field_owners
+
+    def parse(self, client_params: MultiDict[str, str]) -> ParsedParams:
+        """
+        Parses and checks the parameters of a request.
+        """
+        resp: dict[str, object | list] = {}
+
+        if self._required_params:
+            checks.check_for_missing_params(resp,
+                                            self._required_params,
+                                            client_params)
+
+        checks.check_for_unknown_params(resp,
+                                        self._known_params,
+                                        client_params)
+
+        values: dict[str, object] = {}
+        wrong_valued_params: list[str] = []
+        diagnostics: dict[str, list[str]] = {}
+        params_with_sdk_ids: OrderedDict = OrderedDict()
+        for spec in self._specs:
+            raw_values: list[str] = client_params.getlist(spec.name)
+            if not raw_values or (spec.ignores_empty and raw_values[0] == ''):
+                if spec.default_factory is not None:
+                    value: object = spec.default_factory()
+                else:
+                    value: object = spec.default
+            else:
+                try:
+                    value: object = spec.parse(raw_values, values)
+                except InvalidParamValuesError as e:
+                    wrong_valued_params.append(spec.name)
+                    if spec.diagnoses_invalid_values:
+                        diagnostics[spec.name] = e.invalid_values
+
+                    value: object = e.valid_value
+                except ValueError:
+                    wrong_valued_params.append(spec.name)
+                    value: None = None
+
+            values[spec.name] = value
+            if spec.has_sdk_ids and value is not None:
+                params_with_sdk_ids[spec.name] = value
+
+        misused_param_groups: dict[ParamPartnership, MisusedParamGroup] = {}
+        for partners in self._partners:
+            is_param_specified: bool = (
+                partners.param in client_params
+                and client_params.get(partners.param) != ''
+            )
+            is_partner_given: bool = partners.partner in client_params
+            if partners.partnership == ParamPartnership.INVERSE:
+                is_misused: bool = is_param_specified and is_partner_given
+            else:
+                is_misused: bool = (not is_param_specified
+                                    and is_partner_given)
+                if is_param_specified and not is_partner_given:
+                    _add_missing_partner_error(resp, partners)
+
+            if is_misused:
+                group: MisusedParamGroup = misused_param_groups.setdefault(
+                    partners.partnership,
+                    MisusedParamGroup([], partners.partnership)
+                )
+                group.parameters.append(partners.partner)
+
+        if wrong_valued_params:
+            responses.generate_wrong_valued_params_resp_error(
+                resp, wrong_valued_params, self._formats,
+                self._field_owners)
+            if diagnostics:
+                resp['errors'][-1]['diagnostics'] = diagnostics
+
+        if params_with_sdk_ids:
+            checks.check_for_unknown_ids_in_params(resp, params_with_sdk_ids)
+
+        if misused_param_groups:
+            _add_misused_params_error(resp,
+                                      list(misused_param_groups.values()),
+                                      self._partner_params)
+
+        return ParsedParams(values, resp.get('errors', []))
+
+
+def parse_direction(values: list[str], _: dict[str, object]) -> str:
+    """
+    Parses the direction that a cursor is followed in, which is either
+    "previous" or "next".
+    """
+    if values[0] != 'previous' and values[0] != 'next':
+        raise ValueError(f'Unknown direction, "{values[0]}".')
+
+    return values[0]
+
+
+def parse_comma_separated_names(
+        values: list[str],
+        known_names: typing.Container[str]
+) -> list[str]:
+    """
+    Parses names that are separated by commas, which may be split between
+    many values. Duplicates are dropped, and every name must be known.
+    """
+    names: list[str] = []
+    for value in values:
+        names.extend(name for name in value.split(',') if name)
+
+    names = list(dict.fromkeys(names))
+    if not names or any(n not in known_names for n in names):
+        raise ValueError('Unknown or no names.')
+
+    return names
+
+
+def _add_missing_partner_error(resp: dict[str, object | list],
+                               partners: ParamPartners):
+    if 'errors' not in resp:
+        resp['errors'] = []
+
+    message: str = messages.create_missing_params_message([partners.partner])
+    message = (
+        f'{message} It is required when the "{partners.param}" parameter '
+        'is specified.'
+    )
+    resp['errors'].append({
+        'message': message,
+        'code': AnomalyCode.MISSING_FIELD,
+        'parameters': [partners.partner]
+    })
+
+
+def _add_misused_params_error(resp: dict[str, object | list],
+                              param_groups: list[MisusedParamGroup],
+                              partner_params: dict[str, str]):
+    if 'errors' not in resp:
+        resp['errors'] = []
+
+    message: str = ' '.join(
+        messages.create_misused_params_message(group, partner_params)
+        for group in param_groups
+    )
+    resp['errors'].append({
+        'message': message,
+        'code': AnomalyCode.MISUSED_PARAMETER,
+        'parameters': [
+            p for g in param_groups for p in g.parameters
+        ]
+    })
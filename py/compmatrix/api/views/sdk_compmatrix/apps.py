@@ -1,185 +1,229 @@
+import base64
+import binascii
+import csv
 import dataclasses
-from collections import OrderedDict
+import hashlib
+import io
+import json
+import sys
+import typing
 from http import HTTPStatus
 
-from flask import request
+from flask import Response, current_app, request, stream_with_context
+from flask import json as flask_json
 from flask_sqlalchemy.query import Query
-from sqlalchemy import Subquery, Tuple, Select
-from werkzeug.datastructures import MultiDict
+from sqlalchemy import ColumnElement, Result, Row, Subquery, Tuple, Select
 
 from compmatrix import db
-from compmatrix.api import models
-from compmatrix.api.views import messages, queries, checks, responses
-from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.api import matrix, models, search, versioning
+from compmatrix.api.matrix import membership
+from compmatrix.api.views import queries
 from compmatrix.api.views import view_encoders
 from compmatrix.api.views.parameters import ParamPartnership
+from compmatrix.api.views.schemas import (
+    InvalidParamValuesError,
+    ParamPartners,
+    ParamSchema,
+    ParamSpec,
+    ParsedParams,
+    parse_comma_separated_names,
+    parse_direction
+)
+from compmatrix.utils import caching
+
+_COUNT_CACHE_KEY: typing.Final[str] = 'compmatrix.views.apps.total_counts'
+_FACETS_CACHE_KEY: typing.Final[str] = 'compmatrix.views.apps.facets'
+
+_EXPORT_FORMATS: typing.Final[list[str]] = ['csv', 'ndjson']
+
+# The values the apps of a cell can be counted by. Apps without ratings
+# don't have a rating band, which is their average rating, rounded down.
+_FACETS: typing.Final[dict[str, ColumnElement]] = {
+    'genre_id': models.App.genre_id,
+    'release_year': db.cast(db.func.strftime('%Y', models.App.release_date),
+                            db.Integer),
+    'rating_band': db.case(
+        (models.APP_TOTAL_RATINGS == 0, db.null()),
+        else_=(
+            (db.func.coalesce(models.App.five_star_ratings, 0) * 5
+             + db.func.coalesce(models.App.four_star_ratings, 0) * 4
+             + db.func.coalesce(models.App.three_star_ratings, 0) * 3
+             + db.func.coalesce(models.App.two_star_ratings, 0) * 2
+             + db.func.coalesce(models.App.one_star_ratings, 0))
+            // models.APP_TOTAL_RATINGS
+        )
+    )
+}
+
+# The number of apps with each value of a facet, ordered by the values.
+FacetCounts = list[tuple[object, int]]
+
+# The size of a value of a facet and its count, along with the tuple holding
+# them, which is about the same for all values.
+_FACET_COUNT_SIZE: typing.Final[int] = (sys.getsizeof((0, 0))
+                                        + 2 * sys.getsizeof(0))
+
+# The apps of a cell are specified by the "from" SDK, the "to" SDK, and the
+# other "from" and "to" SDKs, in that order. The other SDKs are sorted.
+CellKey = tuple[int | None, int | None, tuple[int, ...], tuple[int, ...]]
+
+
+@dataclasses.dataclass(frozen=True)
+class AppSortOrder:
+    """
+    An order of the apps of a cell. The apps are ordered by the keys, and the
+    IDs of the apps break the ties between apps with the same keys. The IDs
+    are ordered in the same direction as the keys, so that an index over the
+    keys and the IDs can be used for the whole order.
+
+    :param keys: The expressions the apps are ordered by.
+    :param key_types: The types that the value of each key can have.
+    :param is_descending: Whether the apps with the biggest keys come first.
+    """
+    keys: tuple[ColumnElement, ...]
+    key_types: tuple[tuple[type, ...], ...]
+    is_descending: bool = False
 
 
-@dataclasses.dataclass
-class SDKParamPair:
-    target_sdk: int | None
-    other_sdks: list[int]
+_SORT_ORDERS: typing.Final[dict[str, AppSortOrder]] = {
+    'name': AppSortOrder(
+        (models.App.name, models.App.seller_name),
+        ((str, type(None)), (str, type(None)))
+    ),
+    'ratings': AppSortOrder((models.APP_TOTAL_RATINGS,), ((int,),), True),
+    'release_date': AppSortOrder((models.APP_RELEASE_DATE_KEY,), ((str,),),
+                                 True)
+}
 
 
-@dataclasses.dataclass
-class MisusedParamGroup:
-    parameters: list[str]
-    partnership: ParamPartnership
+@dataclasses.dataclass(frozen=True)
+class AppCursor:
+    """
+    The position of an app in the apps of a cell, given by the values of the
+    keys of the sort order of the apps, and the ID of the app.
+
+    The cursors we give out also carry the total number of apps of the
+    cell, so that the next pages don't need to count them again. The count
+    is only used if its tag matches the cell and data version of the next
+    request.
+    """
+    sort_values: tuple
+    app_id: int
+    total_count: int | None = None
+    count_tag: str | None = None
 
 
 def index():
     """
     Returns the apps that previously and currently have installed the SDKs
     specified in the parameters.
-    """
-    resp: dict[str, object | list] = {}
-
-    known_params: list[str] = [
-        'from_sdk',
-        'to_sdk',
-        'other_from_sdks',
-        'other_to_sdks',
-        'count',
-        'cursor',
-        'direction'
-    ]
-    required_params: list[str] = ['count']
-    partner_params: dict[str, str] = {
-        'from_sdk': 'other_from_sdks',
-        'to_sdk': 'other_to_sdks',
-        'other_from_sdks': 'from_sdk',
-        'other_to_sdks': 'to_sdk',
-        'cursor': 'direction',
-        'direction': 'cursor'
-    }
 
-    params_with_sdk_ids_to_check: OrderedDict = OrderedDict()
-
-    client_params: MultiDict[str, str] = request.args
-
-    checks.check_for_missing_params(resp, required_params, client_params)
-    checks.check_for_unknown_params(resp, known_params, client_params)
-
-    misused_param_groups: list[MisusedParamGroup] = []
-    wrong_valued_params: list[str] = []
-
-    misused_sdk_params: list[str] = []
-
-    raw_from_sdks_params = _get_paired_sdk_params('from_sdk',
-                                                  'other_from_sdks',
-                                                  client_params,
-                                                  params_with_sdk_ids_to_check,
-                                                  wrong_valued_params,
-                                                  misused_sdk_params)
-    from_sdk_param: int | None = raw_from_sdks_params.target_sdk
-    other_from_sdks_param: list[int] = raw_from_sdks_params.other_sdks
-
-    raw_to_sdks_params = _get_paired_sdk_params('to_sdk',
-                                                'other_to_sdks',
-                                                client_params,
-                                                params_with_sdk_ids_to_check,
-                                                wrong_valued_params,
-                                                misused_sdk_params)
-    to_sdk_param: int | None = raw_to_sdks_params.target_sdk
-    other_to_sdks_param: list[int] = raw_to_sdks_params.other_sdks
-
-    if misused_sdk_params:
-        misused_param_groups.append(
-            MisusedParamGroup(misused_sdk_params, ParamPartnership.INVERSE))
-
-    count_param: int | None = _get_count_param_value(client_params,
-                                                     wrong_valued_params)
-    cursor_param: str | None = client_params.get('cursor')
-    cursor_parts: list[str] | None = _get_cursor_parts(cursor_param,
-                                                       wrong_valued_params)
-    direction_param: str | None = _get_direction_param(client_params,
-                                                       wrong_valued_params)
-    _validate_cursor_and_direction_params(cursor_param,
-                                          direction_param,
-                                          resp,
-                                          client_params,
-                                          misused_param_groups)
-
-    if wrong_valued_params:
-        responses.generate_wrong_valued_params_resp_error(resp,
-                                                          wrong_valued_params)
-
-    if params_with_sdk_ids_to_check:
-        checks.check_for_unknown_ids_in_params(resp,
-                                               params_with_sdk_ids_to_check)
-
-    if misused_param_groups:
-        _generate_misused_params_resp_error(resp, misused_param_groups,
-                                            partner_params)
-
-    if 'errors' in resp:
-        return resp, HTTPStatus.UNPROCESSABLE_ENTITY
+    The `fields` parameter limits the fields of the returned apps to the
+    given comma-separated fields. Only those get selected from the database,
+    and the apps are never loaded as models.
+
+    The `q` parameter limits the apps to the ones whose name or seller name
+    has words starting with every word in it. The `app_search` table (see
+    `compmatrix.api.search`) must have been built to use it.
+
+    The `sort` parameter orders the apps by their names and seller names
+    ("name", the default), by their total number of ratings ("ratings"), or
+    by their release dates ("release_date"). The last two put the apps with
+    the most ratings and the newest apps first. Cursors only work with the
+    sort order they were made with.
+
+    The `facets` parameter adds the number of apps of the cell with each
+    value of the given comma-separated facets (see `_FACETS`) to the
+    response. They get counted along with the total number of apps, and are
+    cached per cell and data version.
+    """
+    params: ParsedParams = _INDEX_PARAMS.parse(request.args)
+    if params.errors:
+        return {'errors': params.errors}, HTTPStatus.UNPROCESSABLE_ENTITY
+
+    from_sdk_param: int | None = params.values['from_sdk']
+    other_from_sdks_param: list[int] = params.values['other_from_sdks']
+    to_sdk_param: int | None = params.values['to_sdk']
+    other_to_sdks_param: list[int] = params.values['other_to_sdks']
+    count_param: int | None = params.values['count']
+    sort_order: AppSortOrder = params.values['sort']
+    cursor: AppCursor | None = params.values['cursor']
+    direction_param: str | None = params.values['direction']
+    fields_param: list[str] | None = params.values['fields']
+    match_query: str | None = params.values['q']
+    facets_param: list[str] | None = params.values['facets']
 
     # We finally got all the parameter values. It's time to query our database
     # for it.
-    if from_sdk_param is None and to_sdk_param is None:
-        included_apps_query: Select = queries.get_query_for_none_to_none(
-            other_from_sdks_param, other_to_sdks_param
-        )
-    elif from_sdk_param is None and to_sdk_param is not None:
-        included_apps_query: Select = queries.get_query_for_none_to_to_sdk(
-            to_sdk_param, other_from_sdks_param)
-    elif to_sdk_param is None and from_sdk_param is not None:
-        included_apps_query: Select = (
-            queries.get_query_for_from_sdk_to_none(from_sdk_param,
-                                                   other_to_sdks_param)
-        )
-    else:
-        included_apps_query: Select = queries.get_query_for_from_to_sdks(
-            from_sdk_param, to_sdk_param
-        )
-    included_apps_query: Subquery = included_apps_query.subquery()
-    num_total_apps: int = db.session.execute(
-        db.select(db.func.count('*')).select_from(included_apps_query)
-    ).scalar_one()
-
-    apps_query: Query = (
-        models.App.query.join(
-            included_apps_query, models.App.id == included_apps_query.c.app_id
-        )
+    apps_query, count_query = _get_cell_queries(from_sdk_param,
+                                                to_sdk_param,
+                                                other_from_sdks_param,
+                                                other_to_sdks_param,
+                                                match_query)
+
+    cell_key: CellKey = (
+        from_sdk_param,
+        to_sdk_param,
+        tuple(sorted(set(other_from_sdks_param))),
+        tuple(sorted(set(other_to_sdks_param)))
     )
-    if cursor_param:
-        cursor_vals: Tuple = db.tuple_(*cursor_parts)
-        columns: Tuple = db.tuple_(models.App.name, models.App.seller_name)
-
-        if direction_param == 'previous':
-            # We're using less than because the query will have the results
-            # ordered descendingly, when the direction is "previous".
-            apps_query = apps_query.where(columns < cursor_vals)
-        else:
-            # direction_param == 'next'. Note that we are expecting that our
-            # guard code will check if any of the parameters have invalid
-            # values.
-            apps_query = apps_query.where(columns > cursor_vals)
-
-    if cursor_param and direction_param == 'previous':
-        apps_query = (
-            apps_query
-            .order_by(
-                db.desc(models.App.name),
-                db.desc(models.App.seller_name)
-            )
-        )
+    version, count_cache = versioning.get_versioned_cache(
+        _COUNT_CACHE_KEY,
+        current_app.config['COMPMATRIX_APPS_COUNT_CACHE_MAX_ENTRIES'],
+        current_app.config['COMPMATRIX_APPS_COUNT_CACHE_MAX_BYTES']
+    )
+    count_tag: str = _create_count_tag(version, cell_key, match_query)
+    if facets_param is not None:
+        num_total_apps, facet_counts = _get_facet_counts(cell_key,
+                                                         match_query,
+                                                         facets_param,
+                                                         apps_query,
+                                                         version,
+                                                         count_cache)
     else:
-        apps_query = (
-            apps_query
-            .order_by(
-                db.asc(models.App.name),
-                db.asc(models.App.seller_name)
-            )
-        )
+        num_total_apps: int = _get_total_count(cell_key,
+                                               match_query,
+                                               count_query,
+                                               cursor,
+                                               version,
+                                               count_cache,
+                                               count_tag)
+
+    is_reversed: bool = cursor is not None and direction_param == 'previous'
+    if cursor is not None:
+        # When the direction is "previous", the query will have the results
+        # in the reverse order, so the apps before the cursor come after it.
+        # Note that we are expecting that our guard code will check if any
+        # of the parameters have invalid values.
+        apps_query = apps_query.where(_get_cursor_condition(
+            sort_order, cursor, is_reversed != sort_order.is_descending))
+
+    apps_query = apps_query.order_by(
+        *_get_order_by_clauses(sort_order, is_reversed))
 
     if count_param:
         apps_query = apps_query.limit(count_param)
 
-    apps: list[models.App] = apps_query.all()
+    # The values of the sort keys and the ID come after the app, since the
+    # cursors are made from them. We take them from the rows instead of the
+    # apps so that they are exactly what the database compares.
+    cursor_columns: list[ColumnElement] = [
+        *[key.label(f'sort_key_{i}') for i, key in enumerate(sort_order.keys)],
+        models.App.id.label('sort_app_id')
+    ]
+    if fields_param is not None:
+        # The requested fields come first, which is what the row encoder
+        # expects.
+        apps_query = apps_query.with_entities(
+            *[models.App.__table__.c[field] for field in fields_param],
+            *cursor_columns
+        )
+    else:
+        apps_query = apps_query.add_columns(*cursor_columns)
+
+    apps: list[Row] = apps_query.all()
 
-    if cursor_param and direction_param == 'previous':
+    if is_reversed:
         # We need to reverse the order of the results if the direction was
         # set to 'previous', since we're reversing the order earlier to get
         # the correct values. Now, we're reversing the order once again to
@@ -190,153 +234,526 @@ def index():
         apps.reverse()
 
     resp_apps: list[dict] = []
-    for app in apps:
-        resp_apps.append(view_encoders.encode_app_model_object(app))
+    if fields_param is not None:
+        encode_row: view_encoders.AppRowEncoder = (
+            view_encoders.get_app_row_encoder(tuple(fields_param)))
+        for app in apps:
+            resp_apps.append(encode_row(app))
+    else:
+        for app in apps:
+            resp_apps.append(view_encoders.encode_app_model_object(app[0]))
 
     start_cursor: str | None = None
     end_cursor: str | None = None
 
     if apps:
-        start_cursor = _create_cursor_from_app(apps[0])
-        end_cursor = _create_cursor_from_app(apps[-1])
-
-    return {
-        'data': {
-            'apps': resp_apps,
-            'total_count': num_total_apps,
-            'start_cursor': start_cursor,
-            'end_cursor': end_cursor
-        }
+        num_cursor_columns: int = len(cursor_columns)
+        start_cursor = _create_cursor_from_app(
+            tuple(apps[0][-num_cursor_columns:]), num_total_apps, count_tag)
+        end_cursor = _create_cursor_from_app(
+            tuple(apps[-1][-num_cursor_columns:]), num_total_apps, count_tag)
+
+    resp_data: dict[str, object] = {
+        'apps': resp_apps,
+        'total_count': num_total_apps,
+        'start_cursor': start_cursor,
+        'end_cursor': end_cursor
     }
+    if facets_param is not None:
+        resp_data['facets'] = {
+            facet: [
+                {'value': value, 'count': count}
+                for value, count in facet_counts[facet]
+            ]
+            for facet in facets_param
+        }
 
+    return {'data': resp_data}
 
-def _get_paired_sdk_params(target_sdk_param: str,
-                           other_sdks_param: str,
-                           client_params: MultiDict[str, str],
-                           params_with_ids_to_check: OrderedDict,
-                           wrong_valued_params: list[str],
-                           misused_sdk_params: list[str]) -> SDKParamPair:
-    target_sdk: int | None = None
-    other_sdks: list[int] = []
-    is_target_sdk_specified = (target_sdk_param in client_params
-                               and client_params.get(target_sdk_param) != '')
-    if is_target_sdk_specified:
-        try:
-            target_sdk = int(client_params.get(target_sdk_param))
-            params_with_ids_to_check[target_sdk_param] = target_sdk
-        except ValueError:
-            wrong_valued_params.append(target_sdk_param)
-
-        if other_sdks_param in client_params:
-            misused_sdk_params.append(other_sdks_param)
-
-    # We need to check the values of other_from_sdks even if they are not
-    # supposed to be specified.
-    has_bad_val: bool = False
-    for s in client_params.getlist(other_sdks_param):
-        if s != '':
-            try:
-                sdk: int = int(s)
-                other_sdks.append(sdk)
-            except ValueError:
-                has_bad_val = True
 
-    if has_bad_val:
-        wrong_valued_params.append(other_sdks_param)
+def export():
+    """
+    Streams all the apps of a cell of the competitive matrix, which is
+    specified the same way as in `index()`. The apps come in the same order
+    as in `index()`, as CSV with a header row, or as NDJSON with one app per
+    line, depending on the `format` parameter. The `fields`, `q`, and `sort`
+    parameters work the same way as in `index()`, and `fields` defaults to
+    all the fields of apps.
+
+    The apps get fetched from the database in batches, and each batch gets
+    written out before the next one is fetched, so exporting a big cell
+    doesn't take more memory than a small one. Unlike with `index()`, the
+    apps don't get counted.
+    """
+    params: ParsedParams = _EXPORT_PARAMS.parse(request.args)
+    if params.errors:
+        return {'errors': params.errors}, HTTPStatus.UNPROCESSABLE_ENTITY
+
+    format_param: str = params.values['format']
+    fields_param: list[str] | None = params.values['fields']
+    match_query: str | None = params.values['q']
+    sort_order: AppSortOrder = params.values['sort']
+
+    if fields_param is None:
+        fields_param = list(view_encoders.APP_FIELDS)
+
+    apps_query, _ = _get_cell_queries(params.values['from_sdk'],
+                                      params.values['to_sdk'],
+                                      params.values['other_from_sdks'],
+                                      params.values['other_to_sdks'],
+                                      match_query)
+    apps_query = (
+        apps_query
+        .order_by(*_get_order_by_clauses(sort_order, False))
+        .with_entities(
+            *[models.App.__table__.c[field] for field in fields_param])
+    )
 
-    params_with_ids_to_check[other_sdks_param] = other_sdks
+    # The statement gets executed when the response starts, so that the
+    # session is still around while we go through the rows.
+    apps_statement: Select = apps_query.statement
+    batch_size: int = current_app.config['COMPMATRIX_APPS_EXPORT_BATCH_SIZE']
+    encode_row: view_encoders.AppRowEncoder = (
+        view_encoders.get_app_row_encoder(tuple(fields_param)))
+
+    def generate_batches() -> typing.Iterator[str]:
+        # With `yield_per`, the rows are fetched from the cursor as we go,
+        # instead of all at once.
+        result: Result = db.session.execute(
+            apps_statement, execution_options={'yield_per': batch_size})
+
+        if format_param == 'csv':
+            buffer: io.StringIO = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields_param)
+            for rows in result.partitions():
+                writer.writerows(encode_row(row).values() for row in rows)
+                yield buffer.getvalue()
+
+                buffer.seek(0)
+                buffer.truncate()
+
+            # A cell without apps still gets its header row.
+            yield buffer.getvalue()
+        else:
+            for rows in result.partitions():
+                yield ''.join(
+                    f'{flask_json.dumps(encode_row(row))}\n' for row in rows)
 
-    return SDKParamPair(target_sdk, other_sdks)
+    if format_param == 'csv':
+        mimetype: str = 'text/csv'
+    else:
+        mimetype: str = 'application/x-ndjson'
 
+    return Response(
+        stream_with_context(generate_batches()),
+        mimetype=mimetype,
+        headers={
+            'Content-Disposition': f'attachment; filename=apps.{format_param}'
+        }
+    )
 
-def _get_count_param_value(client_params: MultiDict[str, str],
-                           wrong_valued_params: list[str]) -> int | None:
-    raw_count_value: str | None = client_params.get('count')
-    if raw_count_value:
-        try:
-            count_param = int(raw_count_value)
-            return count_param
-        except ValueError:
-            wrong_valued_params.append('count')
 
-    return None
+def _get_cell_queries(from_sdk: int | None,
+                      to_sdk: int | None,
+                      other_from_sdks: list[int],
+                      other_to_sdks: list[int],
+                      match_query: str | None) -> tuple[Query, Select]:
+    # Returns the query for the apps of a cell, and the query that counts
+    # them. Only the apps that match the search are included if there is
+    # one.
+    if current_app.config['COMPMATRIX_APPS_USE_MEMBERSHIP_TABLE']:
+        # Each app gets checked on its own, so only the apps we go through
+        # until the page is filled get checked.
+        cell_condition: ColumnElement = membership.get_cell_condition(
+            from_sdk, to_sdk, other_from_sdks, other_to_sdks)
+        if match_query is not None:
+            cell_condition = db.and_(
+                cell_condition,
+                models.App.id.in_(
+                    search.get_query_for_matching_app_ids(match_query))
+            )
 
+        apps_query: Query = models.App.query.where(cell_condition)
+        count_query: Select = (
+            db
+            .select(db.func.count('*'))
+            .select_from(models.App)
+            .where(cell_condition)
+        )
+    else:
+        if from_sdk is None and to_sdk is None:
+            included_apps_query: Select = queries.get_query_for_none_to_none(
+                other_from_sdks, other_to_sdks
+            )
+        elif from_sdk is None and to_sdk is not None:
+            included_apps_query: Select = (
+                queries.get_query_for_none_to_to_sdk(to_sdk, other_from_sdks)
+            )
+        elif to_sdk is None and from_sdk is not None:
+            included_apps_query: Select = (
+                queries.get_query_for_from_sdk_to_none(from_sdk, other_to_sdks)
+            )
+        else:
+            included_apps_query: Select = queries.get_query_for_from_to_sdks(
+                from_sdk, to_sdk
+            )
+        included_apps_query: Subquery = included_apps_query.subquery()
 
-def _get_cursor_parts(cursor_param: str | None,
-                      wrong_valued_params: list[str]) -> list[str]:
-    if cursor_param:
-        cursor_parts: list[str] = cursor_param.split(';')
-        if len(cursor_parts) != 2:
-            wrong_valued_params.append('cursor')
+        apps_query: Query = (
+            models.App.query.join(
+                included_apps_query,
+                models.App.id == included_apps_query.c.app_id
+            )
+        )
+        count_query: Select = (
+            db
+            .select(db.func.count('*'))
+            .select_from(included_apps_query)
+        )
+        if match_query is not None:
+            matching_app_ids: Select = search.get_query_for_matching_app_ids(
+                match_query)
+            apps_query = apps_query.where(
+                models.App.id.in_(matching_app_ids))
+            count_query = count_query.where(
+                included_apps_query.c.app_id.in_(matching_app_ids))
+
+    return apps_query, count_query
+
+
+def _get_cursor_condition(sort_order: AppSortOrder,
+                          cursor: AppCursor,
+                          is_before: bool) -> ColumnElement:
+    # Returns the condition for the apps after the cursor, or before it if
+    # `is_before` is set. SQLite doesn't seek in indexes on expressions when
+    # comparing row values, so the first key gets a range of its own for
+    # SQLite to seek to, like with the SDKs. The rest of the keys and the ID
+    # only break ties between apps with the same first key.
+    first_key, *other_keys = sort_order.keys
+    first_value, *other_values = cursor.sort_values
+    if other_keys:
+        tie_breaker: ColumnElement = db.tuple_(*other_keys, models.App.id)
+        tie_breaker_value: Tuple = db.tuple_(*other_values, cursor.app_id)
     else:
-        cursor_parts: list[str] = []
+        tie_breaker: ColumnElement = models.App.id
+        tie_breaker_value: int = cursor.app_id
 
-    return cursor_parts
+    if is_before:
+        return db.and_(first_key <= first_value,
+                       db.or_(first_key < first_value,
+                              tie_breaker < tie_breaker_value))
+    else:
+        return db.and_(first_key >= first_value,
+                       db.or_(first_key > first_value,
+                              tie_breaker > tie_breaker_value))
 
 
-def _get_direction_param(client_params: MultiDict[str, str],
-                         wrong_valued_params: list[str]) -> str | None:
-    if 'direction' in client_params:
-        direction_param: str = client_params.get('direction')
-        if direction_param != "previous" and direction_param != "next":
-            wrong_valued_params.append('direction')
+def _get_order_by_clauses(sort_order: AppSortOrder,
+                          is_reversed: bool) -> list[ColumnElement]:
+    columns: list[ColumnElement] = [*sort_order.keys, models.App.id]
+    if is_reversed != sort_order.is_descending:
+        return [db.desc(column) for column in columns]
     else:
-        direction_param: None = None
+        return [db.asc(column) for column in columns]
+
+
+def _get_total_count(cell_key: CellKey,
+                     match_query: str | None,
+                     count_query: Select,
+                     cursor: AppCursor | None,
+                     version: versioning.DataVersion,
+                     count_cache: caching.LRUCache,
+                     count_tag: str) -> int:
+    if cursor is not None and cursor.count_tag == count_tag:
+        return cursor.total_count
+
+    cache_key: tuple = _create_count_cache_key(version, cell_key, match_query)
+    num_total_apps: int | None = count_cache.get(cache_key)
+    if num_total_apps is not None:
+        return num_total_apps
+
+    # The matrices count all the apps of a cell, not just the ones that
+    # match a search.
+    can_count_from_matrices: bool = (
+        current_app.config['COMPMATRIX_APPS_COUNT_FROM_MATRICES']
+        and match_query is None
+    )
+    if can_count_from_matrices:
+        num_total_apps = matrix.find_cached_number(*cell_key)
+
+    if num_total_apps is None:
+        num_total_apps = db.session.execute(count_query).scalar_one()
+
+    num_bytes: int = (sys.getsizeof(cache_key)
+                      + sys.getsizeof(num_total_apps)
+                      + _get_cell_key_size(cell_key)
+                      + sys.getsizeof(match_query))
+    count_cache.put(cache_key, num_total_apps, num_bytes)
+
+    return num_total_apps
+
+
+def _get_facet_counts(
+        cell_key: CellKey,
+        match_query: str | None,
+        facets: list[str],
+        apps_query: Query,
+        version: versioning.DataVersion,
+        count_cache: caching.LRUCache
+) -> tuple[int, dict[str, FacetCounts]]:
+    # Gets the total number of apps of a cell, along with the number of apps
+    # with each value of the facets. Both come from a single query that
+    # counts the apps with each combination of the values, which are then
+    # added up for each facet.
+    facets_cache: caching.LRUCache = versioning.get_versioned_cache(
+        _FACETS_CACHE_KEY,
+        current_app.config['COMPMATRIX_APPS_FACETS_CACHE_MAX_ENTRIES'],
+        current_app.config['COMPMATRIX_APPS_FACETS_CACHE_MAX_BYTES']
+    )[1]
+
+    # The facets are sorted, so that the order they are requested in doesn't
+    # matter.
+    sorted_facets: tuple[str, ...] = tuple(sorted(facets))
+    cache_key: tuple = (version, *cell_key, match_query, sorted_facets)
+    cached_counts: tuple[int, dict[str, FacetCounts]] | None = (
+        facets_cache.get(cache_key))
+    if cached_counts is not None:
+        return cached_counts
+
+    facet_columns: list[ColumnElement] = [
+        _FACETS[facet] for facet in sorted_facets
+    ]
+    counts_query: Query = (
+        apps_query
+        .with_entities(*facet_columns, db.func.count('*'))
+        .group_by(*facet_columns)
+    )
 
-    return direction_param
+    num_total_apps: int = 0
+    counters: list[dict[object, int]] = [{} for _ in sorted_facets]
+    for *values, count in counts_query.all():
+        num_total_apps += count
+        for counter, value in zip(counters, values):
+            counter[value] = counter.get(value, 0) + count
+
+    # Apps without a value for a facet come last.
+    facet_counts: dict[str, FacetCounts] = {
+        facet: sorted(counter.items(),
+                      key=lambda item: (item[0] is None, item[0] or 0))
+        for facet, counter in zip(sorted_facets, counters)
+    }
 
+    num_bytes: int = (sys.getsizeof(cache_key)
+                      + _get_cell_key_size(cell_key)
+                      + sys.getsizeof(match_query)
+                      + sys.getsizeof(facet_counts)
+                      + sum(sys.getsizeof(counts)
+                            + len(counts) * _FACET_COUNT_SIZE
+                            for counts in facet_counts.values()))
+    facets_cache.put(cache_key, (num_total_apps, facet_counts), num_bytes)
+
+    # The next pages are likely to not ask for the facets again, but they
+    # still need the total number of apps.
+    count_cache_key: tuple = _create_count_cache_key(version,
+                                                     cell_key,
+                                                     match_query)
+    count_cache.put(count_cache_key,
+                    num_total_apps,
+                    (sys.getsizeof(count_cache_key)
+                     + sys.getsizeof(num_total_apps)
+                     + _get_cell_key_size(cell_key)
+                     + sys.getsizeof(match_query)))
+
+    return num_total_apps, facet_counts
+
+
+def _create_count_cache_key(version: versioning.DataVersion,
+                            cell_key: CellKey,
+                            match_query: str | None) -> tuple:
+    return version, *cell_key, match_query
+
+
+def _get_cell_key_size(cell_key: CellKey) -> int:
+    # The tuples of the other SDKs are the only parts of a cell key that
+    # grow with it.
+    return sum(sys.getsizeof(ids) for ids in cell_key[2:])
+
+
+def _create_count_tag(version: versioning.DataVersion,
+                      cell_key: CellKey,
+                      match_query: str | None) -> str:
+    # Ties the counts in our cursors to the cell, search, and data version
+    # they were counted for. It doesn't need to be secret, since a client
+    # that forges a count only gets the wrong count back.
+    return hashlib.blake2b(
+        repr((version, cell_key, match_query)).encode('utf-8'),
+        digest_size=8
+    ).hexdigest()
+
+
+def _create_cursor_from_app(position: tuple,
+                            total_count: int,
+                            count_tag: str) -> str:
+    # The position is the values of the sort keys of the app, then its ID.
+    # Cursors are opaque to clients, so that names with any characters in
+    # them can be put in a cursor. They are URL-safe as well.
+    cursor_json: str = json.dumps([*position, total_count, count_tag],
+                                  ensure_ascii=False,
+                                  separators=(',', ':'))
+    return (
+        base64.urlsafe_b64encode(cursor_json.encode('utf-8'))
+        .decode('ascii')
+        .rstrip('=')
+    )
 
-def _generate_misused_params_resp_error(resp: dict[str, object | list],
-                                        param_groups: list[MisusedParamGroup],
-                                        partner_params: dict[str, str]):
-    if param_groups:
-        if 'errors' not in resp:
-            resp['errors'] = []
 
-        message_parts: list[str] = []
-        for group in param_groups:
-            message_parts.append(
-                messages.create_misused_params_message(group, partner_params))
+def _parse_sdk_id(values: list[str], _: dict[str, object]) -> int:
+    return int(values[0])
 
-        message: str = ' '.join(message_parts)
 
-        resp['errors'].append({
-            'message': message,
-            'code': AnomalyCode.MISUSED_PARAMETER,
-            'parameters': [
-                p for g in param_groups for p in g.parameters
-            ]
-        })
-
-
-def _validate_cursor_and_direction_params(
-        cursor_param: str | None,
-        direction_param: str | None,
-        resp: dict[str, object | list],
-        client_params: MultiDict[str, str],
-        misused_param_groups: list[MisusedParamGroup]):
-    if cursor_param:
-        if 'direction' not in client_params:
-            if 'errors' not in resp:
-                resp['errors'] = []
-
-            missing_param: list[str] = ['direction']
-            message: str = messages.create_missing_params_message(
-                missing_param)
-            message = (
-                f'{message} It is required when the "cursor" parameter '
-                'is specified.'
-            )
-            resp['errors'].append({
-                'message': message,
-                'code': AnomalyCode.MISSING_FIELD,
-                'parameters': list(missing_param)
-            })
-    elif direction_param is not None:
-        # direction parameter specified even if cursor was not.
-        misused_param_groups.append(
-            MisusedParamGroup(['direction'], ParamPartnership.COUPLED))
-
-
-def _create_cursor_from_app(app: models.App) -> str:
-    return f'{app.name};{app.seller_name}'
+def _parse_other_sdk_ids(values: list[str],
+                         _: dict[str, object]) -> list[int]:
+    # Empty values are skipped. The IDs that are still valid get checked
+    # even if some of the values are invalid.
+    sdk_ids: list[int] = []
+    invalid_values: list[str] = []
+    for value in values:
+        if value != '':
+            try:
+                sdk_ids.append(int(value))
+            except ValueError:
+                invalid_values.append(value)
+
+    if invalid_values:
+        raise InvalidParamValuesError(sdk_ids, invalid_values)
+
+    return sdk_ids
+
+
+def _parse_count(values: list[str], _: dict[str, object]) -> int:
+    return int(values[0])
+
+
+def _parse_sort(values: list[str], _: dict[str, object]) -> AppSortOrder:
+    sort_order: AppSortOrder | None = _SORT_ORDERS.get(values[0])
+    if sort_order is None:
+        raise ValueError(f'Unknown sort order, "{values[0]}".')
+
+    return sort_order
+
+
+def _parse_cursor(values: list[str],
+                  parsed_values: dict[str, object]) -> AppCursor | None:
+    sort_order: AppSortOrder | None = parsed_values['sort']
+    if sort_order is None:
+        # Without a valid sort order, we can't tell if a cursor is valid.
+        return None
+
+    # The padding is stripped from the cursors we create, so we need to put
+    # it back before decoding.
+    cursor_param: str = values[0]
+    padding: str = '=' * (-len(cursor_param) % 4)
+    try:
+        cursor_values: object = json.loads(
+            base64.urlsafe_b64decode(f'{cursor_param}{padding}'))
+    except (binascii.Error, ValueError):
+        cursor_values = None
+
+    # Cursors have the values of the sort keys, then the ID of the app.
+    # Cursors made by clients from the apps they have may not have a count.
+    num_keys: int = len(sort_order.keys)
+    is_valid_cursor: bool = (
+        isinstance(cursor_values, list)
+        and len(cursor_values) in (num_keys + 1, num_keys + 3)
+        and all(type(value) in key_type
+                for value, key_type in zip(cursor_values,
+                                           sort_order.key_types))
+        and type(cursor_values[num_keys]) is int
+        and (len(cursor_values) == num_keys + 1
+             or (type(cursor_values[num_keys + 1]) is int
+                 and isinstance(cursor_values[num_keys + 2], str)))
+    )
+    if not is_valid_cursor:
+        raise ValueError('Invalid cursor.')
+
+    return AppCursor(tuple(cursor_values[:num_keys]),
+                     *cursor_values[num_keys:])
+
+
+def _parse_export_format(values: list[str], _: dict[str, object]) -> str:
+    if values[0] not in _EXPORT_FORMATS:
+        raise ValueError(f'Unknown format, "{values[0]}".')
+
+    return values[0]
+
+
+def _parse_fields(values: list[str], _: dict[str, object]) -> list[str]:
+    return parse_comma_separated_names(values, view_encoders.APP_FIELDS)
+
+
+def _parse_search_text(values: list[str], _: dict[str, object]) -> str:
+    match_query: str | None = search.create_match_query(values[0])
+    if match_query is None:
+        raise ValueError('The search text has no words.')
+
+    return match_query
+
+
+def _parse_facets(values: list[str], _: dict[str, object]) -> list[str]:
+    return parse_comma_separated_names(values, _FACETS)
+
+
+# The apps of a cell are specified with the same parameters in every
+# endpoint.
+_CELL_PARAM_SPECS: typing.Final[list[ParamSpec]] = [
+    ParamSpec('from_sdk',
+              _parse_sdk_id,
+              ignores_empty=True,
+              has_sdk_ids=True),
+    ParamSpec('other_from_sdks',
+              _parse_other_sdk_ids,
+              default_factory=list,
+              has_sdk_ids=True),
+    ParamSpec('to_sdk',
+              _parse_sdk_id,
+              ignores_empty=True,
+              has_sdk_ids=True),
+    ParamSpec('other_to_sdks',
+              _parse_other_sdk_ids,
+              default_factory=list,
+              has_sdk_ids=True)
+]
+_CELL_PARAM_PARTNERS: typing.Final[list[ParamPartners]] = [
+    ParamPartners('from_sdk', 'other_from_sdks', ParamPartnership.INVERSE),
+    ParamPartners('to_sdk', 'other_to_sdks', ParamPartnership.INVERSE)
+]
+
+_INDEX_PARAMS: typing.Final[ParamSchema] = ParamSchema(
+    [
+        *_CELL_PARAM_SPECS,
+        ParamSpec('count', _parse_count, is_required=True,
+                  ignores_empty=True),
+        ParamSpec('sort', _parse_sort, default=_SORT_ORDERS['name']),
+        ParamSpec('cursor', _parse_cursor, ignores_empty=True),
+        ParamSpec('direction', parse_direction),
+        ParamSpec('fields', _parse_fields),
+        ParamSpec('q', _parse_search_text),
+        ParamSpec('facets', _parse_facets)
+    ],
+    [
+        *_CELL_PARAM_PARTNERS,
+        ParamPartners('cursor', 'direction', ParamPartnership.COUPLED)
+    ]
+)
+_EXPORT_PARAMS: typing.Final[ParamSchema] = ParamSchema(
+    [
+        *_CELL_PARAM_SPECS,
+        ParamSpec('format', _parse_export_format, default='csv'),
+        ParamSpec('fields', _parse_fields),
+        ParamSpec('q', _parse_search_text),
+        ParamSpec('sort', _parse_sort, default=_SORT_ORDERS['name'])
+    ],
+    _CELL_PARAM_PARTNERS,
+    _EXPORT_FORMATS
+)
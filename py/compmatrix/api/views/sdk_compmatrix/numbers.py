@@ -1,20 +1,16 @@
-import dataclasses
-from collections import OrderedDict
+import typing
 from http import HTTPStatus
 
-from flask import request
-from sqlalchemy.sql.selectable import Select
-from werkzeug.datastructures import MultiDict
+from flask import Response, current_app, json, request, stream_with_context
 
-from compmatrix import db
-from compmatrix.api import models
-from compmatrix.api.views import queries, checks, responses
-
-
-@dataclasses.dataclass
-class SDKParamValues:
-    valid: list[int]
-    invalid: list[object]
+from compmatrix.api import matrix
+from compmatrix.api.matrix import approx, derived
+from compmatrix.api.views.schemas import (
+    InvalidParamValuesError,
+    ParamSchema,
+    ParamSpec,
+    ParsedParams
+)
 
 
 def index():
@@ -22,6 +18,19 @@ def index():
     Returns the number of apps that previously and currently have installed
     the SDKs specified in the parameters.
 
+    The matrix can also be normalized per row or per column with the
+    `normalize` parameter. Setting the `derived` parameter to "true" adds the
+    retention rate, churn rate, and net acquisition of each SDK that is both
+    a "from" and a "to" SDK.
+
+    Setting the `format` parameter to "ndjson" streams the matrix instead,
+    with one row per line, followed by a line with a summary of the matrix.
+
+    Setting the `mode` parameter to "approx" estimates the matrix from a
+    sample of the apps instead, which is much faster with lots of apps. Each
+    estimate comes with the lower and upper bounds of its confidence
+    interval.
+
     We're sending back an HTTP 422 when responding to requests with
     incomplete parameters, since everything is alright, but we're missing
     some required content, which makes us unable to process stuff. Besides,
@@ -29,144 +38,258 @@ def index():
     (https://datatracker.ietf.org/doc/html/rfc9110), which was published on
     June 2022, so no worries about non-standard practices.
     """
-    client_params: MultiDict[str, str] = request.args
+    params: ParsedParams = _INDEX_PARAMS.parse(request.args)
+    if params.errors:
+        return {'errors': params.errors}, HTTPStatus.UNPROCESSABLE_ENTITY
+
+    from_sdks: list[int] = params.values['from_sdks']
+    to_sdks: list[int] = params.values['to_sdks']
+    normalize_param: derived.Normalization = params.values['normalize']
+    derived_param: bool = params.values['derived']
+    format_param: str = params.values['format']
+    mode_param: str = params.values['mode']
+
     resp: dict[str, object | list] = {}
-    known_params: list[str] = ['from_sdks', 'to_sdks']
-
-    from_sdks_vals: SDKParamValues = _get_sdk_param_values('from_sdks',
-                                                           client_params)
-    to_sdks_vals: SDKParamValues = _get_sdk_param_values('to_sdks',
-                                                         client_params)
-
-    checks.check_for_unknown_params(resp, known_params, client_params)
-
-    if from_sdks_vals.invalid or to_sdks_vals.invalid:
-        # TODO: We should be able to know the number of values a parameter has
-        #       so that we can send out better messages.
-        wrong_valued_params: list[str] = []
-        diagnostics: dict[str, list[object]] = {}
-        if from_sdks_vals.invalid:
-            wrong_valued_params.append('from_sdks')
-            diagnostics['from_sdks'] = from_sdks_vals.invalid
-
-        if to_sdks_vals.invalid:
-            wrong_valued_params.append('to_sdks')
-            diagnostics['to_sdks'] = to_sdks_vals.invalid
-
-        responses.generate_wrong_valued_params_resp_error(resp,
-                                                          wrong_valued_params)
-
-        # Temporarily to do it here, while the other endpoint (/apps) is not
-        # expecting a diagnostics field yet. In the future, we should put a
-        # diagnostics field in the other endpoint.
-        resp['errors'][-1]['diagnostics'] = diagnostics
-
-    params_with_sdk_ids: OrderedDict = OrderedDict({
-        'from_sdks': from_sdks_vals.valid,
-        'to_sdks': to_sdks_vals.valid
-    })
-    checks.check_for_unknown_ids_in_params(resp, params_with_sdk_ids)
-
-    if 'errors' in resp:
-        return resp, HTTPStatus.UNPROCESSABLE_ENTITY
-
-    num_sdks: int = db.session.query(models.SDK).count()
-
-    number_values: list = []
-    from_sdks = from_sdks_vals.valid
-    to_sdks = to_sdks_vals.valid
-    for from_sdk in from_sdks:
-        from_sdk_id: int = from_sdk
-        row_numbers: list = []
-
-        # Get the numbers of apps from and to SDKs.
-        for to_sdk in to_sdks:
-            to_sdk_id: int = to_sdk
-            count: int = db.session.execute(
-                _get_count_query_for_from_to_sdks(from_sdk_id, to_sdk_id)
-            ).scalar_one()
-            row_numbers.append(count)
-
-        # And we're gonna add a column for "(none)", since we're also gonna
-        # count apps that used to have SDKs installed.
-        count: int = db.session.execute(
-            _get_count_query_for_from_sdk_to_none(from_sdk_id, to_sdks)
-        ).scalar_one()
-        row_numbers.append(count)
-
-        number_values.append(row_numbers)
-
-    # We're gonna have to add a row for apps with no SDKs and whose SDKs that
-    # were not specified.
-    row_numbers: list = []
-    for to_sdk_id in to_sdks:
-        count: int = db.session.execute(
-            _get_count_query_for_none_to_to_sdk(to_sdk_id, from_sdks)
-        ).scalar_one()
-        row_numbers.append(count)
-
-    # And then make a column for "(none)" again, since the apps that no
-    # longer have SDKs installed are still counted.
-    count: int = db.session.execute(
-        _get_count_query_for_none_to_none(from_sdks, to_sdks)
-    ).scalar_one()
-    row_numbers.append(count)
-
-    number_values.append(row_numbers)
-
-    resp['data'] = {
-        'numbers': number_values
+
+    if mode_param == 'approx':
+        return _create_approx_response(resp,
+                                       from_sdks,
+                                       to_sdks,
+                                       normalize_param,
+                                       derived_param,
+                                       format_param)
+
+    if format_param == 'ndjson':
+        rows, sdk_metrics = matrix.iter_matrix_rows(from_sdks, to_sdks)
+        return _create_ndjson_response(rows,
+                                       sdk_metrics,
+                                       from_sdks,
+                                       to_sdks,
+                                       normalize_param,
+                                       derived_param)
+
+    if normalize_param == derived.Normalization.NONE and not derived_param:
+        number_values: list[list[int]] = matrix.compute_numbers(
+            from_sdks, to_sdks)
+
+        resp['data'] = {
+            'numbers': number_values
+        }
+
+        return resp
+
+    matrix_numbers: derived.MatrixNumbers = matrix.compute_matrix_numbers(
+        from_sdks, to_sdks)
+
+    resp['data'] = _create_matrix_numbers_data(from_sdks,
+                                               matrix_numbers,
+                                               normalize_param,
+                                               derived_param)
+
+    return resp
+
+
+def _create_approx_response(
+        resp: dict[str, object | list],
+        from_sdks: list[int],
+        to_sdks: list[int],
+        normalize_param: derived.Normalization,
+        derived_param: bool,
+        format_param: str
+) -> dict[str, object | list] | Response:
+    matrix_numbers, approx_numbers = matrix.estimate_matrix_numbers(from_sdks,
+                                                                    to_sdks)
+    approx_data: dict[str, object] = {
+        'confidence_level': approx.CONFIDENCE_LEVEL,
+        'sample_rate': current_app.config['COMPMATRIX_APPROX_SAMPLE_RATE']
     }
 
+    if format_param == 'ndjson':
+        rows: typing.Iterator[derived.MatrixRow] = (
+            derived.MatrixRow(from_sdk, *values)
+            for from_sdk, values in zip([*from_sdks, None],
+                                        zip(matrix_numbers.numbers,
+                                            matrix_numbers.row_normalized,
+                                            matrix_numbers.column_normalized))
+        )
+        return _create_ndjson_response(rows,
+                                       matrix_numbers.sdk_metrics,
+                                       from_sdks,
+                                       to_sdks,
+                                       normalize_param,
+                                       derived_param,
+                                       approx_numbers.lower_bounds,
+                                       approx_numbers.upper_bounds,
+                                       approx_data)
+
+    resp['data'] = _create_matrix_numbers_data(from_sdks,
+                                               matrix_numbers,
+                                               normalize_param,
+                                               derived_param)
+    resp['data']['lower_bounds'] = approx_numbers.lower_bounds
+    resp['data']['upper_bounds'] = approx_numbers.upper_bounds
+    resp['data'].update(approx_data)
+
     return resp
 
 
-def _get_sdk_param_values(
-        param_name: str,
-        client_params: MultiDict[str, str]
-) -> SDKParamValues:
-    sdk_params: list[int] = []
-    invalid_values: list[object] = []
-    if param_name in client_params and client_params.get(param_name) != '':
-        for s in client_params.getlist(param_name):
-            try:
-                sdk: int = int(s)
-                sdk_params.append(sdk)
-            except ValueError:
-                invalid_values.append(s)
-
-    return SDKParamValues(sdk_params, invalid_values)
-
-
-def _get_count_query_for_from_to_sdks(from_sdk_id: int,
-                                      to_sdk_id: int) -> Select:
-    query: Select = queries.get_query_for_from_to_sdks(from_sdk_id, to_sdk_id)
-    return db.select(db.func.count('*')).select_from(query.subquery())
-
-
-def _get_count_query_for_from_sdk_to_none(
-        from_sdk_id: int,
-        other_to_sdks_ids: list[int]
-) -> Select:
-    query: Select = queries.get_query_for_from_sdk_to_none(
-        from_sdk_id,
-        other_to_sdks_ids)
-    return db.select(db.func.count('*')).select_from(query.subquery())
-
-
-def _get_count_query_for_none_to_to_sdk(
-        to_sdk_id: int,
-        other_from_sdks_param: list[int]
-) -> Select:
-    query: Select = queries.get_query_for_none_to_to_sdk(to_sdk_id,
-                                                         other_from_sdks_param)
-    return db.select(db.func.count('*')).select_from(query.subquery())
-
-
-def _get_count_query_for_none_to_none(
-        other_from_sdks_param: list[int],
-        other_to_sdks_param: list[int]
-) -> Select:
-    query: Select = queries.get_query_for_none_to_none(other_from_sdks_param,
-                                                       other_to_sdks_param)
-    return db.select(db.func.count('*')).select_from(query.subquery())
+def _create_matrix_numbers_data(
+        from_sdks: list[int],
+        matrix_numbers: derived.MatrixNumbers,
+        normalize_param: derived.Normalization,
+        derived_param: bool
+) -> dict[str, object]:
+    data: dict[str, object] = {
+        'numbers': matrix_numbers.numbers
+    }
+
+    if normalize_param == derived.Normalization.ROW:
+        data['normalized_numbers'] = matrix_numbers.row_normalized
+    elif normalize_param == derived.Normalization.COLUMN:
+        data['normalized_numbers'] = matrix_numbers.column_normalized
+
+    if derived_param:
+        data['sdk_metrics'] = _create_sdk_metrics_data(
+            from_sdks, matrix_numbers.sdk_metrics)
+
+    return data
+
+
+def _create_ndjson_response(
+        rows: typing.Iterator[derived.MatrixRow],
+        sdk_metrics: dict[int, derived.SDKMetrics],
+        from_sdks: list[int],
+        to_sdks: list[int],
+        normalize_param: derived.Normalization,
+        derived_param: bool,
+        lower_bounds: list[list[int]] | None = None,
+        upper_bounds: list[list[int]] | None = None,
+        approx_data: dict[str, object] | None = None
+) -> Response:
+    # The matrix must be computed before we start responding, so that errors
+    # still get a proper response.
+    def generate_lines() -> typing.Iterator[str]:
+        num_rows: int = 0
+        for row in rows:
+            row_data: dict[str, object] = {
+                'index': num_rows,
+                'from_sdk': row.from_sdk,
+                'numbers': row.numbers
+            }
+            if normalize_param == derived.Normalization.ROW:
+                row_data['normalized_numbers'] = row.row_normalized
+            elif normalize_param == derived.Normalization.COLUMN:
+                row_data['normalized_numbers'] = row.column_normalized
+
+            if lower_bounds is not None and upper_bounds is not None:
+                row_data['lower_bounds'] = lower_bounds[num_rows]
+                row_data['upper_bounds'] = upper_bounds[num_rows]
+
+            yield f'{json.dumps({"row": row_data})}\n'
+
+            num_rows += 1
+
+        summary: dict[str, object] = {
+            'num_rows': num_rows,
+            'num_columns': len(to_sdks) + 1
+        }
+        if derived_param:
+            summary['sdk_metrics'] = _create_sdk_metrics_data(from_sdks,
+                                                              sdk_metrics)
+
+        if approx_data is not None:
+            summary.update(approx_data)
+
+        yield f'{json.dumps({"summary": summary})}\n'
+
+    return Response(stream_with_context(generate_lines()),
+                    mimetype='application/x-ndjson')
+
+
+def _create_sdk_metrics_data(
+        from_sdks: list[int],
+        sdk_metrics: dict[int, derived.SDKMetrics]
+) -> list[dict[str, object]]:
+    # Only SDKs that are both "from" and "to" SDKs have metrics. They follow
+    # the order of the "from" SDKs.
+    sdk_metrics_data: list[dict[str, object]] = []
+    for sdk in dict.fromkeys(from_sdks):
+        if sdk in sdk_metrics:
+            metrics: derived.SDKMetrics = sdk_metrics[sdk]
+            sdk_metrics_data.append({
+                'sdk_id': sdk,
+                'retention_rate': metrics.retention_rate,
+                'churn_rate': metrics.churn_rate,
+                'net_acquisition': metrics.net_acquisition
+            })
+
+    return sdk_metrics_data
+
+
+def _parse_sdk_ids(values: list[str], _: dict[str, object]) -> list[int]:
+    # The IDs that are still valid get checked even if some of the values
+    # are invalid.
+    sdk_ids: list[int] = []
+    invalid_values: list[str] = []
+    for value in values:
+        try:
+            sdk_ids.append(int(value))
+        except ValueError:
+            invalid_values.append(value)
+
+    if invalid_values:
+        raise InvalidParamValuesError(sdk_ids, invalid_values)
+
+    return sdk_ids
+
+
+def _parse_normalize(values: list[str],
+                     _: dict[str, object]) -> derived.Normalization:
+    return derived.Normalization(values[0])
+
+
+def _parse_derived(values: list[str], _: dict[str, object]) -> bool:
+    if values[0] == 'true':
+        return True
+    elif values[0] == 'false':
+        return False
+    else:
+        raise ValueError(f'Not a boolean, "{values[0]}".')
+
+
+def _parse_format(values: list[str], _: dict[str, object]) -> str:
+    if values[0] != 'json' and values[0] != 'ndjson':
+        raise ValueError(f'Unknown format, "{values[0]}".')
+
+    return values[0]
+
+
+def _parse_mode(values: list[str], _: dict[str, object]) -> str:
+    if values[0] != 'exact' and values[0] != 'approx':
+        raise ValueError(f'Unknown mode, "{values[0]}".')
+
+    return values[0]
+
+
+# The invalid SDK IDs are listed in the diagnostics of the error. The other
+# endpoints don't do so yet.
+_INDEX_PARAMS: typing.Final[ParamSchema] = ParamSchema([
+    ParamSpec('from_sdks',
+              _parse_sdk_ids,
+              default_factory=list,
+              ignores_empty=True,
+              has_sdk_ids=True,
+              diagnoses_invalid_values=True),
+    ParamSpec('to_sdks',
+              _parse_sdk_ids,
+              default_factory=list,
+              ignores_empty=True,
+              has_sdk_ids=True,
+              diagnoses_invalid_values=True),
+    ParamSpec('normalize',
+              _parse_normalize,
+              default=derived.Normalization.NONE),
+    ParamSpec('derived', _parse_derived, default=False),
+    ParamSpec('format', _parse_format, default='json'),
+    ParamSpec('mode', _parse_mode, default='exact')
+])
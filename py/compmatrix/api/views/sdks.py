@@ -1,20 +1,284 @@
-from sqlalchemy import asc, collate
+import base64
+import binascii
+import dataclasses
+import gzip
+import hashlib
+import json
+import typing
+from http import HTTPStatus
 
-from compmatrix import model_encoders
-from compmatrix.api import models
+from flask import Response, current_app, request
+from sqlalchemy import ColumnElement, Row, Select
+
+from compmatrix import db, model_encoders
+from compmatrix.api import models, versioning
+from compmatrix.api.views import view_encoders
+from compmatrix.api.views.parameters import ParamPartnership
+from compmatrix.api.views.schemas import (
+    ParamPartners,
+    ParamSchema,
+    ParamSpec,
+    ParsedParams,
+    parse_comma_separated_names,
+    parse_direction
+)
+
+_VERSIONED_KEY: typing.Final[str] = 'compmatrix.views.sdks'
+_DEFAULT_COUNT: typing.Final[int] = 50
+_MAX_COUNT: typing.Final[int] = 1000
+
+# Every value that starts with a prefix sorts between the prefix and the
+# prefix followed by the last code point, which is never used in text.
+_PREFIX_UPPER_BOUND_SUFFIX: typing.Final[str] = '\U0010ffff'
+
+
+@dataclasses.dataclass(frozen=True)
+class SDKsBody:
+    """
+    The body of the response with all the SDKs, as is and gzipped, along
+    with the strong ETags of both.
+    """
+    data: bytes
+    gzipped_data: bytes
+    etag: str
+    gzipped_etag: str
+
+
+@dataclasses.dataclass(frozen=True)
+class SDKCursor:
+    """
+    The position of an SDK in the catalog, which is the key of its name and
+    its ID.
+    """
+    name_key: str
+    sdk_id: int
 
 
 def index():
+    """
+    Returns the SDKs, sorted by their names.
+
+    Without any parameters, all the SDKs get returned. The SDKs rarely
+    change, so the body of that response is only put together and gzipped
+    once per data version. Clients that send the ETag of the body they have
+    in `If-None-Match` get a 304 if it's still current.
+
+    With any parameters, the SDKs get paged through instead, `count` SDKs
+    at a time (50 by default), with the cursors we return along with them.
+    Counts above 1000 get lowered to 1000, so that a page never holds a
+    large part of the catalog.
+    The `q` parameter limits the SDKs to the ones whose name or slug starts
+    with it, regardless of the case of ASCII letters. The `fields` parameter
+    limits the fields of the returned SDKs to the given comma-separated
+    fields.
+    """
+    if request.args:
+        return _get_sdk_page()
+
+    body: SDKsBody = versioning.get_versioned(_VERSIONED_KEY, build_body)
+
+    # Content codings are part of the representation, so the gzipped body
+    # has an ETag of its own.
+    use_gzip: bool = request.accept_encodings['gzip'] > 0
+    if use_gzip:
+        etag: str = body.gzipped_etag
+    else:
+        etag: str = body.etag
+
+    if request.if_none_match.contains(etag):
+        resp: Response = Response(status=HTTPStatus.NOT_MODIFIED)
+    elif use_gzip:
+        resp: Response = Response(body.gzipped_data,
+                                  mimetype='application/json')
+        resp.content_encoding = 'gzip'
+    else:
+        resp: Response = Response(body.data, mimetype='application/json')
+
+    resp.set_etag(etag)
+    resp.vary.add('Accept-Encoding')
+
+    # Clients may keep the body, as long as they check that it's still
+    # current before using it.
+    resp.cache_control.no_cache = True
+
+    return resp
+
+
+def build_body() -> SDKsBody:
+    """
+    Puts together the body of the response with all the SDKs.
+    """
     sdks = models.SDK.query.order_by(
-        asc(collate(models.SDK.name, 'NOCASE'))
+        models.SDK_NAME_KEY,
+        models.SDK.id
     ).all()
 
     cleaned_sdks: list[dict[str, object]] = []
     for sdk in sdks:
         cleaned_sdks.append(model_encoders.encode_model_as_dict(sdk))
 
-    return {
+    # The body is serialized the same way as the bodies Flask makes from
+    # the dicts we return.
+    data: bytes = current_app.json.response({
         'data': {
             'sdks': cleaned_sdks
         }
+    }).get_data()
+
+    # The modification time is left out of the gzip header, so that the
+    # same SDKs always get the same gzipped body.
+    gzipped_data: bytes = gzip.compress(data, mtime=0)
+    digest: str = hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    return SDKsBody(data, gzipped_data, digest, f'{digest}-gzip')
+
+
+def _get_sdk_page():
+    params: ParsedParams = _INDEX_PARAMS.parse(request.args)
+    if params.errors:
+        return {'errors': params.errors}, HTTPStatus.UNPROCESSABLE_ENTITY
+
+    prefix: str | None = params.values['q']
+    count_param: int = params.values['count']
+    cursor: SDKCursor | None = params.values['cursor']
+    direction_param: str | None = params.values['direction']
+    fields_param: typing.Sequence[str] = params.values['fields']
+
+    # The values of the name key and the ID come after the fields, since
+    # the cursors are made from them.
+    sdks_query: Select = db.select(
+        *[models.SDK.__table__.c[field] for field in fields_param],
+        models.SDK_NAME_KEY.label('sort_name_key'),
+        models.SDK.id.label('sort_sdk_id')
+    )
+
+    if prefix is not None:
+        # Each of the ranges is a scan over an index. SQLite gets the SDKs
+        # from both of them, and only then sorts them, which is quick
+        # enough since only the SDKs that match get sorted.
+        upper_bound: str = f'{prefix}{_PREFIX_UPPER_BOUND_SUFFIX}'
+        sdks_query = sdks_query.where(db.or_(
+            models.SDK_NAME_KEY.between(prefix, upper_bound),
+            models.SDK_SLUG_KEY.between(prefix, upper_bound)
+        ))
+
+    is_reversed: bool = cursor is not None and direction_param == 'previous'
+    if cursor is not None:
+        # SQLite doesn't seek in indexes on expressions when comparing row
+        # values, so the name key gets a range of its own for it to seek to.
+        # The ID only breaks ties between SDKs with the same name key.
+        name_key: ColumnElement = models.SDK_NAME_KEY
+        if is_reversed:
+            sdks_query = sdks_query.where(
+                name_key <= cursor.name_key,
+                db.or_(name_key < cursor.name_key,
+                       models.SDK.id < cursor.sdk_id)
+            )
+        else:
+            sdks_query = sdks_query.where(
+                name_key >= cursor.name_key,
+                db.or_(name_key > cursor.name_key,
+                       models.SDK.id > cursor.sdk_id)
+            )
+
+    if is_reversed:
+        order_by_clauses: list[ColumnElement] = [
+            models.SDK_NAME_KEY.desc(),
+            models.SDK.id.desc()
+        ]
+    else:
+        order_by_clauses: list[ColumnElement] = [
+            models.SDK_NAME_KEY,
+            models.SDK.id
+        ]
+
+    sdks_query = sdks_query.order_by(*order_by_clauses).limit(count_param)
+    sdks: list[Row] = list(db.session.execute(sdks_query))
+    if is_reversed:
+        sdks.reverse()
+
+    num_fields: int = len(fields_param)
+    resp_sdks: list[dict[str, object]] = [
+        dict(zip(fields_param, sdk[:num_fields])) for sdk in sdks
+    ]
+
+    start_cursor: str | None = None
+    end_cursor: str | None = None
+    if sdks:
+        start_cursor = _create_cursor_from_sdk(tuple(sdks[0][num_fields:]))
+        end_cursor = _create_cursor_from_sdk(tuple(sdks[-1][num_fields:]))
+
+    return {
+        'data': {
+            'sdks': resp_sdks,
+            'start_cursor': start_cursor,
+            'end_cursor': end_cursor
+        }
     }
+
+
+def _create_cursor_from_sdk(position: tuple) -> str:
+    # Cursors are opaque to clients, like the ones of the apps of a cell.
+    cursor_json: str = json.dumps(list(position),
+                                  ensure_ascii=False,
+                                  separators=(',', ':'))
+    return (
+        base64.urlsafe_b64encode(cursor_json.encode('utf-8'))
+        .decode('ascii')
+        .rstrip('=')
+    )
+
+
+def _parse_search_prefix(values: list[str], _: dict[str, object]) -> str:
+    return values[0]
+
+
+def _parse_count(values: list[str], _: dict[str, object]) -> int:
+    count: int = int(values[0])
+    if count < 1:
+        raise ValueError(f'Count is not positive, "{values[0]}".')
+
+    return min(count, _MAX_COUNT)
+
+
+def _parse_cursor(values: list[str], _: dict[str, object]) -> SDKCursor:
+    # The padding is stripped from the cursors we create, so we need to put
+    # it back before decoding.
+    cursor_param: str = values[0]
+    padding: str = '=' * (-len(cursor_param) % 4)
+    try:
+        cursor_values: object = json.loads(
+            base64.urlsafe_b64decode(f'{cursor_param}{padding}'))
+    except (binascii.Error, ValueError):
+        cursor_values = None
+
+    is_valid_cursor: bool = (
+        isinstance(cursor_values, list)
+        and len(cursor_values) == 2
+        and type(cursor_values[0]) is str
+        and type(cursor_values[1]) is int
+    )
+    if not is_valid_cursor:
+        raise ValueError('Invalid cursor.')
+
+    return SDKCursor(*cursor_values)
+
+
+def _parse_fields(values: list[str], _: dict[str, object]) -> list[str]:
+    return parse_comma_separated_names(values, view_encoders.SDK_FIELDS)
+
+
+_INDEX_PARAMS: typing.Final[ParamSchema] = ParamSchema(
+    [
+        ParamSpec('q', _parse_search_prefix, ignores_empty=True),
+        ParamSpec('count', _parse_count, default=_DEFAULT_COUNT,
+                  ignores_empty=True),
+        ParamSpec('cursor', _parse_cursor, ignores_empty=True),
+        ParamSpec('direction', parse_direction),
+        ParamSpec('fields', _parse_fields, default=view_encoders.SDK_FIELDS)
+    ],
+    [
+        ParamPartners('cursor', 'direction', ParamPartnership.COUPLED)
+    ],
+    field_owners='SDKs'
+)
@@ -1,7 +1,28 @@
+import functools
+import typing
+
+from sqlalchemy import Row
+
 from compmatrix import model_encoders
 from compmatrix.api import models
 from compmatrix.api.views.filters import date_filter
 
+# The fields of apps that can be requested, in the order of their columns.
+APP_FIELDS: typing.Final[tuple[str, ...]] = tuple(
+    column.name for column in models.App.__table__.columns
+)
+
+# The fields of SDKs that can be requested, in the order of their columns.
+SDK_FIELDS: typing.Final[tuple[str, ...]] = tuple(
+    column.name for column in models.SDK.__table__.columns
+)
+
+_APP_FIELD_FILTERS: typing.Final[dict[str, typing.Callable]] = {
+    'release_date': date_filter
+}
+
+AppRowEncoder = typing.Callable[[Row], dict[str, object]]
+
 
 def encode_app_model_object(app_obj: models.App) -> dict[str, object]:
     ignored_fields = ['sdks']
@@ -10,3 +31,31 @@ def encode_app_model_object(app_obj: models.App) -> dict[str, object]:
     ]
     return model_encoders.encode_model_as_dict(app_obj, ignored_fields,
                                                filters)
+
+
+@functools.lru_cache(maxsize=64)
+def get_app_row_encoder(fields: tuple[str, ...]) -> AppRowEncoder:
+    """
+    Creates an encoder of rows of app columns, which are expected to start
+    with the given fields in the same order. Rows may have more columns after
+    them, which get left out. The encoders are cached, so the work of
+    figuring out which fields need filters is only done once per set of
+    fields.
+
+    :param fields: The fields of the apps to encode, from `APP_FIELDS`.
+    :return: The encoder.
+    """
+    filters: list[typing.Callable | None] = [
+        _APP_FIELD_FILTERS.get(field) for field in fields
+    ]
+    if not any(filters):
+        def encode_row(row: Row) -> dict[str, object]:
+            return dict(zip(fields, row))
+    else:
+        def encode_row(row: Row) -> dict[str, object]:
+            return {
+                field: value if row_filter is None else row_filter(value)
+                for field, value, row_filter in zip(fields, row, filters)
+            }
+
+    return encode_row
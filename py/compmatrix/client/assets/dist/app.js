@@ -1,4 +1,4 @@
-(()=>{var P="/api/v1";console.assert(!0);var f=class{static#t=0;static#e=1;static#s=2;static#a=3;static get EMPTY(){return this.#t}static get LOADING(){return this.#e}static get ERRORED(){return this.#s}static get LOADED(){return this.#a}},K=class{static get PREVIOUS(){return"previous"}static get NEXT(){return"next"}};async function W(p,t){let e=`${P}/sdks`;try{let n=(await(await fetch(e)).json()).data.sdks,i=[];for(let l=0;l<n.length;l++)i.push({id:n[l].id,name:n[l].name});p.setValue(structuredClone(i)),t.setValue(structuredClone(i))}catch(s){console.error(s.message)}}async function F(p,t,e){let s=`${P}/sdk-compmatrix/numbers`,o=t.getValue().map(c=>c.id),n=e.getValue().map(c=>c.id),i=[];o.length!==0?i.push(...o.map(c=>["from_sdks",c])):i.push(["from_sdks",""]),n.length!==0?i.push(...n.map(c=>["to_sdks",c])):i.push(["to_sdks",""]);let a=new URLSearchParams(i).toString(),r;try{p.setValue(g=>{g.state=f.LOADING}),r=await(await fetch(`${s}?${a}`)).json()}catch(c){console.error(c.message),p.setValue(g=>{g.state=f.ERRORED})}let d=r.data.numbers,m=[];for(let c=0;c<r.data.numbers.length;c++){let g=r.data.numbers[c],u=g.reduce((b,x)=>b+x,0),I=[];for(let b=0;b<g.length;b++)I.push(g[b]/u);m.push(I)}p.setValue(c=>{c.data.raw=d,c.data.normalized=m,c.state=f.LOADED})}async function B(p,t,e,s,o=null,n=null){let i=`${P}/sdk-compmatrix/apps`,l=t.getValue(),a=l["selected-cell"]["from-sdk"],r=l["selected-cell"]["to-sdk"],d=e.getValue(),m=s.getValue(),c=d.filter(h=>a!==null?h.id!=a.id:!0),g=m.filter(h=>r!==null?h.id!=r.id:!0),u=[];a!==null&&a.id!==null?u.push(["from_sdk",a.id]):c.length!==0&&u.push(...c.map(h=>["other_from_sdks",h.id])),r!==null&&r.id!==null?u.push(["to_sdk",r.id]):g.length!==0&&u.push(...g.map(h=>["other_to_sdks",h.id])),u.push(["count",50]),o!==null&&(u.push(["cursor",o]),u.push(["direction",n]));let b=new URLSearchParams(u).toString(),x;try{p.setValue(T=>{T.state=f.LOADING,o!==null&&(T["is-loading-new-batch"]=!0)}),x=await(await fetch(`${i}?${b}`)).json()}catch(h){console.error(h.message)}p.setValue(h=>{h.state=f.LOADED,h["is-loading-new-batch"]=!1;let T=x.data.apps.length,H=x.data.total_count;h["total-app-count"]=H,o===null&&(h["displayed-apps"]=[]);for(let v=0;v<T;v++){let D=x.data.apps[v],y=null;D.company_url!=""&&(y=D.company_url);let C=D.five_star_ratings;C+=D.four_star_ratings,C+=D.three_star_ratings,C+=D.two_star_ratings,C+=D.one_star_ratings;let _=0;_+=D.five_star_ratings*5,_+=D.four_star_ratings*4,_+=D.three_star_ratings*3,_+=D.two_star_ratings*2,_+=D.one_star_ratings*1,_/=C;let j={name:D.name,seller_name:D.seller_name,company_url:y,artwork_large_url:D.artwork_large_url,rating:_};o!==null&&n===K.PREVIOUS?h["displayed-apps"].splice(v,0,j):h["displayed-apps"].push(j)}o===null?(h["start-cursor"]=x.data.start_cursor,h["end-cursor"]=x.data.end_cursor):n===K.PREVIOUS?h["start-cursor"]=x.data.start_cursor:h["end-cursor"]=x.data.end_cursor;let U=!1,z=!1,G=h["displayed-apps"].length;if(G>150){let v=G-150;if(n===K.PREVIOUS){h["displayed-apps"].splice(-v);let D=h["displayed-apps"].length,y=h["displayed-apps"][D-1];h["end-cursor"]=Z(y),z=!0,h.pruned=!0}else{h["displayed-apps"].splice(0,v);let D=h["displayed-apps"][0];h["start-cursor"]=Z(D),U=!0,h.pruned=!0}}h["recent-batch-size"]=T,T==H?(h["need-prev-batch-trigger"]=!1,h["need-next-batch-trigger"]=!1):T==0?n===K.PREVIOUS?h["need-prev-batch-trigger"]=!1:h["need-next-batch-trigger"]=!1:n===K.PREVIOUS?h["need-prev-batch-trigger"]=!0:h["need-next-batch-trigger"]=!0,U?h["need-prev-batch-trigger"]=!0:z&&(h["need-next-batch-trigger"]=!0)})}function N(p,t,e,s){let n=t.getValue()["selected-cell"];if(n){let i=n["from-sdk"],l=n["to-sdk"];(i.id===null||l.id===null)&&B(p,t,e,s)}}function Z(p){return`${p.name};${p.seller_name}`}function R(p,t,e,s){let o=t.getValue(),n=s.getValue();if(o.length>0){let i=p.selectedIndex,l=e.selectedIndex;s.setValue(r=>{r.push(t.getValue()[i])}),t.setValue(r=>{r.splice(i,1)});let a=Math.min(i,p.options.length-1);p.selectedIndex=a,n.length>0&&l!==null&&(e.selectedIndex=l)}}function $(p,t,e,s){let o=t.getValue(),n=s.getValue(),i=p.selectedIndex,l=e.selectedIndex;if(n.length>0&&l!==null){let a=0;if(o.length>0){let d=t.getValue()[i].name,m=s.getValue()[l].name;d.toLowerCase()>=m.toLowerCase()&&d>m&&(a=1)}t.setValue(d=>{d.push(s.getValue()[l]),d.sort((m,c)=>m.name.toLowerCase()<c.name.toLowerCase()?-1:m.name.toLowerCase()>c.name.toLowerCase()?1:0)}),s.setValue(d=>{d.splice(l,1)}),o.length>0?p.selectedIndex=i+a:p.selectedIndex=0;let r=Math.min(l,e.options.length-1);e.selectedIndex=r}}var w=class{constructor(t){this.value=structuredClone(t),this.initialValue=structuredClone(t),this.subscriptions=[],this.isPropagationLocked=!1}getValue(){return this.value}setValue(t){typeof t=="function"?t(this.value):this.value=t,this.isPropagationLocked||this.#t()}resetToInitialState(){this.setValue(structuredClone(this.initialValue))}addReactor(t,e=!0,s=!1){s?this.subscriptions.unshift(t):this.subscriptions.push(t),e&&t(this.value)}lockPropagation(){this.isPropagationLocked=!0}unlockPropagation(t=!0){this.isPropagationLocked=!1,t&&this.#t()}#t(){for(let t of this.subscriptions)t()}};var Y=(p,t,e,s,o)=>{let n=e.length,i=t.length,l=n,a=0,r=0,d=null;for(;a<i||r<l;)if(i===a){let m=l<n?r?s(e[r-1],-0).nextSibling:s(e[l-r],0):o;for(;r<l;)p.insertBefore(s(e[r++],1),m)}else if(l===r)for(;a<i;)(!d||!d.has(t[a]))&&p.removeChild(s(t[a],-1)),a++;else if(t[a]===e[r])a++,r++;else if(t[i-1]===e[l-1])i--,l--;else if(t[a]===e[l-1]&&e[r]===t[i-1]){let m=s(t[--i],-1).nextSibling;p.insertBefore(s(e[r++],1),s(t[a++],-1).nextSibling),p.insertBefore(s(e[--l],1),m),t[i]=e[l]}else{if(!d){d=new Map;let m=r;for(;m<l;)d.set(e[m],m++)}if(d.has(t[a])){let m=d.get(t[a]);if(r<m&&m<l){let c=a,g=1;for(;++c<i&&c<l&&d.get(t[c])===m+g;)g++;if(g>m-r){let u=s(t[a],0);for(;r<m;)p.insertBefore(s(e[r++],1),u)}else p.replaceChild(s(e[r++],1),s(t[a++],-1))}else a++}else p.removeChild(s(t[a++],-1))}return e};var S=class{constructor(t){this.rootNode=document.getElementById(t),this.nodes=[],this.states={}}subscribeTo(t,e){this.states[t]=e,e.addReactor(()=>{this.update()})}batchSubscribe(t){for(let e=0;e<t.length;e++){let s=t[e];this.states[s.refName]=s.state,s.state.addReactor(()=>{this.update()},!1,!1)}this.update()}update(){this.nodes=this.#t(this.createHTML()),this.render()}createHTML(){return""}render(){Y(this.rootNode,[...this.rootNode.childNodes],[...this.nodes],t=>t)}#t(t){let e=document.createElement("template");return e.innerHTML=t,e.content.childNodes}};var V=class extends S{constructor(t){super(t)}createHTML(){let t=this.states["compmatrix-data"].getValue(),e="<p>";if(t["selected-cell"]===null)e+="Select a cell in the competitive matrix to get started.";else{let s=t["selected-cell"]["from-sdk"],o=t["selected-cell"]["to-sdk"],n="";s===null?n="(none)":n=s.name;let i="";o===null?i="(none)":i=o.name,e+=`Migrated from ${n} to ${i}.`}return e+="</p>",e}};var O=class extends S{constructor(t){super(t),this.prevBatchTriggerObserver=null,this.nextBatchTriggerObserver=null,this.isBatchLoading=!1}update(){let t=this.states["compmatrix-data"].getValue(),e=this.states["app-list"],s=e.getValue();if(e.lockPropagation(),t["selected-cell"]===null&&s["displayed-apps"].length>0&&e.resetToInitialState(),s.state===f.LOADING&&!s["is-loading-new-batch"]&&this.rootNode.scrollTo({top:0,left:0,behavior:"instant"}),super.update(),s=e.getValue(),s.state===f.LOADED){let o={root:this.rootNode};if(s["need-prev-batch-trigger"]){let n=(a,r)=>{for(let d=0;d<a.length;d++){let m=a[d];m&&m.isIntersecting&&!this.isBatchLoading&&this.#t(s["start-cursor"],K.PREVIOUS)}};this.prevBatchTriggerObserver=new IntersectionObserver(n,o);let l=document.getElementById("app-prev-batch-trigger");this.prevBatchTriggerObserver.observe(l)}if(s["need-next-batch-trigger"]){let n=(a,r)=>{for(let d=0;d<a.length;d++){let m=a[d];m&&m.isIntersecting&&!this.isBatchLoading&&this.#t(s["end-cursor"],K.NEXT)}};this.nextBatchTriggerObserver=new IntersectionObserver(n,o);let l=document.getElementById("app-next-batch-trigger");this.nextBatchTriggerObserver.observe(l)}}e.unlockPropagation(!1)}createHTML(){let t=this.states["app-list"].getValue(),e="";if(t.state===f.LOADED||t.state===f.LOADING&&t["is-loading-new-batch"]){e+='<ol id="apps-list-items">',t["need-prev-batch-trigger"]&&(e+=`
+(()=>{var P="/api/v1";console.assert(!0);var f=class{static#t=0;static#e=1;static#s=2;static#a=3;static get EMPTY(){return this.#t}static get LOADING(){return this.#e}static get ERRORED(){return this.#s}static get LOADED(){return this.#a}},K=class{static get PREVIOUS(){return"previous"}static get NEXT(){return"next"}};async function W(p,t){let e=`${P}/sdks`;try{let n=(await(await fetch(e)).json()).data.sdks,i=[];for(let l=0;l<n.length;l++)i.push({id:n[l].id,name:n[l].name});p.setValue(structuredClone(i)),t.setValue(structuredClone(i))}catch(s){console.error(s.message)}}async function F(p,t,e){let s=`${P}/sdk-compmatrix/numbers`,o=t.getValue().map(c=>c.id),n=e.getValue().map(c=>c.id),i=[];o.length!==0?i.push(...o.map(c=>["from_sdks",c])):i.push(["from_sdks",""]),n.length!==0?i.push(...n.map(c=>["to_sdks",c])):i.push(["to_sdks",""]),i.push(["normalize","row"]);let a=new URLSearchParams(i).toString(),r;try{p.setValue(g=>{g.state=f.LOADING}),r=await(await fetch(`${s}?${a}`)).json()}catch(c){console.error(c.message),p.setValue(g=>{g.state=f.ERRORED})}let d=r.data.numbers,m=r.data.normalized_numbers;p.setValue(c=>{c.data.raw=d,c.data.normalized=m,c.state=f.LOADED})}async function B(p,t,e,s,o=null,n=null){let i=`${P}/sdk-compmatrix/apps`,l=t.getValue(),a=l["selected-cell"]["from-sdk"],r=l["selected-cell"]["to-sdk"],d=e.getValue(),m=s.getValue(),c=d.filter(h=>a!==null?h.id!=a.id:!0),g=m.filter(h=>r!==null?h.id!=r.id:!0),u=[];a!==null&&a.id!==null?u.push(["from_sdk",a.id]):c.length!==0&&u.push(...c.map(h=>["other_from_sdks",h.id])),r!==null&&r.id!==null?u.push(["to_sdk",r.id]):g.length!==0&&u.push(...g.map(h=>["other_to_sdks",h.id])),u.push(["count",50]),u.push(["fields","id,name,seller_name,company_url,artwork_large_url,five_star_ratings,four_star_ratings,three_star_ratings,two_star_ratings,one_star_ratings"]),o!==null&&(u.push(["cursor",o]),u.push(["direction",n]));let b=new URLSearchParams(u).toString(),x;try{p.setValue(T=>{T.state=f.LOADING,o!==null&&(T["is-loading-new-batch"]=!0)}),x=await(await fetch(`${i}?${b}`)).json()}catch(h){console.error(h.message)}p.setValue(h=>{h.state=f.LOADED,h["is-loading-new-batch"]=!1;let T=x.data.apps.length,H=x.data.total_count;h["total-app-count"]=H,o===null&&(h["displayed-apps"]=[]);for(let v=0;v<T;v++){let D=x.data.apps[v],y=null;D.company_url!=""&&(y=D.company_url);let C=D.five_star_ratings;C+=D.four_star_ratings,C+=D.three_star_ratings,C+=D.two_star_ratings,C+=D.one_star_ratings;let _=0;_+=D.five_star_ratings*5,_+=D.four_star_ratings*4,_+=D.three_star_ratings*3,_+=D.two_star_ratings*2,_+=D.one_star_ratings*1,_/=C;let j={id:D.id,name:D.name,seller_name:D.seller_name,company_url:y,artwork_large_url:D.artwork_large_url,rating:_};o!==null&&n===K.PREVIOUS?h["displayed-apps"].splice(v,0,j):h["displayed-apps"].push(j)}o===null?(h["start-cursor"]=x.data.start_cursor,h["end-cursor"]=x.data.end_cursor):n===K.PREVIOUS?h["start-cursor"]=x.data.start_cursor:h["end-cursor"]=x.data.end_cursor;let U=!1,z=!1,G=h["displayed-apps"].length;if(G>150){let v=G-150;if(n===K.PREVIOUS){h["displayed-apps"].splice(-v);let D=h["displayed-apps"].length,y=h["displayed-apps"][D-1];h["end-cursor"]=Z(y),z=!0,h.pruned=!0}else{h["displayed-apps"].splice(0,v);let D=h["displayed-apps"][0];h["start-cursor"]=Z(D),U=!0,h.pruned=!0}}h["recent-batch-size"]=T,T==H?(h["need-prev-batch-trigger"]=!1,h["need-next-batch-trigger"]=!1):T==0?n===K.PREVIOUS?h["need-prev-batch-trigger"]=!1:h["need-next-batch-trigger"]=!1:n===K.PREVIOUS?h["need-prev-batch-trigger"]=!0:h["need-next-batch-trigger"]=!0,U?h["need-prev-batch-trigger"]=!0:z&&(h["need-next-batch-trigger"]=!0)})}function N(p,t,e,s){let n=t.getValue()["selected-cell"];if(n){let i=n["from-sdk"],l=n["to-sdk"];(i.id===null||l.id===null)&&B(p,t,e,s)}}function Z(p){let t=JSON.stringify([p.name,p.seller_name,p.id]),e=new TextEncoder().encode(t),s=Array.from(e,o=>String.fromCharCode(o)).join("");return btoa(s).replace(/\+/g,"-").replace(/\//g,"_").replace(/=+$/,"")}function R(p,t,e,s){let o=t.getValue(),n=s.getValue();if(o.length>0){let i=p.selectedIndex,l=e.selectedIndex;s.setValue(r=>{r.push(t.getValue()[i])}),t.setValue(r=>{r.splice(i,1)});let a=Math.min(i,p.options.length-1);p.selectedIndex=a,n.length>0&&l!==null&&(e.selectedIndex=l)}}function $(p,t,e,s){let o=t.getValue(),n=s.getValue(),i=p.selectedIndex,l=e.selectedIndex;if(n.length>0&&l!==null){let a=0;if(o.length>0){let d=t.getValue()[i].name,m=s.getValue()[l].name;d.toLowerCase()>=m.toLowerCase()&&d>m&&(a=1)}t.setValue(d=>{d.push(s.getValue()[l]),d.sort((m,c)=>m.name.toLowerCase()<c.name.toLowerCase()?-1:m.name.toLowerCase()>c.name.toLowerCase()?1:0)}),s.setValue(d=>{d.splice(l,1)}),o.length>0?p.selectedIndex=i+a:p.selectedIndex=0;let r=Math.min(l,e.options.length-1);e.selectedIndex=r}}var w=class{constructor(t){this.value=structuredClone(t),this.initialValue=structuredClone(t),this.subscriptions=[],this.isPropagationLocked=!1}getValue(){return this.value}setValue(t){typeof t=="function"?t(this.value):this.value=t,this.isPropagationLocked||this.#t()}resetToInitialState(){this.setValue(structuredClone(this.initialValue))}addReactor(t,e=!0,s=!1){s?this.subscriptions.unshift(t):this.subscriptions.push(t),e&&t(this.value)}lockPropagation(){this.isPropagationLocked=!0}unlockPropagation(t=!0){this.isPropagationLocked=!1,t&&this.#t()}#t(){for(let t of this.subscriptions)t()}};var Y=(p,t,e,s,o)=>{let n=e.length,i=t.length,l=n,a=0,r=0,d=null;for(;a<i||r<l;)if(i===a){let m=l<n?r?s(e[r-1],-0).nextSibling:s(e[l-r],0):o;for(;r<l;)p.insertBefore(s(e[r++],1),m)}else if(l===r)for(;a<i;)(!d||!d.has(t[a]))&&p.removeChild(s(t[a],-1)),a++;else if(t[a]===e[r])a++,r++;else if(t[i-1]===e[l-1])i--,l--;else if(t[a]===e[l-1]&&e[r]===t[i-1]){let m=s(t[--i],-1).nextSibling;p.insertBefore(s(e[r++],1),s(t[a++],-1).nextSibling),p.insertBefore(s(e[--l],1),m),t[i]=e[l]}else{if(!d){d=new Map;let m=r;for(;m<l;)d.set(e[m],m++)}if(d.has(t[a])){let m=d.get(t[a]);if(r<m&&m<l){let c=a,g=1;for(;++c<i&&c<l&&d.get(t[c])===m+g;)g++;if(g>m-r){let u=s(t[a],0);for(;r<m;)p.insertBefore(s(e[r++],1),u)}else p.replaceChild(s(e[r++],1),s(t[a++],-1))}else a++}else p.removeChild(s(t[a++],-1))}return e};var S=class{constructor(t){this.rootNode=document.getElementById(t),this.nodes=[],this.states={}}subscribeTo(t,e){this.states[t]=e,e.addReactor(()=>{this.update()})}batchSubscribe(t){for(let e=0;e<t.length;e++){let s=t[e];this.states[s.refName]=s.state,s.state.addReactor(()=>{this.update()},!1,!1)}this.update()}update(){this.nodes=this.#t(this.createHTML()),this.render()}createHTML(){return""}render(){Y(this.rootNode,[...this.rootNode.childNodes],[...this.nodes],t=>t)}#t(t){let e=document.createElement("template");return e.innerHTML=t,e.content.childNodes}};var V=class extends S{constructor(t){super(t)}createHTML(){let t=this.states["compmatrix-data"].getValue(),e="<p>";if(t["selected-cell"]===null)e+="Select a cell in the competitive matrix to get started.";else{let s=t["selected-cell"]["from-sdk"],o=t["selected-cell"]["to-sdk"],n="";s===null?n="(none)":n=s.name;let i="";o===null?i="(none)":i=o.name,e+=`Migrated from ${n} to ${i}.`}return e+="</p>",e}};var O=class extends S{constructor(t){super(t),this.prevBatchTriggerObserver=null,this.nextBatchTriggerObserver=null,this.isBatchLoading=!1}update(){let t=this.states["compmatrix-data"].getValue(),e=this.states["app-list"],s=e.getValue();if(e.lockPropagation(),t["selected-cell"]===null&&s["displayed-apps"].length>0&&e.resetToInitialState(),s.state===f.LOADING&&!s["is-loading-new-batch"]&&this.rootNode.scrollTo({top:0,left:0,behavior:"instant"}),super.update(),s=e.getValue(),s.state===f.LOADED){let o={root:this.rootNode};if(s["need-prev-batch-trigger"]){let n=(a,r)=>{for(let d=0;d<a.length;d++){let m=a[d];m&&m.isIntersecting&&!this.isBatchLoading&&this.#t(s["start-cursor"],K.PREVIOUS)}};this.prevBatchTriggerObserver=new IntersectionObserver(n,o);let l=document.getElementById("app-prev-batch-trigger");this.prevBatchTriggerObserver.observe(l)}if(s["need-next-batch-trigger"]){let n=(a,r)=>{for(let d=0;d<a.length;d++){let m=a[d];m&&m.isIntersecting&&!this.isBatchLoading&&this.#t(s["end-cursor"],K.NEXT)}};this.nextBatchTriggerObserver=new IntersectionObserver(n,o);let l=document.getElementById("app-next-batch-trigger");this.nextBatchTriggerObserver.observe(l)}}e.unlockPropagation(!1)}createHTML(){let t=this.states["app-list"].getValue(),e="";if(t.state===f.LOADED||t.state===f.LOADING&&t["is-loading-new-batch"]){e+='<ol id="apps-list-items">',t["need-prev-batch-trigger"]&&(e+=`
                     <li id="app-prev-batch-trigger" class="batch-trigger">
                         <span class="fas fa-circle-notch fa-spin"></span>
                     </li>
@@ -2,5 +2,19 @@ export const APP_LIST_BATCH_SIZE = 50;
 export const MAX_APP_LIST_SIZE = 150;
 export const BASE_API_ENDPOINT = '/api/v1';
 
+// The only fields of apps that the app list needs.
+export const APP_LIST_FIELDS = [
+    'id',
+    'name',
+    'seller_name',
+    'company_url',
+    'artwork_large_url',
+    'five_star_ratings',
+    'four_star_ratings',
+    'three_star_ratings',
+    'two_star_ratings',
+    'one_star_ratings'
+];
+
 // We should make sure that batch size is larger than the maximum size.
 console.assert(APP_LIST_BATCH_SIZE <= MAX_APP_LIST_SIZE);
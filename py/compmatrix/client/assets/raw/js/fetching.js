@@ -1,5 +1,6 @@
 import {
     APP_LIST_BATCH_SIZE,
+    APP_LIST_FIELDS,
     BASE_API_ENDPOINT,
     MAX_APP_LIST_SIZE
 } from "./constants";
@@ -64,6 +65,9 @@ export async function fetchCompMatrixValues(
         rawParamPairs.push(['to_sdks', '']);
     }
 
+    // The server normalizes the numbers for us.
+    rawParamPairs.push(['normalize', 'row']);
+
     const params = new URLSearchParams(rawParamPairs);
     const paramString = params.toString();
     let numbersJSON;
@@ -81,19 +85,8 @@ export async function fetchCompMatrixValues(
     }
 
     const rawValues = numbersJSON.data.numbers;
-    let normalizedValues = [];
-    for (let i = 0; i < numbersJSON.data.numbers.length; i++) {
-        let row = numbersJSON.data.numbers[i];
-        const sum = row.reduce((partialSum, n) => partialSum + n, 0);
-
-        let normalized = []
-        for (let j = 0; j < row.length; j++) {
-            normalized.push(row[j] / sum);
-        }
+    const normalizedValues = numbersJSON.data.normalized_numbers;
 
-        normalizedValues.push(normalized);
-    }
-    
     compmatrixData.setValue((v) => {
         v['data']['raw'] = rawValues;
         v['data']['normalized'] = normalizedValues;
@@ -154,6 +147,7 @@ export async function fetchAppListData(
     }
 
     rawParamPairs.push(['count', APP_LIST_BATCH_SIZE]);
+    rawParamPairs.push(['fields', APP_LIST_FIELDS.join(',')]);
 
     if (cursor !== null) {
         rawParamPairs.push(['cursor', cursor]);
@@ -218,6 +212,7 @@ export async function fetchAppListData(
             rating /= totalRatings;
 
             const newApp = {
+                'id': app['id'],
                 'name': app['name'],
                 'seller_name': app['seller_name'],
                 'company_url': companyURL,
@@ -345,5 +340,20 @@ export function refetchAppListIfNeeded(
 }
 
 function createCursorFromDisplayedApp(app) {
-    return `${app['name']};${app['seller_name']}`;
+    // Must match how the API creates its cursors, which is the URL-safe
+    // base64 of the JSON of the name, seller name, and ID of the app, without
+    // the padding. The cursors of the API also carry the total app count of
+    // the cell, but the API recounts (or uses its cache) when it's missing.
+    const cursorJSON = JSON.stringify(
+        [app['name'], app['seller_name'], app['id']]
+    );
+    const cursorBytes = new TextEncoder().encode(cursorJSON);
+    const binaryString = Array.from(
+        cursorBytes,
+        (byte) => String.fromCharCode(byte)
+    ).join('');
+    return btoa(binaryString)
+        .replace(/\+/g, '-')
+        .replace(/\//g, '_')
+        .replace(/=+$/, '');
 }
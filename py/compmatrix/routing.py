@@ -4,10 +4,15 @@ from flask import Blueprint
 
 
 class Route:
-    def __init__(self, name: str, path: str, view_func: typing.Callable):
+    def __init__(self,
+                 name: str,
+                 path: str,
+                 view_func: typing.Callable,
+                 methods: list[str] | None = None):
         self._name = name
         self._path = path
         self._view_func = view_func
+        self._methods = methods
 
     @property
     def name(self):
@@ -21,9 +26,18 @@ class Route:
     def view_func(self) -> typing.Callable:
         return self._view_func
 
+    @property
+    def methods(self) -> list[str] | None:
+        """
+        The HTTP methods the route accepts. Only GET (along with HEAD and
+        OPTIONS) is accepted when None.
+        """
+        return self._methods
+
 
 def add_routes_to_blueprint(blueprint: Blueprint, routes: list[Route]):
     for route in routes:
         blueprint.add_url_rule(route.path,
                                endpoint=route.name,
-                               view_func=route.view_func)
+                               view_func=route.view_func,
+                               methods=route.methods)
@@ -1,8 +1,10 @@
+import itertools
+import typing
 from datetime import datetime
 
 import pytest
 
-from compmatrix import db
+from compmatrix import create_app, db
 from compmatrix.api import models
 
 
@@ -336,6 +338,43 @@ def test_db_data(app):
         _delete_model_objects_from_db(apps)
 
 
+@pytest.fixture
+def create_tmp_app(tmp_path):
+    """
+    Creates apps with databases of their own, for tests that need to commit
+    changes, or that need data other than the test database data.
+
+    The returned function takes the rows to commit to the database. Derived
+    tables that get filled in by triggers should be created by
+    `create_tables`, which are called before the rows are added. Derived
+    tables that are built from the rows should be built by `build_tables`,
+    which are called after the rows are added.
+    """
+    db_indices: typing.Iterator[int] = itertools.count()
+
+    def create(rows: typing.Iterable[object] = (),
+               extra_config: dict[str, object] | None = None,
+               create_tables: typing.Iterable[typing.Callable] = (),
+               build_tables: typing.Iterable[typing.Callable] = ()):
+        tmp_app = create_app(tmp_path / f'tmp_{next(db_indices)}.db',
+                             extra_config=extra_config)
+        with tmp_app.app_context():
+            db.create_all()
+            for create_table in create_tables:
+                create_table()
+
+            db.session.add_all(rows)
+            db.session.flush()
+            for build_table in build_tables:
+                build_table()
+
+            db.session.commit()
+
+        return tmp_app
+
+    return create
+
+
 @pytest.fixture(scope='session')
 def apps(test_db_data) -> list[models.App]:
     yield test_db_data['apps']
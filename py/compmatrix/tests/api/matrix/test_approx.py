@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+from compmatrix.api import matrix, models
+from compmatrix.api.matrix import approx, signatures
+from compmatrix.api.views import queries
+
+SDK_IDS = [1, 2, 3]
+NUM_APPS = 400
+
+
+def _create_rows():
+    rng = random.Random(42)
+    rows = [models.SDK(id=i, name=f'SDK {i}') for i in SDK_IDS]
+    for app_id in range(1, NUM_APPS + 1):
+        rows.append(models.App(id=app_id, name=f'App {app_id}'))
+        for sdk_id in SDK_IDS:
+            installed = rng.choice([None, None, False, True])
+            if installed is not None:
+                rows.append(models.AppSDK(app_id=app_id,
+                                          sdk_id=sdk_id,
+                                          installed=installed))
+
+    return rows
+
+
+@pytest.fixture
+def full_sample_app(create_tmp_app):
+    tmp_app = create_tmp_app(
+        _create_rows(), extra_config={'COMPMATRIX_APPROX_SAMPLE_RATE': 1.0})
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+@pytest.fixture
+def half_sample_app(create_tmp_app):
+    tmp_app = create_tmp_app(
+        _create_rows(), extra_config={'COMPMATRIX_APPROX_SAMPLE_RATE': 0.5})
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+def test_full_sample_is_exact(full_sample_app):
+    from_sdks = [3, 1, 3]
+    to_sdks = [2, 1]
+    exact = matrix.compute_matrix_numbers(from_sdks, to_sdks)
+
+    matrix_numbers, approx_numbers = matrix.estimate_matrix_numbers(from_sdks,
+                                                                    to_sdks)
+
+    assert matrix_numbers == exact
+    assert approx_numbers.estimates == exact.numbers
+    assert approx_numbers.lower_bounds == exact.numbers
+    assert approx_numbers.upper_bounds == exact.numbers
+
+
+def test_half_sample_bounds_contain_exact_numbers(half_sample_app):
+    exact = matrix.compute_numbers(SDK_IDS, SDK_IDS)
+
+    _, approx_numbers = matrix.estimate_matrix_numbers(SDK_IDS, SDK_IDS)
+
+    for row_index, exact_row in enumerate(exact):
+        for col_index, number in enumerate(exact_row):
+            lower_bound = approx_numbers.lower_bounds[row_index][col_index]
+            estimate = approx_numbers.estimates[row_index][col_index]
+            upper_bound = approx_numbers.upper_bounds[row_index][col_index]
+
+            assert lower_bound <= number <= upper_bound
+            assert lower_bound <= estimate <= upper_bound
+            assert 0 <= lower_bound
+            assert upper_bound <= NUM_APPS
+
+
+def test_sample_is_a_share_of_the_apps(half_sample_app):
+    sample = approx.load_sample()
+
+    assert sample.num_apps == NUM_APPS
+    # The hash spreads the apps evenly enough for the sample to be close to
+    # the requested share of the apps.
+    assert abs(sample.num_sampled_apps - NUM_APPS / 2) < NUM_APPS / 10
+
+    # The same apps get sampled every time.
+    assert approx.load_sample().num_sampled_apps == sample.num_sampled_apps
+
+    max_app_hash = round(0.5 * queries.APP_HASH_MODULUS)
+    sampled_histogram = signatures.build_histogram(max_app_hash)
+    full_histogram = signatures.build_histogram()
+    for signature, num_apps in sampled_histogram.signature_counts.items():
+        assert num_apps <= full_histogram.signature_counts[signature]
+
+
+def test_empty_sample_has_widest_bounds():
+    histogram = signatures.SignatureHistogram({}, 0)
+    sample = approx.AppSample(histogram, 10)
+
+    approx_numbers = sample.estimate_numbers([1], [1])
+
+    assert approx_numbers.estimates == [[0, 0], [0, 0]]
+    assert approx_numbers.lower_bounds == [[0, 0], [0, 0]]
+    assert approx_numbers.upper_bounds == [[10, 10], [10, 10]]
@@ -0,0 +1,46 @@
+from compmatrix.api.matrix import cache_index
+
+
+def _create_index(*keys):
+    index = cache_index.CachedMatrixIndex()
+    for key in keys:
+        index.add(key)
+
+    return index
+
+
+def test_find_sdk_cells():
+    key_1 = (0, 'single_pass', (1, 2), (1, 3))
+    key_2 = (0, 'single_pass', (2, 4), (3,))
+    index = _create_index(key_1, key_2)
+
+    assert index.find(2, 3, (), ()) == [key_1, key_2]
+    assert index.find(1, 1, (), ()) == [key_1]
+    assert index.find(4, 1, (), ()) == []
+    assert index.find(5, 3, (), ()) == []
+
+
+def test_find_none_cells():
+    key_1 = (0, 'single_pass', (1, 2), (1, 3))
+    key_2 = (0, 'single_pass', (1,), (1, 3))
+    index = _create_index(key_1, key_2)
+
+    # The "(none)" row and column need the exact same SDKs.
+    assert index.find(None, 3, (1, 2), ()) == [key_1]
+    assert index.find(None, 3, (2,), ()) == []
+    assert index.find(1, None, (), (1, 3)) == [key_1, key_2]
+    assert index.find(None, None, (1,), (1, 3)) == [key_2]
+    assert index.find(None, None, (1,), (1,)) == []
+
+
+def test_retain():
+    key_1 = (0, 'single_pass', (1, 2), (1, 3))
+    key_2 = (0, 'single_pass', (1,), (1, 3))
+    index = _create_index(key_1, key_2, key_1)
+    assert len(index) == 2
+
+    index.retain([key_2])
+
+    assert len(index) == 1
+    assert index.find(1, 3, (), ()) == [key_2]
+    assert index.find(None, 3, (1, 2), ()) == []
@@ -0,0 +1,127 @@
+import itertools
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import matrix, models, versioning
+from compmatrix.api.matrix import deltas, per_cell, signatures, transitions
+
+SDK_IDS = [1, 2, 3]
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    tmp_app = create_tmp_app(
+        [
+            *[models.SDK(id=i, name=f'SDK {i}') for i in SDK_IDS],
+            *[models.App(id=i, name=f'App {i}') for i in range(1, 6)],
+            models.AppSDK(app_id=1, sdk_id=1, installed=False),
+            models.AppSDK(app_id=1, sdk_id=2, installed=True),
+            models.AppSDK(app_id=2, sdk_id=2, installed=True),
+            models.AppSDK(app_id=2, sdk_id=3, installed=False),
+            models.AppSDK(app_id=3, sdk_id=1, installed=True),
+            models.AppSDK(app_id=4, sdk_id=3, installed=False)
+        ],
+        extra_config={'COMPMATRIX_NUMBERS_ENGINE': 'signatures'},
+        create_tables=[transitions.create_table],
+        build_tables=[transitions.rebuild_table]
+    )
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+def _get_selections():
+    return [
+        list(p)
+        for num_sdks in range(len(SDK_IDS) + 1)
+        for p in itertools.permutations(SDK_IDS, num_sdks)
+    ]
+
+
+def _get_histogram():
+    return versioning.get_versioned(signatures.VERSIONED_KEY,
+                                    signatures.load_histogram)
+
+
+def _get_transitions_table():
+    return {
+        (t.from_sdk_id, t.to_sdk_id): t.app_count
+        for t in db.session.execute(
+            db.select(models.SDKTransition)
+        ).scalars()
+        if t.app_count != 0
+    }
+
+
+def test_apply_changes_updates_structures(tmp_app):
+    selections = _get_selections()
+    for from_sdks in selections:
+        for to_sdks in selections:
+            matrix.compute_numbers(from_sdks, to_sdks)
+
+    histogram = _get_histogram()
+    stats = matrix.get_numbers_cache_stats()
+
+    assert deltas.apply_changes([
+        # Moves app 1 from SDK 2 back to SDK 1.
+        deltas.AppSDKChange(app_id=1, sdk_id=1, installed=True),
+        deltas.AppSDKChange(app_id=1, sdk_id=2, installed=False),
+        # App 3 no longer has any SDKs.
+        deltas.AppSDKChange(app_id=3, sdk_id=1, installed=None),
+        # App 5 gets its first SDK.
+        deltas.AppSDKChange(app_id=5, sdk_id=3, installed=False),
+        deltas.AppSDKChange(app_id=5, sdk_id=3, installed=True)
+    ])
+
+    # The histogram got updated instead of rebuilt.
+    assert _get_histogram() is histogram
+    rebuilt_histogram = signatures.build_histogram()
+    assert histogram.signature_counts == rebuilt_histogram.signature_counts
+    assert (histogram.num_apps_without_sdks
+            == rebuilt_histogram.num_apps_without_sdks)
+
+    # So did the cached matrices.
+    for from_sdks in selections:
+        for to_sdks in selections:
+            assert (matrix.compute_numbers(from_sdks, to_sdks)
+                    == per_cell.compute_numbers(from_sdks, to_sdks))
+
+    new_stats = matrix.get_numbers_cache_stats()
+    assert new_stats.hits == stats.hits + len(selections) ** 2
+    assert new_stats.misses == stats.misses
+
+    table = _get_transitions_table()
+    transitions.rebuild_table()
+    assert _get_transitions_table() == table
+    db.session.rollback()
+
+
+def test_apply_changes_rebuilds_after_other_commits(tmp_app, monkeypatch):
+    matrix.compute_numbers(SDK_IDS, SDK_IDS)
+    histogram = _get_histogram()
+
+    # Simulates another connection committing changes while ours get
+    # applied.
+    commit = db.session.commit
+
+    def commit_twice():
+        commit()
+        db.session.execute(
+            db.update(models.AppSDK)
+            .where(models.AppSDK.app_id == 4)
+            .values(installed=True))
+        commit()
+
+    monkeypatch.setattr(db.session, 'commit', commit_twice)
+
+    assert not deltas.apply_changes([
+        deltas.AppSDKChange(app_id=2, sdk_id=1, installed=False)
+    ])
+
+    monkeypatch.undo()
+
+    assert _get_histogram() is not histogram
+    stats = matrix.get_numbers_cache_stats()
+    assert (matrix.compute_numbers(SDK_IDS, SDK_IDS)
+            == per_cell.compute_numbers(SDK_IDS, SDK_IDS))
+    assert matrix.get_numbers_cache_stats().misses == stats.misses + 1
@@ -0,0 +1,49 @@
+from compmatrix.api import matrix
+from compmatrix.api.matrix import derived
+
+
+def test_empty_rows_and_columns_are_normalized_to_zeroes():
+    numbers = [
+        [0, 2],
+        [0, 0]
+    ]
+    matrix_numbers = derived.derive_numbers(numbers, [1], [1])
+
+    assert matrix_numbers.row_normalized == [[0.0, 1.0], [0.0, 0.0]]
+    assert matrix_numbers.column_normalized == [[0.0, 1.0], [0.0, 0.0]]
+    assert matrix_numbers.sdk_metrics == {
+        1: derived.SDKMetrics(0.0, 1.0, -2)
+    }
+
+
+def test_sdks_without_a_row_have_no_rates():
+    numbers = [
+        [0, 0],
+        [3, 1]
+    ]
+    matrix_numbers = derived.derive_numbers(numbers, [1], [1])
+
+    assert matrix_numbers.sdk_metrics == {
+        1: derived.SDKMetrics(None, None, 3)
+    }
+
+
+def test_matrix_numbers_share_the_cached_matrix(test_db_data, sdk_ids):
+    numbers = matrix.compute_numbers(sdk_ids, [sdk_ids[0]])
+    stats = matrix.get_numbers_cache_stats()
+
+    matrix_numbers = matrix.compute_matrix_numbers(
+        list(reversed(sdk_ids)), [sdk_ids[0], sdk_ids[0]])
+    new_stats = matrix.get_numbers_cache_stats()
+
+    assert matrix_numbers.numbers == [
+        [row[0], row[0], row[1]] for row in [*reversed(numbers[:-1]),
+                                             numbers[-1]]
+    ]
+    # Duplicate SDKs don't count twice when normalizing.
+    assert matrix_numbers.row_normalized[0] == [
+        n / sum(numbers[2]) for n in [numbers[2][0],
+                                      numbers[2][0],
+                                      numbers[2][1]]
+    ]
+    assert new_stats.hits == stats.hits + 1
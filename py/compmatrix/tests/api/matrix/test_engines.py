@@ -0,0 +1,83 @@
+import itertools
+
+import pytest
+
+from compmatrix.api import matrix
+
+# The workers of the parallel per-cell engine use their own connections, so
+# they can't see the test data, which never gets committed. It has its own
+# tests in `test_parallel.py`.
+SESSION_ENGINES = [e for e in matrix.ENGINES if e != 'parallel_per_cell']
+COMPARED_ENGINES = [e for e in SESSION_ENGINES if e != 'per_cell']
+
+
+def _create_sdk_selections(sdk_ids):
+    selections = []
+    for num_sdks in range(len(sdk_ids) + 1):
+        selections.extend(
+            list(p) for p in itertools.permutations(sdk_ids, num_sdks)
+        )
+
+    # Duplicate SDKs should just result in duplicate rows or columns.
+    selections.append([sdk_ids[1], sdk_ids[0], sdk_ids[1]])
+
+    return selections
+
+
+@pytest.fixture(scope='module')
+def per_cell_numbers(test_db_data, sdk_ids):
+    # The per-cell engine is the reference for every other engine. It's also
+    # the slowest one, so we only compute its numbers once.
+    selections = _create_sdk_selections(sdk_ids)
+    numbers = []
+    for from_sdks in selections:
+        for to_sdks in selections:
+            numbers.append((
+                from_sdks,
+                to_sdks,
+                matrix.per_cell.compute_numbers(from_sdks, to_sdks)
+            ))
+
+    yield numbers
+
+
+@pytest.mark.parametrize('engine', COMPARED_ENGINES)
+def test_engine_matches_per_cell_engine(per_cell_numbers, engine):
+    for from_sdks, to_sdks, expected_numbers in per_cell_numbers:
+        numbers = matrix.ENGINES[engine](from_sdks, to_sdks)
+
+        assert numbers == expected_numbers, (from_sdks, to_sdks)
+
+
+@pytest.mark.parametrize('engine', SESSION_ENGINES)
+def test_engine_with_large_selections(app, per_cell_numbers, monkeypatch,
+                                      engine):
+    # Every selection gets passed to the queries as a JSON array.
+    monkeypatch.setitem(app.config, 'COMPMATRIX_LARGE_SELECTION_SIZE', 1)
+    for from_sdks, to_sdks, expected_numbers in per_cell_numbers:
+        numbers = matrix.ENGINES[engine](from_sdks, to_sdks)
+
+        assert numbers == expected_numbers, (from_sdks, to_sdks)
+
+
+@pytest.mark.parametrize('engine', SESSION_ENGINES)
+def test_compute_numbers_uses_configured_engine(app, test_db_data, sdk_ids,
+                                                monkeypatch, engine):
+    monkeypatch.setitem(app.config, 'COMPMATRIX_NUMBERS_ENGINE', engine)
+
+    #      Expected Competitive Matrix Values
+    #
+    #            | PayPal | card.io | Chartboost | (none) |
+    # -----------+--------+---------+------------+--------|
+    # PayPal     |      4 |       3 |          3 |      0 |
+    # card.io    |      2 |       5 |          3 |      2 |
+    # Chartboost |      3 |       3 |          4 |      0 |
+    # (none)     |      0 |       0 |          0 |      3 |
+    expected_numbers = [
+        [4, 3, 3, 0],
+        [2, 5, 3, 2],
+        [3, 3, 4, 0],
+        [0, 0, 0, 3]
+    ]
+
+    assert matrix.compute_numbers(sdk_ids, sdk_ids) == expected_numbers
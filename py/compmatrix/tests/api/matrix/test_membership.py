@@ -0,0 +1,134 @@
+import itertools
+import random
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.matrix import membership
+from compmatrix.api.views import queries
+
+SDK_IDS = [1, 2, 3]
+NUM_APPS = 60
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    rng = random.Random(7)
+    rows = [models.SDK(id=i, name=f'SDK {i}') for i in SDK_IDS]
+    for app_id in range(1, NUM_APPS + 1):
+        rows.append(models.App(id=app_id, name=f'App {app_id}'))
+        for sdk_id in SDK_IDS:
+            installed = rng.choice([None, None, False, True])
+            if installed is not None:
+                rows.append(models.AppSDK(app_id=app_id,
+                                          sdk_id=sdk_id,
+                                          installed=installed))
+
+    tmp_app = create_tmp_app(rows,
+                             create_tables=[membership.create_table],
+                             build_tables=[membership.rebuild_table])
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+def _get_table():
+    return {
+        c.app_id: (c.num_installed, c.num_uninstalled)
+        for c in db.session.execute(
+            db.select(models.AppSDKCount)
+        ).scalars()
+        if c.num_installed != 0 or c.num_uninstalled != 0
+    }
+
+
+def _get_rebuilt_table():
+    with db.session.begin_nested() as savepoint:
+        membership.rebuild_table()
+        table = _get_table()
+        savepoint.rollback()
+
+    return table
+
+
+def _get_membership_app_ids(from_sdk, to_sdk, other_from_sdks, other_to_sdks):
+    condition = membership.get_cell_condition(from_sdk,
+                                              to_sdk,
+                                              other_from_sdks,
+                                              other_to_sdks)
+    return set(db.session.execute(
+        db.select(models.App.id).where(condition)
+    ).scalars())
+
+
+def _get_queried_app_ids(from_sdk, to_sdk, other_from_sdks, other_to_sdks):
+    if from_sdk is None and to_sdk is None:
+        query = queries.get_query_for_none_to_none(other_from_sdks,
+                                                   other_to_sdks)
+    elif from_sdk is None:
+        query = queries.get_query_for_none_to_to_sdk(to_sdk, other_from_sdks)
+    elif to_sdk is None:
+        query = queries.get_query_for_from_sdk_to_none(from_sdk,
+                                                       other_to_sdks)
+    else:
+        query = queries.get_query_for_from_to_sdks(from_sdk, to_sdk)
+
+    subquery = query.subquery()
+    return set(db.session.execute(db.select(subquery.c.app_id)).scalars())
+
+
+def _check_cell_conditions_match_queries():
+    selections = [
+        list(c)
+        for num_sdks in range(len(SDK_IDS) + 1)
+        for c in itertools.combinations(SDK_IDS, num_sdks)
+    ]
+    for from_sdks in selections:
+        for to_sdks in selections:
+            cells = [
+                *[(f, t, [], []) for f in from_sdks for t in to_sdks],
+                *[(f, None, [], to_sdks) for f in from_sdks],
+                *[(None, t, from_sdks, []) for t in to_sdks],
+                (None, None, from_sdks, to_sdks)
+            ]
+            for cell in cells:
+                assert (_get_membership_app_ids(*cell)
+                        == _get_queried_app_ids(*cell)), cell
+
+
+def test_cell_condition_matches_queries(tmp_app):
+    _check_cell_conditions_match_queries()
+
+
+def test_cell_condition_matches_queries_with_large_selections(tmp_app):
+    # Every selection gets passed to the queries as a JSON array.
+    tmp_app.config['COMPMATRIX_LARGE_SELECTION_SIZE'] = 1
+
+    _check_cell_conditions_match_queries()
+
+
+def test_table_follows_app_sdk_changes(tmp_app):
+    assert _get_table() == _get_rebuilt_table()
+
+    app_sdk = db.session.execute(
+        db.select(models.AppSDK).where(models.AppSDK.app_id == 1)
+    ).scalars().first()
+    app_sdk.installed = not app_sdk.installed
+    db.session.flush()
+    assert _get_table() == _get_rebuilt_table()
+
+    db.session.execute(
+        db.delete(models.AppSDK).where(models.AppSDK.app_id == 2))
+    db.session.flush()
+    assert _get_table() == _get_rebuilt_table()
+
+    db.session.add(models.AppSDK(app_id=2, sdk_id=3, installed=False))
+    db.session.flush()
+    assert _get_table() == _get_rebuilt_table()
+
+    # Moves the row to an app without any rows yet.
+    db.session.add(models.App(id=NUM_APPS + 1, name='New App'))
+    app_sdk = db.session.get(models.AppSDK, (2, 3))
+    app_sdk.app_id = NUM_APPS + 1
+    db.session.flush()
+    assert _get_table() == _get_rebuilt_table()
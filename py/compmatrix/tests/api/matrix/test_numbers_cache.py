@@ -0,0 +1,109 @@
+from compmatrix import db
+from compmatrix.api import matrix, models
+from compmatrix.api.matrix import per_cell
+from compmatrix.utils import caching
+
+
+def test_permuted_selection_hits_cache(test_db_data, sdk_ids):
+    from_sdks = [sdk_ids[2], sdk_ids[0]]
+    to_sdks = [sdk_ids[1], sdk_ids[0], sdk_ids[1]]
+    matrix.compute_numbers(list(reversed(from_sdks)), sorted(set(to_sdks)))
+    stats = matrix.get_numbers_cache_stats()
+
+    numbers = matrix.compute_numbers(from_sdks, to_sdks)
+    new_stats = matrix.get_numbers_cache_stats()
+
+    assert numbers == per_cell.compute_numbers(from_sdks, to_sdks)
+    assert new_stats.hits == stats.hits + 1
+    assert new_stats.misses == stats.misses
+
+
+def test_cached_numbers_are_not_shared(test_db_data, sdk_ids):
+    numbers = matrix.compute_numbers(sdk_ids, sdk_ids)
+    numbers[0][0] = -1
+
+    assert matrix.compute_numbers(sdk_ids, sdk_ids)[0][0] != -1
+
+
+def test_cache_gets_invalidated_when_data_changes(create_tmp_app):
+    tmp_app = create_tmp_app([
+        models.SDK(id=1, name='PayPal'),
+        models.App(id=1, name='App 1'),
+        models.AppSDK(app_id=1, sdk_id=1, installed=True)
+    ])
+    with tmp_app.app_context():
+        assert matrix.compute_numbers([1], [1]) == [[1, 0], [0, 0]]
+        assert matrix.compute_numbers([1], [1]) == [[1, 0], [0, 0]]
+        assert matrix.get_numbers_cache_stats().hits == 1
+
+        db.session.add(models.App(id=2, name='App 2'))
+        db.session.add(models.AppSDK(app_id=2, sdk_id=1, installed=True))
+        db.session.commit()
+
+        assert matrix.compute_numbers([1], [1]) == [[2, 0], [0, 0]]
+        stats = matrix.get_numbers_cache_stats()
+        assert stats.hits == 1
+        assert stats.misses == 2
+        assert stats.num_entries == 1
+
+
+def test_find_cached_number(test_db_data, sdk_ids):
+    from_sdks = [sdk_ids[2], sdk_ids[0]]
+    to_sdks = [sdk_ids[1], sdk_ids[0]]
+    numbers = matrix.compute_numbers(from_sdks, to_sdks)
+
+    for row_index, from_sdk in enumerate([*from_sdks, None]):
+        for col_index, to_sdk in enumerate([*to_sdks, None]):
+            # The other SDKs are given like in the apps endpoint.
+            other_from_sdks = from_sdks if from_sdk is None else []
+            other_to_sdks = list(reversed(to_sdks)) if to_sdk is None else []
+
+            number = matrix.find_cached_number(from_sdk,
+                                               to_sdk,
+                                               other_from_sdks,
+                                               other_to_sdks)
+
+            assert number == numbers[row_index][col_index]
+
+
+def test_find_cached_number_misses(test_db_data, sdk_ids):
+    matrix.compute_numbers(sdk_ids, sdk_ids)
+
+    # The "(none)" cells need a matrix with the exact same SDKs.
+    assert matrix.find_cached_number(None, sdk_ids[0], [999], []) is None
+    assert matrix.find_cached_number(sdk_ids[0], None, [], [999]) is None
+    assert matrix.find_cached_number(999, sdk_ids[0], [], []) is None
+
+
+def test_find_cached_number_uses_index(test_db_data, sdk_ids, monkeypatch):
+    numbers = matrix.compute_numbers(sdk_ids, sdk_ids)
+    matrix.find_cached_number(sdk_ids[0], sdk_ids[0], [], [])
+
+    # Once the index of the data version is built, the cache doesn't get
+    # gone through anymore.
+    def fail_items(self):
+        raise AssertionError('The cache was gone through.')
+
+    monkeypatch.setattr(caching.LRUCache, 'items', fail_items)
+
+    assert matrix.find_cached_number(sdk_ids[1], None, [], sdk_ids) == (
+        numbers[1][-1])
+
+
+def test_find_cached_number_skips_evicted_matrices(create_tmp_app):
+    tmp_app = create_tmp_app(
+        [
+            models.SDK(id=1, name='PayPal'),
+            models.SDK(id=2, name='Stripe'),
+            models.App(id=1, name='App 1'),
+            models.AppSDK(app_id=1, sdk_id=1, installed=True)
+        ],
+        extra_config={'COMPMATRIX_NUMBERS_CACHE_MAX_ENTRIES': 1}
+    )
+    with tmp_app.app_context():
+        matrix.compute_numbers([1], [1])
+        assert matrix.find_cached_number(1, 1, [], []) == 1
+
+        matrix.compute_numbers([2], [2])
+        assert matrix.find_cached_number(1, 1, [], []) is None
+        assert matrix.find_cached_number(2, 2, [], []) == 0
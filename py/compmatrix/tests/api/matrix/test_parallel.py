@@ -0,0 +1,124 @@
+import itertools
+import sqlite3
+import threading
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.matrix import parallel, per_cell
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    tmp_app = create_tmp_app(
+        [
+            models.SDK(id=1, name='PayPal'),
+            models.SDK(id=2, name='Stripe'),
+            models.SDK(id=3, name='Braintree'),
+            models.App(id=1, name='App 1'),
+            models.App(id=2, name='App 2'),
+            models.App(id=3, name='App 3'),
+            models.App(id=4, name='App 4'),
+            models.AppSDK(app_id=1, sdk_id=1, installed=True),
+            models.AppSDK(app_id=1, sdk_id=2, installed=False),
+            models.AppSDK(app_id=2, sdk_id=2, installed=True),
+            models.AppSDK(app_id=2, sdk_id=3, installed=True),
+            models.AppSDK(app_id=3, sdk_id=1, installed=False),
+            models.AppSDK(app_id=3, sdk_id=3, installed=False)
+        ],
+        extra_config={'COMPMATRIX_NUMBERS_WORKERS': 3}
+    )
+    with tmp_app.app_context():
+        yield tmp_app
+
+    parallel.close_executor(tmp_app)
+
+
+def test_parallel_engine_matches_per_cell_engine(tmp_app):
+    sdk_ids = [1, 2, 3]
+    selections = [
+        list(p)
+        for num_sdks in range(len(sdk_ids) + 1)
+        for p in itertools.permutations(sdk_ids, num_sdks)
+    ]
+    for from_sdks in selections:
+        for to_sdks in selections:
+            assert (parallel.compute_numbers(from_sdks, to_sdks)
+                    == per_cell.compute_numbers(from_sdks, to_sdks))
+
+
+def test_parallel_engine_sees_committed_changes(tmp_app):
+    assert parallel.compute_numbers([1], [2])[0][0] == 0
+
+    db.session.add(models.AppSDK(app_id=3, sdk_id=2, installed=True))
+    db.session.commit()
+
+    assert parallel.compute_numbers([1], [2])[0][0] == 1
+    assert (parallel.compute_numbers([1, 3], [2])
+            == per_cell.compute_numbers([1, 3], [2]))
+
+
+def test_parallel_engine_raises_query_errors(tmp_app, monkeypatch):
+    get_count_queries = per_cell.get_count_queries
+
+    def get_failing_queries(from_sdks, to_sdks):
+        queries = get_count_queries(from_sdks, to_sdks)
+        queries[0][1] = db.select(db.text('missing_column'))
+
+        return queries
+
+    monkeypatch.setattr(per_cell, 'get_count_queries', get_failing_queries)
+
+    with pytest.raises(db.exc.OperationalError):
+        parallel.compute_numbers([1], [2])
+
+
+def test_parallel_engine_reads_one_snapshot(tmp_app, monkeypatch):
+    expected_numbers = per_cell.compute_numbers([1, 2, 3], [1, 2, 3])
+    db_path = db.engine.url.database
+    count = parallel._CellExecutor._count
+    write_lock = threading.Lock()
+    write_results = []
+
+    def count_after_write(query, connections):
+        # Tries to commit a change to the cells while the matrix is being
+        # computed, without waiting for the database to be unlocked.
+        with write_lock:
+            if not write_results:
+                connection = sqlite3.connect(db_path, timeout=0)
+                try:
+                    with connection:
+                        connection.execute(
+                            'INSERT INTO app_sdk (app_id, sdk_id, installed) '
+                            'VALUES (4, 1, 0), (4, 2, 1)')
+                    write_results.append('committed')
+                except sqlite3.OperationalError:
+                    write_results.append('locked')
+                finally:
+                    connection.close()
+
+        return count(query, connections)
+
+    monkeypatch.setattr(parallel._CellExecutor, '_count',
+                        staticmethod(count_after_write))
+
+    assert parallel.compute_numbers([1, 2, 3], [1, 2, 3]) == expected_numbers
+    assert write_results == ['locked']
+
+
+def test_close_executor(tmp_app):
+    expected_numbers = per_cell.compute_numbers([1], [2])
+    assert parallel.compute_numbers([1], [2]) == expected_numbers
+    executor = tmp_app.extensions[parallel._EXTENSION_KEY]
+
+    parallel.close_executor(tmp_app)
+    parallel.close_executor(tmp_app)
+
+    assert parallel._EXTENSION_KEY not in tmp_app.extensions
+    assert executor._engine.pool.checkedin() == 0
+    with pytest.raises(RuntimeError):
+        executor._executor.submit(int)
+
+    # The engine starts over with new threads and connections.
+    assert parallel.compute_numbers([1], [2]) == expected_numbers
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.matrix import per_cell, signatures
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    sdks = [
+        models.SDK(id=1, name='PayPal'),
+        models.SDK(id=2, name='Stripe')
+    ]
+    apps = [models.App(id=i, name=f'App {i}') for i in range(1, 5)]
+    app_sdks = [
+        models.AppSDK(app_id=1, sdk_id=1, installed=False),
+        models.AppSDK(app_id=1, sdk_id=2, installed=True),
+        models.AppSDK(app_id=2, sdk_id=1, installed=False),
+        models.AppSDK(app_id=2, sdk_id=2, installed=True),
+        models.AppSDK(app_id=3, sdk_id=1, installed=True)
+    ]
+
+    return create_tmp_app(sdks + apps + app_sdks)
+
+
+def test_build_histogram(tmp_app):
+    with tmp_app.app_context():
+        histogram = signatures.build_histogram()
+
+    assert histogram.signature_counts == {
+        (frozenset({1}), frozenset({2})): 2,
+        (frozenset(), frozenset({1})): 1
+    }
+    assert histogram.num_apps_without_sdks == 1
+
+
+def test_histogram_gets_saved_and_reused(tmp_app, monkeypatch):
+    path = tmp_app.config['COMPMATRIX_SIGNATURES_PATH']
+    with tmp_app.app_context():
+        histogram = signatures.load_histogram()
+
+        with open(path, 'r') as f:
+            saved_data = json.load(f)
+
+        assert saved_data['histogram'] == histogram.to_dict()
+
+        def fail_build():
+            raise AssertionError('The saved histogram should be used.')
+
+        monkeypatch.setattr(signatures, 'build_histogram', fail_build)
+        loaded_histogram = signatures.load_histogram()
+
+    assert loaded_histogram.signature_counts == histogram.signature_counts
+    assert (loaded_histogram.num_apps_without_sdks
+            == histogram.num_apps_without_sdks)
+
+
+def test_histogram_gets_rebuilt_when_data_changes(tmp_app):
+    with tmp_app.app_context():
+        expected_numbers = [[2, 1], [2, 1]]
+        assert per_cell.compute_numbers([1], [2]) == expected_numbers
+        assert signatures.compute_numbers([1], [2]) == expected_numbers
+
+        db.session.add(models.AppSDK(app_id=4, sdk_id=1, installed=False))
+        db.session.add(models.AppSDK(app_id=4, sdk_id=2, installed=True))
+        db.session.commit()
+
+        expected_numbers = [[3, 1], [3, 0]]
+        assert per_cell.compute_numbers([1], [2]) == expected_numbers
+        assert signatures.compute_numbers([1], [2]) == expected_numbers
@@ -0,0 +1,109 @@
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models, tables
+from compmatrix.api.matrix import transitions
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    sdks = [models.SDK(id=i, name=f'SDK {i}') for i in range(1, 4)]
+    apps = [models.App(id=i, name=f'App {i}') for i in range(1, 4)]
+
+    return create_tmp_app(sdks + apps,
+                          create_tables=[transitions.create_table])
+
+
+def _drop_table():
+    models.SDKTransition.__table__.drop(db.session.connection())
+
+
+def _get_table():
+    return {
+        (t.from_sdk_id, t.to_sdk_id): t.app_count
+        for t in db.session.execute(
+            db.select(models.SDKTransition)
+        ).scalars()
+        if t.app_count != 0
+    }
+
+
+def _get_rebuilt_table():
+    with db.session.begin_nested() as savepoint:
+        transitions.rebuild_table()
+        table = _get_table()
+        savepoint.rollback()
+
+    return table
+
+
+def test_rebuild_table(tmp_app):
+    with tmp_app.app_context():
+        db.session.add_all([
+            models.AppSDK(app_id=1, sdk_id=1, installed=False),
+            models.AppSDK(app_id=1, sdk_id=2, installed=True),
+            models.AppSDK(app_id=1, sdk_id=3, installed=True),
+            models.AppSDK(app_id=2, sdk_id=1, installed=False),
+            models.AppSDK(app_id=2, sdk_id=2, installed=True)
+        ])
+        db.session.flush()
+        transitions.rebuild_table()
+
+        assert _get_table() == {
+            (1, 2): 2,
+            (1, 3): 1,
+            (2, 2): 2,
+            (3, 3): 1
+        }
+        assert transitions.get_transitions([1, 2], [2]) == {
+            (1, 2): 2,
+            (2, 2): 2
+        }
+
+
+def test_table_follows_app_sdk_changes(tmp_app):
+    with tmp_app.app_context():
+        db.session.add_all([
+            models.AppSDK(app_id=1, sdk_id=1, installed=False),
+            models.AppSDK(app_id=1, sdk_id=2, installed=True),
+            models.AppSDK(app_id=2, sdk_id=1, installed=True),
+            models.AppSDK(app_id=2, sdk_id=3, installed=False)
+        ])
+        db.session.flush()
+        assert _get_table() == _get_rebuilt_table()
+
+        app_sdk = db.session.get(models.AppSDK, (1, 2))
+        app_sdk.installed = False
+        db.session.flush()
+        assert _get_table() == _get_rebuilt_table()
+
+        app_sdk = db.session.get(models.AppSDK, (2, 3))
+        app_sdk.sdk_id = 2
+        db.session.flush()
+        assert _get_table() == _get_rebuilt_table()
+
+        db.session.delete(db.session.get(models.AppSDK, (2, 1)))
+        db.session.flush()
+        assert _get_table() == _get_rebuilt_table()
+        assert _get_table() == {}
+
+
+def test_get_transitions_without_table(create_tmp_app):
+    sdks = [models.SDK(id=i, name=f'SDK {i}') for i in range(1, 3)]
+    app_sdks = [models.AppSDK(app_id=1, sdk_id=1, installed=False),
+                models.AppSDK(app_id=1, sdk_id=2, installed=True)]
+    tmp_app = create_tmp_app(
+        sdks + [models.App(id=1, name='App 1')] + app_sdks,
+        create_tables=[_drop_table])
+
+    with tmp_app.app_context():
+        with pytest.raises(tables.MissingTableError):
+            transitions.get_transitions([1], [2])
+
+    with tmp_app.app_context():
+        transitions.create_table()
+        transitions.rebuild_table()
+        db.session.commit()
+
+    with tmp_app.app_context():
+        assert transitions.get_transitions([1], [2]) == {(1, 2): 1}
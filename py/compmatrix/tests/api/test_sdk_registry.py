@@ -0,0 +1,43 @@
+import array
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models, sdk_registry
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    tmp_app = create_tmp_app([
+        models.SDK(id=7, name='SDK 7'),
+        models.SDK(id=3, name='SDK 3'),
+        models.SDK(id=12, name='SDK 12')
+    ])
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+def test_registry():
+    registry = sdk_registry.SDKRegistry(array.array('q', [3, 7, 12]))
+
+    assert len(registry) == 3
+    assert 7 in registry
+    assert 8 not in registry
+    assert 13 not in registry
+    assert -1 not in registry
+    assert 2 ** 70 not in registry
+    assert registry.get_unknown_ids([12, 1, 3, 1, 99]) == [1, 1, 99]
+    assert registry.get_unknown_ids([]) == []
+
+
+def test_registry_follows_sdk_changes(tmp_app):
+    registry = sdk_registry.get_registry()
+
+    assert registry.get_unknown_ids([3, 5, 7, 12]) == [5]
+    assert sdk_registry.get_registry() is registry
+
+    db.session.add(models.SDK(id=5, name='SDK 5'))
+    db.session.delete(db.session.get(models.SDK, 12))
+    db.session.commit()
+
+    assert sdk_registry.get_registry().get_unknown_ids([3, 5, 7, 12]) == [12]
@@ -0,0 +1,52 @@
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models, search
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    # Apps added before the table was created only get in with a rebuild.
+    tmp_app = create_tmp_app(
+        [
+            models.App(id=1, name='Clash of Clans', seller_name='Supercell'),
+            models.App(id=2, name='Hay Day', seller_name='Supercell')
+        ],
+        build_tables=[search.create_table, search.rebuild_table]
+    )
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+def _search(search_text):
+    match_query = search.create_match_query(search_text)
+    return set(db.session.execute(
+        search.get_query_for_matching_app_ids(match_query)).scalars())
+
+
+def test_create_match_query():
+    assert search.create_match_query('clash') == '"clash"*'
+    assert search.create_match_query(' Clash  of-Cl ') == (
+        '"Clash"* "of"* "Cl"*')
+    assert search.create_match_query('"a" OR b*') == '"a"* "OR"* "b"*'
+    assert search.create_match_query('') is None
+    assert search.create_match_query('- * "') is None
+
+
+def test_table_follows_app_changes(tmp_app):
+    assert _search('supercell') == {1, 2}
+
+    db.session.add(models.App(id=3, name='Boom Beach', seller_name='Super'))
+    db.session.flush()
+    assert _search('boom') == {3}
+    assert _search('super') == {1, 2, 3}
+
+    app = db.session.get(models.App, 2)
+    app.name = 'Clash Royale'
+    db.session.flush()
+    assert _search('clash') == {1, 2}
+    assert _search('hay') == set()
+
+    db.session.delete(db.session.get(models.App, 1))
+    db.session.flush()
+    assert _search('clash') == {2}
@@ -0,0 +1,121 @@
+import threading
+
+from compmatrix import db
+from compmatrix.api import models, versioning
+
+
+def test_get_versioned_rebuilds_after_commit(create_tmp_app):
+    tmp_app = create_tmp_app()
+    num_builds = 0
+
+    def build():
+        nonlocal num_builds
+        num_builds += 1
+        return db.session.query(models.SDK).count()
+
+    with tmp_app.app_context():
+        version = versioning.get_data_version()
+        assert versioning.get_versioned('num_sdks', build) == 0
+        assert versioning.get_versioned('num_sdks', build) == 0
+        assert num_builds == 1
+        assert versioning.get_data_version() == version
+
+        db.session.add(models.SDK(name='PayPal', slug='paypal'))
+        db.session.commit()
+
+        assert versioning.get_data_version() != version
+        assert versioning.get_versioned('num_sdks', build) == 1
+        assert num_builds == 2
+
+
+def test_advance_versioned_updates_objects(create_tmp_app):
+    tmp_app = create_tmp_app()
+    with tmp_app.app_context():
+        versioning.get_versioned('sdks', lambda: [])
+        versioning.get_versioned('num_sdks', lambda: 0)
+
+        base = versioning.get_commit_base()
+        db.session.add(models.SDK(name='PayPal', slug='paypal'))
+        db.session.commit()
+
+        def update(sdks, new_version):
+            return sdks + ['PayPal']
+
+        assert versioning.advance_versioned(base, {'sdks': update})
+        assert versioning.get_versioned('sdks', list) == ['PayPal']
+        # Objects without an updater get rebuilt.
+        assert versioning.get_versioned('num_sdks', lambda: 1) == 1
+
+
+def test_advance_versioned_drops_objects_after_other_commits(
+        create_tmp_app):
+    tmp_app = create_tmp_app()
+    with tmp_app.app_context():
+        versioning.get_versioned('sdks', lambda: [])
+
+        base = versioning.get_commit_base()
+        db.session.add(models.SDK(name='PayPal', slug='paypal'))
+        db.session.commit()
+        db.session.add(models.SDK(name='Stripe', slug='stripe'))
+        db.session.commit()
+
+        def update(sdks, new_version):
+            return sdks + ['PayPal']
+
+        assert not versioning.advance_versioned(base, {'sdks': update})
+        assert versioning.get_versioned(
+            'sdks', lambda: ['PayPal', 'Stripe']) == ['PayPal', 'Stripe']
+
+
+def test_get_versioned_builds_outside_the_lock(create_tmp_app):
+    tmp_app = create_tmp_app()
+    is_building = threading.Event()
+    can_finish = threading.Event()
+    num_builds = 0
+
+    def build_slowly():
+        nonlocal num_builds
+        num_builds += 1
+        is_building.set()
+        assert can_finish.wait(5)
+        return 'histogram'
+
+    def get_histogram(results):
+        with tmp_app.app_context():
+            results.append(versioning.get_versioned('histogram',
+                                                    build_slowly))
+
+    results = []
+    threads = [
+        threading.Thread(target=get_histogram, args=(results,))
+        for _ in range(2)
+    ]
+    threads[0].start()
+    assert is_building.wait(5)
+    threads[1].start()
+
+    # Other objects can be built while the histogram is being built.
+    with tmp_app.app_context():
+        assert versioning.get_versioned('registry', lambda: 'ids') == 'ids'
+
+    can_finish.set()
+    for thread in threads:
+        thread.join(5)
+
+    # The histogram only got built once for both requests.
+    assert results == ['histogram', 'histogram']
+    assert num_builds == 1
+
+
+def test_get_versioned_keeps_newer_objects(create_tmp_app):
+    tmp_app = create_tmp_app()
+    with tmp_app.app_context():
+        def build_while_committing():
+            # A newer object gets stored while this one is being built.
+            db.session.add(models.SDK(name='PayPal', slug='paypal'))
+            db.session.commit()
+            versioning.get_versioned('sdks', lambda: ['PayPal'])
+            return []
+
+        assert versioning.get_versioned('sdks', build_while_committing) == []
+        assert versioning.get_versioned('sdks', list) == ['PayPal']
@@ -0,0 +1,290 @@
+"""
+Tests the /api/v1/batch endpoint.
+"""
+from http import HTTPStatus
+
+from compmatrix.api import matrix, models, sdk_registry
+from compmatrix.api.views.codes import AnomalyCode
+
+BATCH_ENDPOINT = '/api/v1/batch'
+SDKS_ENDPOINT = '/api/v1/sdks'
+NUMBERS_ENDPOINT = '/api/v1/sdk-compmatrix/numbers'
+APPS_ENDPOINT = '/api/v1/sdk-compmatrix/apps'
+APPS_EXPORT_ENDPOINT = '/api/v1/sdk-compmatrix/apps/export'
+
+
+def test_batch_matches_separate_requests(client, test_db_data, sdk_ids):
+    numbers_params = {
+        'from_sdks': sdk_ids,
+        'to_sdks': [sdk_ids[0]]
+    }
+    apps_params = {
+        'from_sdk': sdk_ids[1],
+        'to_sdk': sdk_ids[0],
+        'count': 2
+    }
+    body = {
+        'requests': [
+            {'path': SDKS_ENDPOINT},
+            {'path': NUMBERS_ENDPOINT, 'params': numbers_params},
+            {'path': f'{APPS_ENDPOINT}?count=2&from_sdk={sdk_ids[1]}',
+             'params': {'to_sdk': sdk_ids[0]}}
+        ]
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    expected_resp = {
+        'data': {
+            'responses': [
+                {
+                    'path': SDKS_ENDPOINT,
+                    'status': HTTPStatus.OK,
+                    'body': client.get(SDKS_ENDPOINT).json
+                },
+                {
+                    'path': NUMBERS_ENDPOINT,
+                    'status': HTTPStatus.OK,
+                    'body': client.get(NUMBERS_ENDPOINT,
+                                       query_string=numbers_params).json
+                },
+                {
+                    'path': f'{APPS_ENDPOINT}?count=2&from_sdk={sdk_ids[1]}',
+                    'status': HTTPStatus.OK,
+                    'body': client.get(APPS_ENDPOINT,
+                                       query_string=apps_params).json
+                }
+            ]
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_batch_shares_sdk_id_checks(client, test_db_data, sdk_ids,
+                                    monkeypatch):
+    num_registry_gets = 0
+    get_registry = sdk_registry.get_registry
+
+    def get_registry_spy():
+        nonlocal num_registry_gets
+        num_registry_gets += 1
+        return get_registry()
+
+    monkeypatch.setattr(sdk_registry, 'get_registry', get_registry_spy)
+
+    body = {
+        'requests': [
+            {
+                'path': NUMBERS_ENDPOINT,
+                'params': {'from_sdks': sdk_ids, 'to_sdks': sdk_ids}
+            },
+            {
+                'path': NUMBERS_ENDPOINT,
+                'params': {'from_sdks': sdk_ids[0], 'to_sdks': 3737844653}
+            }
+        ]
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    responses = resp.json['data']['responses']
+    assert responses[0]['status'] == HTTPStatus.OK
+    assert responses[1]['status'] == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert responses[1]['body']['errors'][0]['diagnostics'] == {
+        'to_sdks': [3737844653]
+    }
+    assert num_registry_gets == 1
+
+
+def test_batch_unknown_endpoints(client, test_db_data):
+    body = {
+        'requests': [
+            {'path': '/api/v1/rickroll'},
+            {'path': BATCH_ENDPOINT},
+            {'path': '/'}
+        ]
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    expected_resp = {
+        'data': {
+            'responses': [
+                {
+                    'path': path,
+                    'status': HTTPStatus.NOT_FOUND,
+                    'body': {
+                        'errors': [
+                            {
+                                'message': f'Path, "{path}", does not refer '
+                                           'to an API endpoint.',
+                                'code': AnomalyCode.UNKNOWN_ENDPOINT
+                            }
+                        ]
+                    }
+                }
+                for path in ['/api/v1/rickroll', BATCH_ENDPOINT, '/']
+            ]
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_batch_streamed_requests(client, test_db_data, sdk_ids):
+    streamed_requests = [
+        {
+            'path': APPS_EXPORT_ENDPOINT,
+            'params': {'from_sdk': sdk_ids[1], 'to_sdk': sdk_ids[0]}
+        },
+        {
+            'path': NUMBERS_ENDPOINT,
+            'params': {
+                'from_sdks': sdk_ids,
+                'to_sdks': sdk_ids,
+                'format': 'ndjson'
+            }
+        }
+    ]
+    body = {
+        'requests': [*streamed_requests, {'path': SDKS_ENDPOINT}]
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    responses = resp.json['data']['responses']
+    for sub_request, sub_response in zip(streamed_requests, responses):
+        path = sub_request['path']
+        assert sub_response == {
+            'path': path,
+            'status': HTTPStatus.UNPROCESSABLE_ENTITY,
+            'body': {
+                'errors': [
+                    {
+                        'message': f'Path, "{path}", refers to a streamed '
+                                   'response, which cannot be part of a '
+                                   'batch.',
+                        'code': AnomalyCode.STREAMED_REQUEST
+                    }
+                ]
+            }
+        }
+
+    assert responses[2]['status'] == HTTPStatus.OK
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_batch_failing_request(client, test_db_data, sdk_ids, monkeypatch):
+    def compute_numbers(from_sdks, to_sdks):
+        raise RuntimeError('Broken engine.')
+
+    monkeypatch.setattr(matrix, 'compute_numbers', compute_numbers)
+
+    body = {
+        'requests': [
+            {
+                'path': NUMBERS_ENDPOINT,
+                'params': {'from_sdks': sdk_ids, 'to_sdks': sdk_ids}
+            },
+            {'path': SDKS_ENDPOINT}
+        ]
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    responses = resp.json['data']['responses']
+    assert responses[0] == {
+        'path': NUMBERS_ENDPOINT,
+        'status': HTTPStatus.INTERNAL_SERVER_ERROR,
+        'body': {
+            'errors': [
+                {
+                    'message': 'Something went wrong while responding to '
+                               'this request.',
+                    'code': AnomalyCode.INTERNAL_ERROR
+                }
+            ]
+        }
+    }
+    assert responses[1]['status'] == HTTPStatus.OK
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_batch_uses_error_handlers(create_tmp_app):
+    tmp_client = create_tmp_app([
+        models.SDK(id=1, name='SDK 1')
+    ]).test_client()
+
+    # The search index hasn't been built, which the API has an error handler
+    # for.
+    body = {
+        'requests': [
+            {
+                'path': APPS_ENDPOINT,
+                'params': {'from_sdk': 1, 'to_sdk': 1, 'count': 1, 'q': 'a'}
+            }
+        ]
+    }
+    resp = tmp_client.post(BATCH_ENDPOINT, json=body)
+
+    sub_response = resp.json['data']['responses'][0]
+    assert sub_response['status'] == HTTPStatus.SERVICE_UNAVAILABLE
+    assert sub_response['body']['errors'][0]['code'] == (
+        AnomalyCode.MISSING_TABLE)
+
+
+def test_error_missing_requests(client):
+    resp = client.post(BATCH_ENDPOINT, json={'request': []})
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Required parameter, "requests", is missing.',
+                'code': AnomalyCode.MISSING_FIELD,
+                'parameters': ['requests']
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_error_invalid_requests(client):
+    body = {
+        'requests': [
+            {'path': SDKS_ENDPOINT},
+            {'params': {}},
+            {'path': NUMBERS_ENDPOINT, 'params': {'from_sdks': [[1]]}}
+        ]
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Some requests in "requests" are invalid. Each '
+                           'request must be an object with a "path" string, '
+                           'and an optional "params" object. There can only '
+                           'be up to 50 requests.',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': ['requests'],
+                'diagnostics': {
+                    'requests': [1, 2]
+                }
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_error_too_many_requests(client):
+    body = {
+        'requests': [{'path': SDKS_ENDPOINT}] * 51
+    }
+    resp = client.post(BATCH_ENDPOINT, json=body)
+
+    assert resp.json['errors'][0]['message'].startswith(
+        'A request in "requests" is invalid.')
+    assert resp.json['errors'][0]['diagnostics'] == {'requests': []}
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,47 @@
+import json
+
+from compmatrix.api.views import queries
+
+
+def test_cell_queries_keep_their_shape(app):
+    # Queries of the same shape must share their cache key, regardless of the
+    # SDK IDs and the number of them, so that SQLAlchemy compiles them once.
+    with app.app_context():
+        query_pairs = [
+            (queries.get_query_for_from_to_sdks(1, 2),
+             queries.get_query_for_from_to_sdks(3, 4)),
+            (queries.get_query_for_from_sdk_to_none(1, []),
+             queries.get_query_for_from_sdk_to_none(2, [3, 4, 5])),
+            (queries.get_query_for_none_to_to_sdk(1, [1]),
+             queries.get_query_for_none_to_to_sdk(2, [2, 3, 4])),
+            (queries.get_query_for_none_to_none([1], []),
+             queries.get_query_for_none_to_none([1, 2, 3], [4, 5])),
+            (queries.get_query_for_matrix_profiles([1], [2]),
+             queries.get_query_for_matrix_profiles([1, 2, 3], []))
+        ]
+
+    for query, other_query in query_pairs:
+        assert query._generate_cache_key() == other_query._generate_cache_key()
+
+
+def test_cell_queries_bind_the_sdk_ids(app):
+    with app.app_context():
+        query = queries.get_query_for_from_sdk_to_none(2, [3, 4, 5])
+
+    params = query.compile().params
+
+    assert params['from_sdk_id'] == 2
+    assert params['other_to_sdks_ids'] == [3, 4, 5]
+
+
+def test_large_selections_are_bound_as_json(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'COMPMATRIX_LARGE_SELECTION_SIZE', 3)
+    with app.app_context():
+        small_query = queries.get_query_for_from_sdk_to_none(2, [3, 4])
+        large_query = queries.get_query_for_from_sdk_to_none(2, [3, 4, 5])
+
+    assert small_query.compile().params['other_to_sdks_ids'] == [3, 4]
+    assert large_query.compile().params['other_to_sdks_ids'] == (
+        json.dumps([3, 4, 5]))
+    assert 'json_each' in str(large_query.compile())
+
@@ -0,0 +1,161 @@
+from werkzeug.datastructures import MultiDict
+
+from compmatrix.api.views import messages
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.api.views.parameters import ParamPartnership
+from compmatrix.api.views.schemas import (
+    InvalidParamValuesError,
+    ParamPartners,
+    ParamSchema,
+    ParamSpec
+)
+
+
+def _parse_int(values, _):
+    return int(values[0])
+
+
+def _parse_ints(values, _):
+    ints = []
+    invalid_values = []
+    for value in values:
+        try:
+            ints.append(int(value))
+        except ValueError:
+            invalid_values.append(value)
+
+    if invalid_values:
+        raise InvalidParamValuesError(ints, invalid_values)
+
+    return ints
+
+
+def _parse_scaled(values, parsed_values):
+    return int(values[0]) * parsed_values['scale']
+
+
+_SCHEMA = ParamSchema(
+    [
+        ParamSpec('scale', _parse_int, default=1, ignores_empty=True),
+        ParamSpec('size', _parse_scaled, is_required=True),
+        ParamSpec('ids', _parse_ints, default_factory=list,
+                  diagnoses_invalid_values=True),
+        ParamSpec('other_ids', _parse_ints, default_factory=list),
+        ParamSpec('cursor', _parse_int, ignores_empty=True),
+        ParamSpec('direction', _parse_int)
+    ],
+    [
+        ParamPartners('scale', 'other_ids', ParamPartnership.INVERSE),
+        ParamPartners('cursor', 'direction', ParamPartnership.COUPLED)
+    ]
+)
+
+
+def test_parse_values():
+    params = _SCHEMA.parse(MultiDict([
+        ('scale', '3'),
+        ('size', '2'),
+        ('ids', '1'),
+        ('ids', '2'),
+        ('cursor', '5'),
+        ('direction', '1')
+    ]))
+
+    assert params.errors == []
+    assert params.values == {
+        'scale': 3,
+        'size': 6,
+        'ids': [1, 2],
+        'other_ids': [],
+        'cursor': 5,
+        'direction': 1
+    }
+
+
+def test_parse_defaults():
+    params = _SCHEMA.parse(MultiDict([('scale', ''), ('size', '2')]))
+    other_params = _SCHEMA.parse(MultiDict([('size', '2')]))
+
+    assert params.errors == []
+    assert params.values == other_params.values == {
+        'scale': 1,
+        'size': 2,
+        'ids': [],
+        'other_ids': [],
+        'cursor': None,
+        'direction': None
+    }
+
+    # Defaults from factories don't get shared between requests.
+    assert params.values['ids'] is not other_params.values['ids']
+
+
+def test_errors_order():
+    params = _SCHEMA.parse(MultiDict([
+        ('scale', '2'),
+        ('ids', 'a'),
+        ('ids', '3'),
+        ('other_ids', '4'),
+        ('cursor', '5'),
+        ('rickroll', '')
+    ]))
+
+    assert params.errors == [
+        {
+            'message': 'Required parameter, "size", is missing.',
+            'code': AnomalyCode.MISSING_FIELD,
+            'parameters': ['size']
+        },
+        {
+            'message': 'Unrecognized parameter, "rickroll".',
+            'code': AnomalyCode.UNRECOGNIZED_FIELD,
+            'parameters': ['rickroll']
+        },
+        {
+            'message': 'Required parameter, "direction", is missing. It is '
+                       'required when the "cursor" parameter is specified.',
+            'code': AnomalyCode.MISSING_FIELD,
+            'parameters': ['direction']
+        },
+        {
+            'message': messages.create_wrong_valued_params_message(['ids']),
+            'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+            'parameters': ['ids'],
+            'diagnostics': {
+                'ids': ['a']
+            }
+        },
+        {
+            'message': 'Parameter, "other_ids", must only be specified if '
+                       'the "scale" parameter is unspecified.',
+            'code': AnomalyCode.MISUSED_PARAMETER,
+            'parameters': ['other_ids']
+        }
+    ]
+
+    # The valid values are still kept.
+    assert params.values['ids'] == [3]
+
+
+def test_misused_coupled_partner():
+    params = _SCHEMA.parse(MultiDict([
+        ('size', '2'),
+        ('cursor', ''),
+        ('direction', '1')
+    ]))
+
+    assert params.errors == [
+        {
+            'message': 'Parameter, "direction", must only be specified if '
+                       'the "cursor" parameter is specified.',
+            'code': AnomalyCode.MISUSED_PARAMETER,
+            'parameters': ['direction']
+        }
+    ]
+
+
+def test_messages_are_memoized():
+    message = messages.create_unknown_params_message(['a', 'b'])
+
+    assert message == 'Unrecognized parameters, "a" and "b".'
+    assert messages.create_unknown_params_message(['a', 'b']) is message
@@ -1,6 +1,55 @@
+import base64
+import json
+
+
 def create_cursor_from_app_obj(app_obj):
-    return f'{app_obj.name};{app_obj.seller_name}'
+    return _create_cursor(app_obj.name, app_obj.seller_name, app_obj.id)
 
 
 def create_cursor_from_app_dict(app_obj_dict):
-    return f'{app_obj_dict["name"]};{app_obj_dict["seller_name"]}'
+    return _create_cursor(app_obj_dict['name'],
+                          app_obj_dict['seller_name'],
+                          app_obj_dict['id'])
+
+
+def create_position_from_app_dict(app_obj_dict):
+    return [app_obj_dict['name'],
+            app_obj_dict['seller_name'],
+            app_obj_dict['id']]
+
+
+def decode_cursor(cursor):
+    padding = '=' * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(f'{cursor}{padding}'))
+
+
+def decode_page_cursors(resp_json):
+    """
+    Returns the response with the cursors of its page of apps decoded into
+    the positions of the apps they point to, like the ones from
+    `create_position_from_app_dict()`. The cursors also carry the total
+    number of apps of the cell, which must match the one of the page, and
+    the tag of the count, which depends on the data version.
+    """
+    data = dict(resp_json['data'])
+    for cursor_name in ['start_cursor', 'end_cursor']:
+        if data[cursor_name] is not None:
+            *position, total_count, count_tag = decode_cursor(
+                data[cursor_name])
+            assert total_count == data['total_count']
+            assert isinstance(count_tag, str)
+
+            data[cursor_name] = position
+
+    return {**resp_json, 'data': data}
+
+
+def _create_cursor(name, seller_name, app_id):
+    cursor_json = json.dumps([name, seller_name, app_id],
+                             ensure_ascii=False,
+                             separators=(',', ':'))
+    return (
+        base64.urlsafe_b64encode(cursor_json.encode('utf-8'))
+        .decode('ascii')
+        .rstrip('=')
+    )
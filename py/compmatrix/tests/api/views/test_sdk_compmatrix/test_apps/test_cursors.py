@@ -0,0 +1,172 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.matrix import membership
+from compmatrix.tests.api.views.test_sdk_compmatrix import (
+    BASE_SDK_COMPMATRIX_ENDPOINT
+)
+from compmatrix.tests.api.views.test_sdk_compmatrix.test_apps import (
+    query_utils
+)
+
+SDK_COMPMATRIX_APPS_ENDPOINT = f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps'
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    # Apps that share a name and a seller name, and names with the
+    # characters that broke the old cursors.
+    names = [
+        ('Twins', 'Seller'),
+        ('Twins', 'Seller'),
+        ('Twins', 'Seller'),
+        ('Semi;colon', 'Seller;Inc'),
+        ('Ünicode 🍰', 'Sellér'),
+        ('Twins', 'Another Seller')
+    ]
+    rows = [models.SDK(id=1, name='SDK')]
+    for app_id, (name, seller_name) in enumerate(names, start=1):
+        rows.append(models.App(id=app_id,
+                               name=name,
+                               seller_name=seller_name))
+        rows.append(models.AppSDK(app_id=app_id, sdk_id=1, installed=True))
+
+    return create_tmp_app(rows)
+
+
+@pytest.fixture
+def tmp_client(tmp_app):
+    return tmp_app.test_client()
+
+
+def _get_page(client, cursor=None, direction=None):
+    query_string = {
+        'from_sdk': 1,
+        'to_sdk': 1,
+        'count': 2
+    }
+    if cursor is not None:
+        query_string['cursor'] = cursor
+        query_string['direction'] = direction
+
+    resp = client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                      query_string=query_string)
+    assert resp.status_code == HTTPStatus.OK
+
+    return resp.json['data']
+
+
+def test_paging_visits_every_app_once(tmp_client):
+    page = _get_page(tmp_client)
+    app_ids = [app['id'] for app in page['apps']]
+    while page['apps']:
+        page = _get_page(tmp_client, page['end_cursor'], 'next')
+        app_ids.extend(app['id'] for app in page['apps'])
+
+    assert app_ids == [4, 6, 1, 2, 3, 5]
+
+    # Going back from the last app visits them all in reverse.
+    page = _get_page(tmp_client,
+                     query_utils.create_cursor_from_app_dict({
+                         'name': 'Ünicode 🍰',
+                         'seller_name': 'Sellér',
+                         'id': 5
+                     }),
+                     'previous')
+    previous_app_ids = [app['id'] for app in page['apps']]
+    while page['apps']:
+        page = _get_page(tmp_client, page['start_cursor'], 'previous')
+        previous_app_ids[:0] = [app['id'] for app in page['apps']]
+
+    assert previous_app_ids == [4, 6, 1, 2, 3]
+
+
+def test_paging_with_membership_table(tmp_app, tmp_client):
+    with tmp_app.app_context():
+        membership.create_table()
+        membership.rebuild_table()
+        db.session.commit()
+
+    tmp_app.config['COMPMATRIX_APPS_USE_MEMBERSHIP_TABLE'] = True
+
+    page = _get_page(tmp_client)
+    assert page['total_count'] == 6
+
+    app_ids = [app['id'] for app in page['apps']]
+    while page['apps']:
+        page = _get_page(tmp_client, page['end_cursor'], 'next')
+        app_ids.extend(app['id'] for app in page['apps'])
+
+    assert app_ids == [4, 6, 1, 2, 3, 5]
+
+
+def test_cursors_are_opaque(tmp_client):
+    page = _get_page(tmp_client)
+
+    decoded_page = query_utils.decode_page_cursors({'data': page})['data']
+    assert decoded_page['start_cursor'] == (
+        query_utils.create_position_from_app_dict(page['apps'][0]))
+    assert decoded_page['end_cursor'] == (
+        query_utils.create_position_from_app_dict(page['apps'][-1]))
+    for cursor in [page['start_cursor'], page['end_cursor']]:
+        assert ';' not in cursor
+        assert '=' not in cursor
+
+
+def test_next_pages_use_count_in_cursor(tmp_client):
+    page = _get_page(tmp_client)
+    assert page['total_count'] == 6
+
+    # A count that we didn't count ourselves shows that it came from the
+    # cursor.
+    cursor_values = query_utils.decode_cursor(page['end_cursor'])
+    cursor_values[3] = 1000
+    cursor_json = json.dumps(cursor_values, separators=(',', ':'))
+    forged_cursor = base64.urlsafe_b64encode(cursor_json.encode('utf-8'))
+
+    page = _get_page(tmp_client, forged_cursor.decode('ascii'), 'next')
+
+    assert page['total_count'] == 1000
+    assert query_utils.decode_cursor(page['end_cursor'])[3] == 1000
+
+
+def test_count_in_cursor_is_only_used_for_its_cell(tmp_client):
+    page = _get_page(tmp_client)
+    cursor_values = query_utils.decode_cursor(page['end_cursor'])
+    cursor_values[3] = 1000
+    cursor_json = json.dumps(cursor_values, separators=(',', ':'))
+    forged_cursor = base64.urlsafe_b64encode(cursor_json.encode('utf-8'))
+
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': '',
+                              'other_to_sdks': 1,
+                              'count': 2,
+                              'cursor': forged_cursor.decode('ascii'),
+                              'direction': 'next'
+                          })
+
+    assert resp.json['data']['total_count'] == 0
+
+
+def test_count_is_recounted_when_data_changes(tmp_app, tmp_client):
+    page = _get_page(tmp_client)
+    assert page['total_count'] == 6
+
+    with tmp_app.app_context():
+        db.session.execute(
+            db.delete(models.AppSDK).where(models.AppSDK.app_id == 6))
+        db.session.commit()
+
+    assert _get_page(tmp_client)['total_count'] == 5
+
+    # The cursors from before the change carry the old count, which must not
+    # be used anymore.
+    next_page = _get_page(tmp_client, page['end_cursor'], 'next')
+    assert next_page['total_count'] == 5
@@ -0,0 +1,156 @@
+import csv
+import datetime
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from compmatrix.api import models
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.tests.api.views.test_sdk_compmatrix import (
+    BASE_SDK_COMPMATRIX_ENDPOINT
+)
+
+SDK_COMPMATRIX_APPS_ENDPOINT = f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps'
+SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT = (
+    f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps/export')
+NUM_APPS = 7
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    rows = [
+        models.SDK(id=1, name='SDK 1'),
+        models.SDK(id=2, name='SDK 2'),
+        models.SDK(id=3, name='SDK 3')
+    ]
+    for app_id in range(1, NUM_APPS + 1):
+        rows.append(models.App(
+            id=app_id,
+            name=f'App, "{NUM_APPS - app_id}"',
+            seller_name='Seller',
+            release_date=datetime.datetime(2020, 1, app_id),
+            five_star_ratings=app_id
+        ))
+        rows.append(models.AppSDK(app_id=app_id,
+                                  sdk_id=1,
+                                  installed=app_id % 2 == 0))
+        rows.append(models.AppSDK(app_id=app_id,
+                                  sdk_id=2,
+                                  installed=app_id % 2 == 1))
+
+    # A small batch size makes the apps get exported over several batches.
+    return create_tmp_app(
+        rows, extra_config={'COMPMATRIX_APPS_EXPORT_BATCH_SIZE': 2})
+
+
+@pytest.fixture
+def tmp_client(tmp_app):
+    return tmp_app.test_client()
+
+
+def _get_all_apps(client, **params):
+    resp = client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                      query_string={'count': NUM_APPS, **params})
+    assert resp.status_code == HTTPStatus.OK
+
+    return resp.json['data']['apps']
+
+
+def test_export_as_csv(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 2,
+                              'fields': 'id,name,release_date'
+                          })
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.mimetype == 'text/csv'
+    assert resp.headers['Content-Disposition'] == (
+        'attachment; filename=apps.csv')
+
+    expected_rows = [
+        ['id', 'name', 'release_date'],
+        *[
+            [str(app['id']), app['name'], app['release_date']]
+            for app in _get_all_apps(tmp_client, from_sdk=1, to_sdk=2)
+        ]
+    ]
+
+    assert len(expected_rows) == 5
+    assert list(csv.reader(io.StringIO(resp.text))) == expected_rows
+
+
+def test_export_as_ndjson(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 2,
+                              'to_sdk': 1,
+                              'format': 'ndjson'
+                          })
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.mimetype == 'application/x-ndjson'
+
+    expected_apps = _get_all_apps(tmp_client, from_sdk=2, to_sdk=1)
+    exported_apps = [json.loads(line) for line in resp.text.splitlines()]
+
+    assert len(expected_apps) == 3
+    assert exported_apps == expected_apps
+
+
+def test_export_of_cell_without_apps(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 3,
+                              'to_sdk': 3,
+                              'fields': 'id'
+                          })
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.text == 'id\r\n'
+
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 3,
+                              'to_sdk': 3,
+                              'format': 'ndjson'
+                          })
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.text == ''
+
+
+def test_export_with_invalid_params(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 2,
+                              'format': 'json',
+                              'count': 2
+                          })
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Unrecognized parameter, "count".',
+                'code': AnomalyCode.UNRECOGNIZED_FIELD,
+                'parameters': [
+                    'count'
+                ]
+            },
+            {
+                'message': 'Parameter, "format", has an invalid value. It '
+                           'must only be either "csv" or "ndjson".',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'format'
+                ]
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,188 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models, search
+from compmatrix.api.matrix import membership
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.tests.api.views.test_sdk_compmatrix import (
+    BASE_SDK_COMPMATRIX_ENDPOINT
+)
+
+SDK_COMPMATRIX_APPS_ENDPOINT = f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps'
+
+# The apps, with their names, genres, release dates, and five-star and
+# one-star ratings. App 5 is in another cell.
+_APPS = [
+    ('Alpha', 6014, datetime.datetime(2015, 3, 1), 10, 0),
+    ('Bravo', 6014, datetime.datetime(2016, 1, 1), 1, 1),
+    ('Charlie', 6016, datetime.datetime(2015, 7, 9), None, None),
+    ('Delta', None, None, 0, 4),
+    ('Echo', 6016, datetime.datetime(2016, 1, 1), 3, 3)
+]
+
+_EXPECTED_FACETS = {
+    'genre_id': [
+        {'value': 6014, 'count': 2},
+        {'value': 6016, 'count': 1},
+        {'value': None, 'count': 1}
+    ],
+    'release_year': [
+        {'value': 2015, 'count': 2},
+        {'value': 2016, 'count': 1},
+        {'value': None, 'count': 1}
+    ],
+    'rating_band': [
+        {'value': 1, 'count': 1},
+        {'value': 3, 'count': 1},
+        {'value': 5, 'count': 1},
+        {'value': None, 'count': 1}
+    ]
+}
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    rows = [
+        models.SDK(id=1, name='SDK 1'),
+        models.SDK(id=2, name='SDK 2')
+    ]
+    for app_id, (name, genre_id, release_date, five_stars,
+                 one_star) in enumerate(_APPS, start=1):
+        rows.append(models.App(id=app_id,
+                               name=name,
+                               seller_name='Seller',
+                               genre_id=genre_id,
+                               release_date=release_date,
+                               five_star_ratings=five_stars,
+                               one_star_ratings=one_star))
+        rows.append(models.AppSDK(app_id=app_id,
+                                  sdk_id=1 if app_id != 5 else 2,
+                                  installed=True))
+
+    return create_tmp_app(rows, create_tables=[search.create_table])
+
+
+@pytest.fixture
+def tmp_client(tmp_app):
+    return tmp_app.test_client()
+
+
+def _get_apps(client, **extra_params):
+    resp = client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                      query_string={
+                          'from_sdk': 1,
+                          'to_sdk': 1,
+                          'count': 1,
+                          **extra_params
+                      })
+    assert resp.status_code == HTTPStatus.OK
+
+    return resp.json['data']
+
+
+def test_facets(tmp_client):
+    data = _get_apps(tmp_client,
+                     facets='genre_id,release_year,rating_band')
+
+    assert data['total_count'] == 4
+    assert data['facets'] == _EXPECTED_FACETS
+
+
+def test_some_facets(tmp_client):
+    data = _get_apps(tmp_client, facets=['rating_band', 'genre_id'])
+
+    assert data['total_count'] == 4
+    assert data['facets'] == {
+        'genre_id': _EXPECTED_FACETS['genre_id'],
+        'rating_band': _EXPECTED_FACETS['rating_band']
+    }
+
+
+def test_no_facets_by_default(tmp_client):
+    assert 'facets' not in _get_apps(tmp_client)
+
+
+def test_facets_on_next_pages(tmp_client):
+    first_page = _get_apps(tmp_client, facets='genre_id')
+    next_page = _get_apps(tmp_client,
+                          facets='genre_id',
+                          cursor=first_page['end_cursor'],
+                          direction='next')
+
+    assert next_page['total_count'] == 4
+    assert next_page['facets'] == {
+        'genre_id': _EXPECTED_FACETS['genre_id']
+    }
+
+
+def test_facets_follow_data_changes(tmp_app, tmp_client):
+    assert _get_apps(tmp_client, facets='genre_id')['facets'] == {
+        'genre_id': _EXPECTED_FACETS['genre_id']
+    }
+
+    with tmp_app.app_context():
+        db.session.get(models.App, 4).genre_id = 6016
+        db.session.commit()
+
+    assert _get_apps(tmp_client, facets='genre_id')['facets'] == {
+        'genre_id': [
+            {'value': 6014, 'count': 2},
+            {'value': 6016, 'count': 2}
+        ]
+    }
+
+
+def test_facets_of_search(tmp_client):
+    data = _get_apps(tmp_client, facets='genre_id', q='a')
+
+    assert data['total_count'] == 1
+    assert data['facets'] == {
+        'genre_id': [
+            {'value': 6014, 'count': 1}
+        ]
+    }
+
+
+def test_facets_with_membership_table(tmp_app, tmp_client):
+    with tmp_app.app_context():
+        membership.create_table()
+        membership.rebuild_table()
+        db.session.commit()
+
+    tmp_app.config['COMPMATRIX_APPS_USE_MEMBERSHIP_TABLE'] = True
+
+    data = _get_apps(tmp_client,
+                     facets='genre_id,release_year,rating_band')
+
+    assert data['total_count'] == 4
+    assert data['facets'] == _EXPECTED_FACETS
+
+
+def test_invalid_facets_param(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'count': 1,
+                              'facets': 'genre_id,size'
+                          })
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameter, "facets", has an invalid value. It '
+                           'must only have "genre_id", "release_year", or '
+                           '"rating_band", separated by commas.',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'facets'
+                ]
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
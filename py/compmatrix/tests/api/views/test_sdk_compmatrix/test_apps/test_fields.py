@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.tests.api.views.test_sdk_compmatrix import (
+    BASE_SDK_COMPMATRIX_ENDPOINT
+)
+
+SDK_COMPMATRIX_APPS_ENDPOINT = f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps'
+
+
+def _get_apps(client, sdk_ids, **extra_params):
+    query_string = {
+        'from_sdk': sdk_ids[0],
+        'to_sdk': sdk_ids[0],
+        'count': 3,
+        **extra_params
+    }
+    return client.get(SDK_COMPMATRIX_APPS_ENDPOINT, query_string=query_string)
+
+
+def test_fields_are_projected(client, test_db_data, sdk_ids):
+    full_resp = _get_apps(client, sdk_ids)
+    resp = _get_apps(client,
+                     sdk_ids,
+                     fields='seller_name,release_date,five_star_ratings')
+
+    expected_apps = [
+        {
+            'seller_name': app['seller_name'],
+            'release_date': app['release_date'],
+            'five_star_ratings': app['five_star_ratings']
+        }
+        for app in full_resp.json['data']['apps']
+    ]
+
+    assert resp.json['data']['apps'] == expected_apps
+    assert resp.json['data']['total_count'] == (
+        full_resp.json['data']['total_count'])
+    assert resp.json['data']['start_cursor'] == (
+        full_resp.json['data']['start_cursor'])
+    assert resp.json['data']['end_cursor'] == (
+        full_resp.json['data']['end_cursor'])
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_fields_can_be_repeated(client, test_db_data, sdk_ids):
+    resp = _get_apps(client, sdk_ids, fields=['name', 'id,name'])
+
+    assert resp.json['data']['apps']
+    for app in resp.json['data']['apps']:
+        assert set(app) == {'name', 'id'}
+
+
+def test_paging_with_fields(client, test_db_data, sdk_ids):
+    full_resp = _get_apps(client, sdk_ids, count=4)
+    first_resp = _get_apps(client, sdk_ids, count=2, fields='id')
+    next_resp = _get_apps(client,
+                          sdk_ids,
+                          count=2,
+                          fields='id',
+                          cursor=first_resp.json['data']['end_cursor'],
+                          direction='next')
+
+    app_ids = [
+        app['id']
+        for resp in [first_resp, next_resp]
+        for app in resp.json['data']['apps']
+    ]
+
+    assert app_ids == [app['id'] for app in full_resp.json['data']['apps']]
+
+
+def test_invalid_fields_param(client, test_db_data, sdk_ids):
+    for fields in ['name,sdks', '', ',']:
+        resp = _get_apps(client, sdk_ids, fields=fields)
+
+        expected_resp = {
+            'errors': [
+                {
+                    'message': 'Parameter, "fields", has an invalid value. '
+                               'It must only have fields of apps, separated '
+                               'by commas.',
+                    'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                    'parameters': [
+                        'fields'
+                    ]
+                }
+            ]
+        }
+
+        assert resp.json == expected_resp
+        assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
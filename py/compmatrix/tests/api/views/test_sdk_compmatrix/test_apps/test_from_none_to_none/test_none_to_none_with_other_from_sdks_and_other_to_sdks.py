@@ -42,12 +42,12 @@ def test_no_cursor(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir(client, expected_apps, sdk_ids):
@@ -68,12 +68,12 @@ def test_has_cursor_next_dir(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[2:4],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[2]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[2]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2(client, expected_apps, sdk_ids):
@@ -94,12 +94,12 @@ def test_has_cursor_next_dir2(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[3:11],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[3]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[10])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[3]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[10])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir(client, expected_apps, sdk_ids):
@@ -120,12 +120,12 @@ def test_has_cursor_prev_dir(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[:2],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[1])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2(client, expected_apps, sdk_ids):
@@ -146,12 +146,12 @@ def test_has_cursor_prev_dir2(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[0:3],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[2])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[2])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir(client, expected_apps, sdk_ids):
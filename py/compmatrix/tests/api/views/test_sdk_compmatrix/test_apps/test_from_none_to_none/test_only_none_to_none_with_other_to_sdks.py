@@ -40,13 +40,13 @@ def test_no_cursor(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir(client, expected_apps, sdk_ids):
@@ -66,12 +66,12 @@ def test_has_cursor_next_dir(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[5:8],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[5]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[7])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[5]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[7])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2(client, expected_apps, sdk_ids):
@@ -91,12 +91,12 @@ def test_has_cursor_next_dir2(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[3:14],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[3]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[13])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[3]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[13])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir(client, expected_apps, sdk_ids):
@@ -116,12 +116,12 @@ def test_has_cursor_prev_dir(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[2:5],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[2]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[4])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[2]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[4])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2(client, expected_apps, sdk_ids):
@@ -141,12 +141,12 @@ def test_has_cursor_prev_dir2(client, expected_apps, sdk_ids):
         'data': {
             'apps': apps[0:5],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[4])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[4])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir(client, expected_apps, sdk_ids):
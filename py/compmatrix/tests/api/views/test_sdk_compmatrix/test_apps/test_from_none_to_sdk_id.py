@@ -52,12 +52,12 @@ def test_no_cursor(client, none_sans_cardio_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir(client, none_sans_cardio_to_paypal_apps, sdk_ids):
@@ -78,12 +78,12 @@ def test_has_cursor_next_dir(client, none_sans_cardio_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[2:],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[2]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[2]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2(client, none_sans_cardio_to_paypal_apps,
@@ -105,12 +105,12 @@ def test_has_cursor_next_dir2(client, none_sans_cardio_to_paypal_apps,
         'data': {
             'apps': apps[2:4],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[2]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[2]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir(client, none_sans_cardio_to_paypal_apps,
@@ -132,12 +132,12 @@ def test_has_cursor_prev_dir(client, none_sans_cardio_to_paypal_apps,
         'data': {
             'apps': apps[:2],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[1])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2(client, none_sans_cardio_to_paypal_apps,
@@ -159,12 +159,12 @@ def test_has_cursor_prev_dir2(client, none_sans_cardio_to_paypal_apps,
         'data': {
             'apps': apps[0:3],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[2])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[2])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir(client, none_sans_cardio_to_paypal_apps, sdk_ids):
@@ -235,13 +235,13 @@ def test_no_cursor_no_other_from_sdks(client, only_none_to_paypal_apps,
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir_no_other_from_sdks(client,
@@ -263,12 +263,12 @@ def test_has_cursor_next_dir_no_other_from_sdks(client,
         'data': {
             'apps': apps[2:4],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[2]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[2]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2_no_other_from_sdks(client,
@@ -290,12 +290,12 @@ def test_has_cursor_next_dir2_no_other_from_sdks(client,
         'data': {
             'apps': apps[3:4],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[3]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[3]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir_no_other_from_sdks(client,
@@ -317,12 +317,12 @@ def test_has_cursor_prev_dir_no_other_from_sdks(client,
         'data': {
             'apps': apps[0:2],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[1])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2_no_other_from_sdks(client,
@@ -344,12 +344,12 @@ def test_has_cursor_prev_dir2_no_other_from_sdks(client,
         'data': {
             'apps': apps[0:1],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[0])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[0])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir_no_other_from_sdks(client, only_none_to_paypal_apps,
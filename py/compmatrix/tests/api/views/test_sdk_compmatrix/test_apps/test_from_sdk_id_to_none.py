@@ -52,13 +52,13 @@ def test_no_cursor(client, paypal_to_none_apps_sans_paypal, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir(client, paypal_to_none_apps_sans_paypal, sdk_ids):
@@ -80,12 +80,12 @@ def test_has_cursor_next_dir(client, paypal_to_none_apps_sans_paypal, sdk_ids):
         'data': {
             'apps': apps[3:6],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[3]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[5])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[3]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[5])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2(client, paypal_to_none_apps_sans_paypal,
@@ -107,12 +107,12 @@ def test_has_cursor_next_dir2(client, paypal_to_none_apps_sans_paypal,
         'data': {
             'apps': apps[5:6],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[5]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[5])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[5]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[5])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir(client, paypal_to_none_apps_sans_paypal,
@@ -134,12 +134,12 @@ def test_has_cursor_prev_dir(client, paypal_to_none_apps_sans_paypal,
         'data': {
             'apps': apps[:3],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[2])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[2])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2(client, paypal_to_none_apps_sans_paypal,
@@ -161,12 +161,12 @@ def test_has_cursor_prev_dir2(client, paypal_to_none_apps_sans_paypal,
         'data': {
             'apps': apps[0:1],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[0])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[0])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir(client, paypal_to_none_apps_sans_paypal, sdk_ids):
@@ -237,13 +237,13 @@ def test_no_cursor_no_other_to_sdks(client, paypal_to_only_none_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir_no_other_to_sdks(client, paypal_to_only_none_apps,
@@ -264,13 +264,13 @@ def test_has_cursor_next_dir_no_other_to_sdks(client, paypal_to_only_none_apps,
         'data': {
             'apps': apps[3:3 + count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[3]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[3]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[(3 + count) - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2_no_other_to_sdks(client,
@@ -292,12 +292,12 @@ def test_has_cursor_next_dir2_no_other_to_sdks(client,
         'data': {
             'apps': apps[5:10],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[5]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[9])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[5]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[9])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir_no_other_to_sdks(client, paypal_to_only_none_apps,
@@ -318,12 +318,12 @@ def test_has_cursor_prev_dir_no_other_to_sdks(client, paypal_to_only_none_apps,
         'data': {
             'apps': apps[1:3],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[1]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[2])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[1]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[2])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2_no_other_to_sdks(client,
@@ -345,12 +345,12 @@ def test_has_cursor_prev_dir2_no_other_to_sdks(client,
         'data': {
             'apps': apps[0:1],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[0])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[0])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir_no_other_to_sdks(client, paypal_to_only_none_apps,
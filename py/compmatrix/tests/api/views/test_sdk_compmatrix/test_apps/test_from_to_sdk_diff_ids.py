@@ -51,13 +51,13 @@ def test_no_cursor(client, chartboost_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir(client, chartboost_to_paypal_apps, sdk_ids):
@@ -78,12 +78,12 @@ def test_has_cursor_next_dir(client, chartboost_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[2:3],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[2]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[2])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[2]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[2])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_dir2(client, chartboost_to_paypal_apps, sdk_ids):
@@ -104,12 +104,12 @@ def test_has_cursor_next_dir2(client, chartboost_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[1:3],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[1]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[2])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[1]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[2])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir(client, chartboost_to_paypal_apps, sdk_ids):
@@ -130,12 +130,12 @@ def test_has_cursor_prev_dir(client, chartboost_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[1])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_dir2(client, chartboost_to_paypal_apps, sdk_ids):
@@ -156,12 +156,12 @@ def test_has_cursor_prev_dir2(client, chartboost_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[0:1],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[0])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[0])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_dir(client, chartboost_to_paypal_apps, sdk_ids):
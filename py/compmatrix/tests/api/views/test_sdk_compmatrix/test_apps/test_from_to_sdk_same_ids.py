@@ -50,14 +50,14 @@ def test_no_cursor(client, paypal_to_paypal_apps, sdk_ids):
         'data': {
             'apps': paypal_to_paypal_apps[:count],
             'total_count': len(paypal_to_paypal_apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(
                 paypal_to_paypal_apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'end_cursor': query_utils.create_position_from_app_dict(
                 paypal_to_paypal_apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_direction(client, paypal_to_paypal_apps, sdk_ids):
@@ -78,14 +78,14 @@ def test_has_cursor_next_direction(client, paypal_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[2:2 + count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(
                 apps[count]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[(count * 2) - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_next_direction2(client, paypal_to_paypal_apps, sdk_ids):
@@ -106,12 +106,12 @@ def test_has_cursor_next_direction2(client, paypal_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[3:4],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[3]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[3])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[3]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[3])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_direction(client, paypal_to_paypal_apps, sdk_ids):
@@ -132,13 +132,13 @@ def test_has_cursor_prev_direction(client, paypal_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[:count],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(
                 apps[count - 1])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_prev_direction2(client, paypal_to_paypal_apps, sdk_ids):
@@ -159,12 +159,12 @@ def test_has_cursor_prev_direction2(client, paypal_to_paypal_apps, sdk_ids):
         'data': {
             'apps': apps[0:1],
             'total_count': len(apps),
-            'start_cursor': query_utils.create_cursor_from_app_dict(apps[0]),
-            'end_cursor': query_utils.create_cursor_from_app_dict(apps[0])
+            'start_cursor': query_utils.create_position_from_app_dict(apps[0]),
+            'end_cursor': query_utils.create_position_from_app_dict(apps[0])
         }
     }
 
-    assert resp.json == expected_resp
+    assert query_utils.decode_page_cursors(resp.json) == expected_resp
 
 
 def test_has_cursor_no_direction(client, paypal_to_paypal_apps, sdk_ids):
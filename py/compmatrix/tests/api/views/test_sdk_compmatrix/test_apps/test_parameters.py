@@ -312,8 +312,9 @@ def test_cursor_wrong_format(client, apps, sdk_ids):
     expected_resp = {
         'errors': [
             {
-                'message': 'Parameter, "cursor", has an invalid value. The '
-                           'correct format is "<app name>;<app seller name>".',
+                'message': 'Parameter, "cursor", has an invalid value. It '
+                           'must be a "start_cursor" or "end_cursor" from a '
+                           'previous response.',
                 'code': AnomalyCode.INVALID_PARAMETER_VALUE,
                 'parameters': [
                     'cursor'
@@ -372,10 +373,10 @@ def test_invalid_all_params(client, apps, sdk_ids):
                 'message': 'Parameters, "from_sdk", "to_sdk", "count", '
                            '"cursor", and "direction", have invalid values. '
                            'Values of "from_sdk", "to_sdk", and "count" must '
-                           'be integers. The correct format for the value of '
-                           '"cursor" is "<app name>;<app seller name>". The '
-                           'value of "direction" must only be either '
-                           '"previous" or "next".',
+                           'be integers. The value of "cursor" must be a '
+                           '"start_cursor" or "end_cursor" from a previous '
+                           'response. The value of "direction" must only be '
+                           'either "previous" or "next".',
                 'code': AnomalyCode.INVALID_PARAMETER_VALUE,
                 'parameters': [
                     'from_sdk',
@@ -410,10 +411,10 @@ def test_invalid_all_params2(client, apps, sdk_ids):
                            '"count", "cursor", and "direction", have invalid '
                            'values. Values of "other_from_sdks", '
                            '"other_to_sdks", and "count" must be integers. '
-                           'The correct format for the value of "cursor" is '
-                           '"<app name>;<app seller name>". The value of '
-                           '"direction" must only be either "previous" or '
-                           '"next".',
+                           'The value of "cursor" must be a "start_cursor" '
+                           'or "end_cursor" from a previous response. The '
+                           'value of "direction" must only be either '
+                           '"previous" or "next".',
                 'code': AnomalyCode.INVALID_PARAMETER_VALUE,
                 'parameters': [
                     'other_from_sdks',
@@ -451,10 +452,10 @@ def test_invalid_all_params3(client, apps, sdk_ids):
                            '"direction", have invalid values. Values of '
                            '"from_sdk", "other_from_sdks", "to_sdk", '
                            '"other_to_sdks", and "count" must be integers. '
-                           'The correct format for the value of "cursor" is '
-                           '"<app name>;<app seller name>". The value of '
-                           '"direction" must only be either "previous" or '
-                           '"next".',
+                           'The value of "cursor" must be a "start_cursor" '
+                           'or "end_cursor" from a previous response. The '
+                           'value of "direction" must only be either '
+                           '"previous" or "next".',
                 'code': AnomalyCode.INVALID_PARAMETER_VALUE,
                 'parameters': [
                     'from_sdk',
@@ -512,9 +513,9 @@ def test_invalid_all_params4(client, apps, sdk_ids):
                            '"to_sdk", "other_to_sdks", "count", and "cursor", '
                            'have invalid values. Values of "from_sdk", '
                            '"other_from_sdks", "to_sdk", "other_to_sdks", and '
-                           '"count" must be integers. The correct format for '
-                           'the value of "cursor" is '
-                           '"<app name>;<app seller name>".',
+                           '"count" must be integers. The value of "cursor" '
+                           'must be a "start_cursor" or "end_cursor" from a '
+                           'previous response.',
                 'code': AnomalyCode.INVALID_PARAMETER_VALUE,
                 'parameters': [
                     'from_sdk',
@@ -643,9 +644,9 @@ def test_invalid_and_unknown_params(client, apps, sdk_ids):
                            '"to_sdk", "other_to_sdks", "count", and "cursor", '
                            'have invalid values. Values of "from_sdk", '
                            '"other_from_sdks", "to_sdk", "other_to_sdks", and '
-                           '"count" must be integers. The correct format for '
-                           'the value of "cursor" is '
-                           '"<app name>;<app seller name>".',
+                           '"count" must be integers. The value of "cursor" '
+                           'must be a "start_cursor" or "end_cursor" from a '
+                           'previous response.',
                 'code': AnomalyCode.INVALID_PARAMETER_VALUE,
                 'parameters': [
                     'from_sdk',
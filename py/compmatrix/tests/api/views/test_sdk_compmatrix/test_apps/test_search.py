@@ -0,0 +1,195 @@
+from http import HTTPStatus
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models, search
+from compmatrix.api.matrix import membership
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.tests.api.views.test_sdk_compmatrix import (
+    BASE_SDK_COMPMATRIX_ENDPOINT
+)
+
+SDK_COMPMATRIX_APPS_ENDPOINT = f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps'
+SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT = (
+    f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps/export')
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    names = [
+        ('Candy Crush Saga', 'King'),
+        ('Candy Crush Soda Saga', 'King'),
+        ('Clash of Clans', 'Supercell Oy'),
+        ('Crusader Kings', 'Paradox'),
+        ('Ünicode Candy', 'Sellér'),
+        ('Farm Heroes Saga', 'King')
+    ]
+    rows = [
+        models.SDK(id=1, name='SDK 1'),
+        models.SDK(id=2, name='SDK 2')
+    ]
+    for app_id, (name, seller_name) in enumerate(names, start=1):
+        rows.append(models.App(id=app_id,
+                               name=name,
+                               seller_name=seller_name))
+        rows.append(models.AppSDK(app_id=app_id,
+                                  sdk_id=1 if app_id != 2 else 2,
+                                  installed=True))
+
+    return create_tmp_app(rows, create_tables=[search.create_table])
+
+
+@pytest.fixture
+def tmp_client(tmp_app):
+    return tmp_app.test_client()
+
+
+def _search(client, q, count=10, **extra_params):
+    resp = client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                      query_string={
+                          'from_sdk': 1,
+                          'to_sdk': 1,
+                          'count': count,
+                          'q': q,
+                          **extra_params
+                      })
+    assert resp.status_code == HTTPStatus.OK
+
+    return resp.json['data']
+
+
+def test_search_within_cell(tmp_client):
+    # "Candy Crush Soda Saga" is in another cell.
+    data = _search(tmp_client, 'candy')
+
+    assert [app['id'] for app in data['apps']] == [1, 5]
+    assert data['total_count'] == 2
+
+
+def test_search_by_word_prefixes(tmp_client):
+    assert [app['id'] for app in _search(tmp_client, 'cru')['apps']] == [1, 4]
+    assert [app['id'] for app in _search(tmp_client, 'cr sa')['apps']] == [1]
+
+    # Seller names get searched as well, and accents are ignored.
+    assert [app['id'] for app in _search(tmp_client, 'king')['apps']] == [
+        1, 4, 6
+    ]
+    assert [app['id'] for app in _search(tmp_client, 'unicode')['apps']] == [
+        5
+    ]
+    assert _search(tmp_client, 'zzz')['apps'] == []
+
+
+def test_search_with_fts_syntax(tmp_client):
+    # The text is only ever treated as words to search for.
+    data = _search(tmp_client, '"saga" OR NEAR(clash')
+
+    assert data['apps'] == []
+    assert data['total_count'] == 0
+
+
+def test_paging_through_search(tmp_client):
+    first_page = _search(tmp_client, 'saga king', count=1)
+    next_page = _search(tmp_client,
+                        'saga king',
+                        count=1,
+                        cursor=first_page['end_cursor'],
+                        direction='next')
+    last_page = _search(tmp_client,
+                        'saga king',
+                        count=1,
+                        cursor=next_page['end_cursor'],
+                        direction='next')
+
+    assert first_page['total_count'] == 2
+    assert next_page['total_count'] == 2
+    assert [app['id'] for app in first_page['apps']] == [1]
+    assert [app['id'] for app in next_page['apps']] == [6]
+    assert last_page['apps'] == []
+
+
+def test_search_with_membership_table(tmp_app, tmp_client):
+    with tmp_app.app_context():
+        membership.create_table()
+        membership.rebuild_table()
+        db.session.commit()
+
+    tmp_app.config['COMPMATRIX_APPS_USE_MEMBERSHIP_TABLE'] = True
+
+    data = _search(tmp_client, 'saga')
+
+    assert [app['id'] for app in data['apps']] == [1, 6]
+    assert data['total_count'] == 2
+
+
+def test_export_search(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'fields': 'id',
+                              'q': 'saga'
+                          })
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.text.split() == ['id', '1', '6']
+
+
+@pytest.mark.parametrize('endpoint,extra_params', [
+    (SDK_COMPMATRIX_APPS_ENDPOINT, {'count': 10}),
+    (SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT, {})
+])
+def test_search_without_search_table(create_tmp_app, endpoint, extra_params):
+    tmp_client = create_tmp_app([
+        models.SDK(id=1, name='SDK 1'),
+        models.App(id=1, name='Candy Crush Saga'),
+        models.AppSDK(app_id=1, sdk_id=1, installed=True)
+    ]).test_client()
+    query_string = {'from_sdk': 1, 'to_sdk': 1, **extra_params}
+
+    resp = tmp_client.get(endpoint,
+                          query_string={**query_string, 'q': 'candy'})
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Data needed by this request, "app_search", has '
+                           'not been built yet. Please try again later.',
+                'code': AnomalyCode.MISSING_TABLE
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+    # Only searching needs the table.
+    resp = tmp_client.get(endpoint, query_string=query_string)
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_invalid_search_param(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'count': 10,
+                              'q': '!?'
+                          })
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameter, "q", has an invalid value. It must '
+                           'have at least one letter or number.',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'q'
+                ]
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,220 @@
+import datetime
+from http import HTTPStatus
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.views.codes import AnomalyCode
+from compmatrix.api.views.sdk_compmatrix import apps
+from compmatrix.tests.api.views.test_sdk_compmatrix import (
+    BASE_SDK_COMPMATRIX_ENDPOINT
+)
+
+SDK_COMPMATRIX_APPS_ENDPOINT = f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps'
+SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT = (
+    f'{BASE_SDK_COMPMATRIX_ENDPOINT}/apps/export')
+
+# The apps, with their names, five-star and one-star ratings, and release
+# dates. Apps 1 and 4 have the same number of ratings, and apps 2 and 5 have
+# the same release date.
+_APPS = [
+    ('Delta', 10, 5, datetime.datetime(2015, 3, 1)),
+    ('Alpha', None, 40, datetime.datetime(2016, 1, 1)),
+    ('Charlie', 100, None, None),
+    ('Bravo', 15, None, datetime.datetime(2014, 7, 9)),
+    ('Echo', None, None, datetime.datetime(2016, 1, 1)),
+    ('Foxtrot', 2, 1, None)
+]
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    rows = [models.SDK(id=1, name='SDK 1')]
+    for app_id, (name, five_stars, one_star, release_date) in enumerate(
+            _APPS, start=1):
+        rows.append(models.App(id=app_id,
+                               name=name,
+                               seller_name='Seller',
+                               five_star_ratings=five_stars,
+                               one_star_ratings=one_star,
+                               release_date=release_date))
+        rows.append(models.AppSDK(app_id=app_id, sdk_id=1, installed=True))
+
+    return create_tmp_app(rows)
+
+
+@pytest.fixture
+def tmp_client(tmp_app):
+    return tmp_app.test_client()
+
+
+_SORT_INDEXES = {
+    'name': 'COVERING INDEX ix_app_name_seller_name_id',
+    'ratings': 'INDEX ix_app_total_ratings_id',
+    'release_date': 'INDEX ix_app_release_date_key_id'
+}
+
+
+def _get_apps_page(client, sort, count, **extra_params):
+    resp = client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                      query_string={
+                          'from_sdk': 1,
+                          'to_sdk': 1,
+                          'count': count,
+                          'sort': sort,
+                          **extra_params
+                      })
+    assert resp.status_code == HTTPStatus.OK
+
+    return resp.json['data']
+
+
+def _get_all_app_ids(client, sort, **extra_params):
+    # Goes through all the pages, one app at a time, and then back.
+    page = _get_apps_page(client, sort, 1, **extra_params)
+    app_ids = [app['id'] for app in page['apps']]
+    while True:
+        page = _get_apps_page(client,
+                              sort,
+                              1,
+                              cursor=page['end_cursor'],
+                              direction='next',
+                              **extra_params)
+        if not page['apps']:
+            break
+
+        app_ids.extend(app['id'] for app in page['apps'])
+        end_cursor = page['end_cursor']
+
+    previous_app_ids = []
+    page = {'start_cursor': end_cursor}
+    while True:
+        page = _get_apps_page(client,
+                              sort,
+                              2,
+                              cursor=page['start_cursor'],
+                              direction='previous',
+                              **extra_params)
+        if not page['apps']:
+            break
+
+        previous_app_ids = [app['id'] for app in page['apps']] + (
+            previous_app_ids)
+
+    assert previous_app_ids == app_ids[:-1]
+
+    return app_ids
+
+
+@pytest.mark.parametrize('sort,expected_app_ids', [
+    ('name', [2, 4, 3, 1, 5, 6]),
+    # The ties are broken by the IDs, which go in the same direction.
+    ('ratings', [3, 2, 4, 1, 6, 5]),
+    # Apps without a release date come last.
+    ('release_date', [5, 2, 1, 4, 6, 3])
+])
+def test_paging_through_sorted_apps(tmp_client, sort, expected_app_ids):
+    assert _get_all_app_ids(tmp_client, sort) == expected_app_ids
+    assert _get_all_app_ids(tmp_client, sort, fields='id') == (
+        expected_app_ids)
+
+
+@pytest.mark.parametrize('sort', ['name', 'ratings', 'release_date'])
+@pytest.mark.parametrize('is_before', [False, True])
+def test_cursor_seeks_in_sort_index(tmp_app, sort, is_before):
+    sort_order = apps._SORT_ORDERS[sort]
+    cursor = apps.AppCursor(
+        tuple('Alpha' if str in key_type else 1
+              for key_type in sort_order.key_types),
+        1)
+    query = db.select(models.App.id).where(
+        apps._get_cursor_condition(sort_order, cursor, is_before)
+    ).order_by(
+        *apps._get_order_by_clauses(sort_order,
+                                    is_before != sort_order.is_descending)
+    ).limit(10)
+
+    with tmp_app.app_context():
+        compiled_query = query.compile(dialect=db.engine.dialect)
+        plan = db.session.connection().exec_driver_sql(
+            f'EXPLAIN QUERY PLAN {compiled_query}',
+            tuple(compiled_query.params[name]
+                  for name in compiled_query.positiontup)
+        ).all()
+
+    # Scanning the index instead would go through every app before the
+    # cursor.
+    assert len(plan) == 1
+    assert plan[0][-1].startswith(
+        f'SEARCH app USING {_SORT_INDEXES[sort]} ')
+
+
+def test_default_sort_is_by_name(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'count': 10
+                          })
+
+    assert [app['id'] for app in resp.json['data']['apps']] == [
+        2, 4, 3, 1, 5, 6
+    ]
+
+
+def test_export_sorted_apps(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_EXPORT_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'fields': 'id',
+                              'sort': 'ratings'
+                          })
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.text.split() == ['id', '3', '2', '4', '1', '6', '5']
+
+
+def test_invalid_sort_param(tmp_client):
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'count': 10,
+                              'sort': 'size'
+                          })
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameter, "sort", has an invalid value. It must '
+                           'only be either "name", "ratings", or '
+                           '"release_date".',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'sort'
+                ]
+            }
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_cursor_from_another_sort(tmp_client):
+    page = _get_apps_page(tmp_client, 'name', 1)
+
+    resp = tmp_client.get(SDK_COMPMATRIX_APPS_ENDPOINT,
+                          query_string={
+                              'from_sdk': 1,
+                              'to_sdk': 1,
+                              'count': 10,
+                              'sort': 'ratings',
+                              'cursor': page['end_cursor'],
+                              'direction': 'next'
+                          })
+
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+    assert resp.json['errors'][0]['parameters'] == ['cursor']
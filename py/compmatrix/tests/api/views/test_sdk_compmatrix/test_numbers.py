@@ -1,6 +1,7 @@
 """
 Tests the /api/v1/sdk-compmatrix/numbers endpoint.
 """
+import json
 from http import HTTPStatus
 
 from compmatrix.api.views.codes import AnomalyCode
@@ -1572,3 +1573,437 @@ def test_mixed_valid_invalid_values_sdk_params1(client, sdk_ids):
 
     assert resp.json == expected_resp
     assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_row_normalized_numbers(client, test_db_data, sdk_ids):
+    #      Expected Competitive Matrix Values
+    #
+    #            | PayPal | card.io | Chartboost | (none) | Sum |
+    # -----------+--------+---------+------------+--------+-----|
+    # PayPal     |      4 |       3 |          3 |      0 |  10 |
+    # card.io    |      2 |       5 |          3 |      2 |  12 |
+    # Chartboost |      3 |       3 |          4 |      0 |  10 |
+    # (none)     |      0 |       0 |          0 |      3 |   3 |
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': sdk_ids,
+        'normalize': 'row'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'data': {
+            'numbers': [
+                [4, 3, 3, 0],
+                [2, 5, 3, 2],
+                [3, 3, 4, 0],
+                [0, 0, 0, 3]
+            ],
+            'normalized_numbers': [
+                [4 / 10, 3 / 10, 3 / 10, 0 / 10],
+                [2 / 12, 5 / 12, 3 / 12, 2 / 12],
+                [3 / 10, 3 / 10, 4 / 10, 0 / 10],
+                [0 / 3, 0 / 3, 0 / 3, 3 / 3]
+            ]
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_column_normalized_numbers(client, test_db_data, sdk_ids):
+    #      Expected Competitive
+    #         Matrix Values
+    #
+    #            | PayPal | (none) |
+    # -----------+--------+--------|
+    # card.io    |      2 |     10 |
+    # (none)     |      4 |     11 |
+    # -----------+--------+--------|
+    # Sum        |      6 |     21 |
+    query_string = {
+        'from_sdks': [sdk_ids[1]],
+        'to_sdks': [sdk_ids[0]],
+        'normalize': 'column'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'data': {
+            'numbers': [
+                [2, 10],
+                [4, 11]
+            ],
+            'normalized_numbers': [
+                [2 / 6, 10 / 21],
+                [4 / 6, 11 / 21]
+            ]
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_no_normalization(client, test_db_data, sdk_ids):
+    query_string = {
+        'from_sdks': [sdk_ids[1]],
+        'to_sdks': [sdk_ids[0]],
+        'normalize': 'none',
+        'derived': 'false'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'data': {
+            'numbers': [
+                [2, 10],
+                [4, 11]
+            ]
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_derived_sdk_metrics(client, test_db_data, sdk_ids):
+    #      Expected Competitive Matrix Values
+    #
+    #            | PayPal | card.io | (none) | Sum |
+    # -----------+--------+---------+--------+-----|
+    # card.io    |      2 |       5 |      5 |  12 |
+    # Chartboost |      3 |       3 |      4 |  10 |
+    # PayPal     |      4 |       3 |      3 |  10 |
+    # (none)     |      0 |       0 |      3 |   3 |
+    # -----------+--------+---------+--------+-----|
+    # Sum        |      9 |      11 |     15 |     |
+    #
+    # Chartboost is not a "to" SDK, so it does not get any metrics.
+    query_string = {
+        'from_sdks': [sdk_ids[1], sdk_ids[2], sdk_ids[0]],
+        'to_sdks': [sdk_ids[0], sdk_ids[1]],
+        'derived': 'true'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'data': {
+            'numbers': [
+                [2, 5, 5],
+                [3, 3, 4],
+                [4, 3, 3],
+                [0, 0, 3]
+            ],
+            'sdk_metrics': [
+                {
+                    'sdk_id': sdk_ids[1],
+                    'retention_rate': 5 / 12,
+                    'churn_rate': 7 / 12,
+                    'net_acquisition': -1
+                },
+                {
+                    'sdk_id': sdk_ids[0],
+                    'retention_rate': 4 / 10,
+                    'churn_rate': 6 / 10,
+                    'net_acquisition': -1
+                }
+            ]
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_invalid_normalize_param(client, test_db_data, sdk_ids):
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': sdk_ids,
+        'normalize': 'diagonal'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameter, "normalize", has an invalid value. '
+                           'It must only be either "row", "column", or '
+                           '"none".',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'normalize'
+                ]
+            },
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_invalid_sdk_normalize_and_derived_params(client, sdk_ids):
+    invalid_from_values = ['Bling']
+    query_string = {
+        'from_sdks': [sdk_ids[0], invalid_from_values[0]],
+        'to_sdks': sdk_ids,
+        'normalize': 'ROW',
+        'derived': 'yes'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameters, "from_sdks", "normalize", and '
+                           '"derived", have invalid values. Values of '
+                           '"from_sdks" must be integers. The value of '
+                           '"normalize" must only be either "row", '
+                           '"column", or "none". The value of "derived" '
+                           'must only be either "true" or "false".',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'from_sdks',
+                    'normalize',
+                    'derived'
+                ],
+                'diagnostics': {
+                    'from_sdks': invalid_from_values
+                }
+            },
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_ndjson_format(client, test_db_data, sdk_ids):
+    #      Expected Competitive
+    #         Matrix Values
+    #
+    #            | PayPal | (none) |
+    # -----------+--------+--------|
+    # card.io    |      2 |     10 |
+    # card.io    |      2 |     10 |
+    # (none)     |      4 |     11 |
+    query_string = {
+        'from_sdks': [sdk_ids[1], sdk_ids[1]],
+        'to_sdks': [sdk_ids[0]],
+        'normalize': 'row',
+        'derived': 'true',
+        'format': 'ndjson'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_lines = [
+        {
+            'row': {
+                'index': 0,
+                'from_sdk': sdk_ids[1],
+                'numbers': [2, 10],
+                'normalized_numbers': [2 / 12, 10 / 12]
+            }
+        },
+        {
+            'row': {
+                'index': 1,
+                'from_sdk': sdk_ids[1],
+                'numbers': [2, 10],
+                'normalized_numbers': [2 / 12, 10 / 12]
+            }
+        },
+        {
+            'row': {
+                'index': 2,
+                'from_sdk': None,
+                'numbers': [4, 11],
+                'normalized_numbers': [4 / 15, 11 / 15]
+            }
+        },
+        {
+            'summary': {
+                'num_rows': 3,
+                'num_columns': 2,
+                'sdk_metrics': []
+            }
+        }
+    ]
+
+    assert resp.mimetype == 'application/x-ndjson'
+    assert resp.is_streamed
+    assert resp.get_data(as_text=True).endswith('\n')
+    lines = resp.get_data(as_text=True).splitlines()
+    assert [json.loads(line) for line in lines] == expected_lines
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_ndjson_format_matches_json_format(client, test_db_data, sdk_ids):
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': list(reversed(sdk_ids))
+    }
+    json_resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                           query_string=query_string)
+    ndjson_resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                             query_string={**query_string,
+                                           'format': 'ndjson'})
+
+    lines = [
+        json.loads(line)
+        for line in ndjson_resp.get_data(as_text=True).splitlines()
+    ]
+
+    assert [line['row']['numbers'] for line in lines[:-1]] == (
+        json_resp.json['data']['numbers']
+    )
+    assert lines[-1] == {
+        'summary': {
+            'num_rows': len(sdk_ids) + 1,
+            'num_columns': len(sdk_ids) + 1
+        }
+    }
+
+
+def test_ndjson_format_errors_are_json(client, test_db_data, sdk_ids):
+    query_string = {
+        'from_sdks': UNKNOWN_SDK_IDS[0],
+        'to_sdks': sdk_ids,
+        'format': 'ndjson'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    assert resp.mimetype == 'application/json'
+    assert resp.json['errors'][0]['code'] == AnomalyCode.UNKNOWN_ID
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_invalid_format_param(client, test_db_data, sdk_ids):
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': sdk_ids,
+        'format': 'csv'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameter, "format", has an invalid value. '
+                           'It must only be either "json" or "ndjson".',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'format'
+                ]
+            },
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+def test_approx_mode_with_full_sample(app, client, test_db_data, sdk_ids,
+                                      monkeypatch):
+    # Sampling all of the apps gives the exact numbers.
+    monkeypatch.setitem(app.config, 'COMPMATRIX_APPROX_SAMPLE_RATE', 1.0)
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': sdk_ids,
+        'mode': 'approx'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_numbers = [
+        [4, 3, 3, 0],
+        [2, 5, 3, 2],
+        [3, 3, 4, 0],
+        [0, 0, 0, 3]
+    ]
+    expected_resp = {
+        'data': {
+            'numbers': expected_numbers,
+            'lower_bounds': expected_numbers,
+            'upper_bounds': expected_numbers,
+            'confidence_level': 0.95,
+            'sample_rate': 1.0
+        }
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_approx_mode_ndjson_format(app, client, test_db_data, sdk_ids,
+                                   monkeypatch):
+    monkeypatch.setitem(app.config, 'COMPMATRIX_APPROX_SAMPLE_RATE', 1.0)
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': sdk_ids,
+        'mode': 'approx',
+        'normalize': 'row'
+    }
+    json_resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                           query_string=query_string)
+    ndjson_resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                             query_string={**query_string,
+                                           'format': 'ndjson'})
+
+    lines = [
+        json.loads(line)
+        for line in ndjson_resp.get_data(as_text=True).splitlines()
+    ]
+
+    for key in ['numbers',
+                'normalized_numbers',
+                'lower_bounds',
+                'upper_bounds']:
+        assert [line['row'][key] for line in lines[:-1]] == (
+            json_resp.json['data'][key]
+        )
+
+    assert lines[-1] == {
+        'summary': {
+            'num_rows': len(sdk_ids) + 1,
+            'num_columns': len(sdk_ids) + 1,
+            'confidence_level': 0.95,
+            'sample_rate': 1.0
+        }
+    }
+
+
+def test_invalid_mode_param(client, test_db_data, sdk_ids):
+    query_string = {
+        'from_sdks': sdk_ids,
+        'to_sdks': sdk_ids,
+        'mode': 'fast'
+    }
+    resp = client.get(SDK_COMPMATRIX_NUMBERS_ENDPOINT,
+                      query_string=query_string)
+
+    expected_resp = {
+        'errors': [
+            {
+                'message': 'Parameter, "mode", has an invalid value. '
+                           'It must only be either "exact" or "approx".',
+                'code': AnomalyCode.INVALID_PARAMETER_VALUE,
+                'parameters': [
+                    'mode'
+                ]
+            },
+        ]
+    }
+
+    assert resp.json == expected_resp
+    assert resp.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
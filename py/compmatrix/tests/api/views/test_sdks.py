@@ -1,3 +1,11 @@
+import gzip
+
+import pytest
+
+from compmatrix import db
+from compmatrix.api import models
+from compmatrix.api.views import sdks
+
 SDKS_ENDPOINT = '/api/v1/sdks'
 
 
@@ -17,3 +25,180 @@ def test_sdks_endpoint(client, test_db_data):
         assert resp_sdk['slug'] == test_sdk.slug
         assert resp_sdk['url'] == test_sdk.url
         assert resp_sdk['description'] == test_sdk.description
+
+
+@pytest.fixture
+def tmp_app(create_tmp_app):
+    tmp_app = create_tmp_app([
+        models.SDK(id=1, name='Stripe', slug='stripe'),
+        models.SDK(id=2, name='PayPal', slug='paypal')
+    ])
+    with tmp_app.app_context():
+        yield tmp_app
+
+
+def test_sdks_conditional_get(tmp_app):
+    client = tmp_app.test_client()
+    resp = client.get(SDKS_ENDPOINT)
+
+    assert resp.status_code == 200
+    assert resp.headers['ETag']
+    assert 'Accept-Encoding' in resp.headers['Vary']
+    assert [s['name'] for s in resp.json['data']['sdks']] == [
+        'PayPal', 'Stripe'
+    ]
+
+    not_modified_resp = client.get(
+        SDKS_ENDPOINT, headers={'If-None-Match': resp.headers['ETag']})
+
+    assert not_modified_resp.status_code == 304
+    assert not_modified_resp.data == b''
+    assert not_modified_resp.headers['ETag'] == resp.headers['ETag']
+
+    db.session.add(models.SDK(id=3, name='Adyen', slug='adyen'))
+    db.session.commit()
+
+    changed_resp = client.get(
+        SDKS_ENDPOINT, headers={'If-None-Match': resp.headers['ETag']})
+
+    assert changed_resp.status_code == 200
+    assert changed_resp.headers['ETag'] != resp.headers['ETag']
+    assert [s['name'] for s in changed_resp.json['data']['sdks']] == [
+        'Adyen', 'PayPal', 'Stripe'
+    ]
+
+
+def test_sdks_gzip(tmp_app):
+    client = tmp_app.test_client()
+    resp = client.get(SDKS_ENDPOINT)
+    gzipped_resp = client.get(SDKS_ENDPOINT,
+                              headers={'Accept-Encoding': 'gzip'})
+
+    assert 'Content-Encoding' not in resp.headers
+    assert gzipped_resp.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped_resp.data) == resp.data
+
+    # The gzipped body is a different representation, with its own ETag.
+    assert gzipped_resp.headers['ETag'] != resp.headers['ETag']
+
+    not_modified_resp = client.get(
+        SDKS_ENDPOINT,
+        headers={
+            'Accept-Encoding': 'gzip',
+            'If-None-Match': gzipped_resp.headers['ETag']
+        }
+    )
+
+    assert not_modified_resp.status_code == 304
+
+
+@pytest.fixture
+def catalog_client(create_tmp_app):
+    tmp_app = create_tmp_app([
+        models.SDK(id=1, name='Stripe', slug='stripe'),
+        models.SDK(id=2, name='PayPal', slug='paypal'),
+        models.SDK(id=3, name='Braintree', slug='paypal-braintree'),
+        models.SDK(id=4, name='paysafe', slug='paysafe'),
+        models.SDK(id=5, name='PayPal', slug='paypal-here')
+    ])
+
+    return tmp_app.test_client()
+
+
+def test_sdks_pages(catalog_client):
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?count=2&fields=id,name')
+    sdks = resp.json['data']['sdks']
+
+    assert sdks == [
+        {'id': 3, 'name': 'Braintree'},
+        {'id': 2, 'name': 'PayPal'}
+    ]
+
+    next_resp = catalog_client.get(
+        f'{SDKS_ENDPOINT}?count=2&fields=id,name&direction=next&cursor='
+        f'{resp.json["data"]["end_cursor"]}')
+
+    # SDKs with the same name, regardless of case, are sorted by their IDs.
+    assert next_resp.json['data']['sdks'] == [
+        {'id': 5, 'name': 'PayPal'},
+        {'id': 4, 'name': 'paysafe'}
+    ]
+
+    previous_resp = catalog_client.get(
+        f'{SDKS_ENDPOINT}?count=2&fields=id,name&direction=previous&cursor='
+        f'{next_resp.json["data"]["start_cursor"]}')
+
+    assert previous_resp.json['data']['sdks'] == sdks
+
+
+def test_sdks_search(catalog_client):
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?q=PAYP&fields=id')
+
+    # Braintree matches through its slug.
+    assert [s['id'] for s in resp.json['data']['sdks']] == [3, 2, 5]
+
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?q=s')
+
+    assert resp.json['data']['sdks'] == [
+        {
+            'description': None,
+            'id': 1,
+            'name': 'Stripe',
+            'slug': 'stripe',
+            'url': None
+        }
+    ]
+
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?q=paypal-h&fields=id')
+
+    assert resp.json['data']['sdks'] == [{'id': 5}]
+    assert resp.json['data']['start_cursor'] == resp.json['data']['end_cursor']
+
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?q=adyen')
+
+    assert resp.json['data'] == {
+        'sdks': [],
+        'start_cursor': None,
+        'end_cursor': None
+    }
+
+
+def test_sdks_page_params(catalog_client):
+    resp = catalog_client.get(
+        f'{SDKS_ENDPOINT}?fields=id,apps&cursor=rickroll&direction=next')
+
+    assert resp.status_code == 422
+    assert resp.json['errors'] == [
+        {
+            'message': 'Parameters, "cursor" and "fields", have invalid '
+                       'values. The value of "cursor" must be a '
+                       '"start_cursor" or "end_cursor" from a previous '
+                       'response. The value of "fields" must only have '
+                       'fields of SDKs, separated by commas.',
+            'code': 'invalid_parameter_value',
+            'parameters': ['cursor', 'fields']
+        }
+    ]
+
+
+@pytest.mark.parametrize('count', ['0', '-1'])
+def test_sdks_non_positive_count(catalog_client, count):
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?count={count}')
+
+    assert resp.status_code == 422
+    assert resp.json['errors'] == [
+        {
+            'message': 'Parameter, "count", has an invalid value. It must be '
+                       'an integer.',
+            'code': 'invalid_parameter_value',
+            'parameters': ['count']
+        }
+    ]
+
+
+def test_sdks_count_is_capped(catalog_client, monkeypatch):
+    monkeypatch.setattr(sdks, '_MAX_COUNT', 2)
+
+    resp = catalog_client.get(f'{SDKS_ENDPOINT}?count=1000000&fields=id')
+
+    assert [s['id'] for s in resp.json['data']['sdks']] == [3, 2]
@@ -19,6 +19,10 @@ def app():
     if test_db_path.exists():
         os.remove(test_db_path)
 
+    signatures_path = Path(app.config['COMPMATRIX_SIGNATURES_PATH'])
+    if signatures_path.exists():
+        os.remove(signatures_path)
+
 
 @pytest.fixture(scope='session')
 def client(app):
@@ -31,3 +31,21 @@ def test_add_routes_to_blueprint(data_routes):
         for route in data_routes:
             resp = c.get(route.path)
             assert resp.status_code == HTTPStatus.OK
+
+
+def test_add_routes_with_methods_to_blueprint():
+    routes = [
+        routing.Route('get', '/get', lambda: 'get'),
+        routing.Route('post', '/post', lambda: 'post', methods=['POST'])
+    ]
+    bp = Blueprint('blueprint', 'blueprint_import_name')
+    routing.add_routes_to_blueprint(bp, routes)
+
+    tmp_app = Flask(__name__)
+    tmp_app.register_blueprint(bp)
+
+    with tmp_app.test_client() as c:
+        assert c.get('/get').status_code == HTTPStatus.OK
+        assert c.post('/get').status_code == HTTPStatus.METHOD_NOT_ALLOWED
+        assert c.post('/post').status_code == HTTPStatus.OK
+        assert c.get('/post').status_code == HTTPStatus.METHOD_NOT_ALLOWED
@@ -0,0 +1,85 @@
+import itertools
+
+from compmatrix.utils import bitsets
+
+
+def test_from_positions_and_to_positions():
+    positions = [0, 3, 8, 9, 31, 64]
+    bitset = bitsets.from_positions(positions, 65)
+
+    assert bitset == sum(1 << p for p in positions)
+    assert bitsets.to_positions(bitset) == positions
+
+
+def test_to_positions_empty():
+    assert bitsets.to_positions(0) == []
+
+
+def test_universe():
+    assert bitsets.universe(0) == 0
+    assert bitsets.universe(5) == 0b11111
+
+
+def test_counter_from_counts():
+    counts = [0, 1, 2, 3, 6]
+    counter = bitsets.counter_from_counts(counts)
+
+    assert len(counter) == 3
+    for position, count in enumerate(counts):
+        value = sum(((s >> position) & 1) << i for i, s in enumerate(counter))
+        assert value == count
+
+
+def test_add_counters_and_sum_bitsets():
+    size = 8
+    a = [3, 0, 7, 1, 5, 2, 0, 4]
+    b = [1, 2, 1, 0, 3, 6, 0, 4]
+    added = bitsets.add_counters(bitsets.counter_from_counts(a),
+                                 bitsets.counter_from_counts(b))
+    expected = bitsets.counter_from_counts([x + y for x, y in zip(a, b)])
+    everyone = bitsets.universe(size)
+    assert (bitsets.greater_equal(added, expected, size)
+            & bitsets.greater_equal(expected, added, size)) == everyone
+
+    summed = bitsets.sum_bitsets([0b1011, 0b0011, 0b0001])
+    expected = bitsets.counter_from_counts([3, 2, 0, 1])
+    assert summed == expected
+
+
+def test_greater_equal():
+    counts = list(range(6))
+    size = len(counts) ** 2
+    a_counts = []
+    b_counts = []
+    for x, y in itertools.product(counts, counts):
+        a_counts.append(x)
+        b_counts.append(y)
+
+    result = bitsets.greater_equal(bitsets.counter_from_counts(a_counts),
+                                   bitsets.counter_from_counts(b_counts),
+                                   size)
+
+    for position, (x, y) in enumerate(zip(a_counts, b_counts)):
+        assert bool((result >> position) & 1) == (x >= y)
+
+
+def test_greater_equal_constant():
+    counter = bitsets.counter_from_counts([0, 1, 2, 3])
+    threshold = bitsets.counter_from_constant(2, 4)
+
+    assert bitsets.greater_equal(counter, threshold, 4) == 0b1100
+
+
+def test_packed_bitset_sparse():
+    packed = bitsets.PackedBitset([900, 3, 70], 1000)
+
+    assert len(packed) == 3
+    assert packed.to_int() == (1 << 3) | (1 << 70) | (1 << 900)
+
+
+def test_packed_bitset_dense():
+    positions = list(range(0, 64, 2))
+    packed = bitsets.PackedBitset(positions, 64)
+
+    assert len(packed) == 32
+    assert bitsets.to_positions(packed.to_int()) == positions
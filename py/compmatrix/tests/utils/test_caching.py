@@ -0,0 +1,99 @@
+from compmatrix.utils import caching
+
+
+def test_get_and_put():
+    cache = caching.LRUCache(max_entries=2, max_bytes=100)
+
+    assert cache.get('a') is None
+    cache.put('a', 1, 10)
+    assert cache.get('a') == 1
+    assert cache.stats == caching.CacheStats(hits=1,
+                                             misses=1,
+                                             evictions=0,
+                                             num_entries=1,
+                                             num_bytes=10)
+
+
+def test_evicts_least_recently_used_entry():
+    cache = caching.LRUCache(max_entries=2, max_bytes=100)
+    cache.put('a', 1, 10)
+    cache.put('b', 2, 10)
+    cache.get('a')
+    cache.put('c', 3, 10)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats.evictions == 1
+
+
+def test_evicts_by_size():
+    cache = caching.LRUCache(max_entries=10, max_bytes=25)
+    cache.put('a', 1, 10)
+    cache.put('b', 2, 10)
+    cache.put('c', 3, 10)
+
+    assert len(cache) == 2
+    assert cache.get('a') is None
+    assert cache.stats.num_bytes == 20
+
+
+def test_does_not_keep_oversized_entries():
+    cache = caching.LRUCache(max_entries=10, max_bytes=25)
+    cache.put('a', 1, 10)
+    cache.put('b', 2, 30)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+
+
+def test_replacing_entry_updates_size():
+    cache = caching.LRUCache(max_entries=10, max_bytes=25)
+    cache.put('a', 1, 10)
+    cache.put('a', 2, 20)
+
+    assert cache.get('a') == 2
+    assert cache.stats.num_bytes == 20
+
+
+def test_clear_keeps_stats():
+    cache = caching.LRUCache(max_entries=10, max_bytes=100)
+    cache.put('a', 1, 10)
+    cache.get('a')
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.get('a') is None
+    assert cache.stats == caching.CacheStats(hits=1,
+                                             misses=1,
+                                             evictions=0,
+                                             num_entries=0,
+                                             num_bytes=0)
+
+
+def test_items_does_not_count_as_use():
+    cache = caching.LRUCache(max_entries=2, max_bytes=100)
+    cache.put('a', 1, 1)
+    cache.put('b', 2, 1)
+
+    assert cache.items() == [('a', 1), ('b', 2)]
+    assert cache.stats.hits == 0
+
+    cache.put('c', 3, 1)
+
+    assert cache.items() == [('b', 2), ('c', 3)]
+
+
+def test_peek_does_not_count_as_use():
+    cache = caching.LRUCache(max_entries=2, max_bytes=100)
+    cache.put('a', 1, 1)
+    cache.put('b', 2, 1)
+
+    assert cache.peek('a') == 1
+    assert cache.peek('z') is None
+    assert cache.stats.hits == 0
+    assert cache.stats.misses == 0
+
+    cache.put('c', 3, 1)
+
+    assert cache.peek('a') is None
@@ -0,0 +1,157 @@
+"""
+Bitsets backed by Python integers, where bit `i` is set if position `i` is in
+the set. Python does bitwise operations on integers in C, and counts set bits
+with `int.bit_count()`, so these are fast even for millions of positions.
+
+This module also supports bit-sliced counters. A bit-sliced counter stores
+one small non-negative integer per position as a list of bitsets, where the
+`i`-th bitset holds the `i`-th bit of every integer (least significant bit
+first). This lets us add and compare the integers of every position at once
+with a handful of bitwise operations.
+"""
+from array import array
+import typing
+
+
+class PackedBitset:
+    """
+    A bitset stored in whichever form takes less memory: a sorted array of
+    its positions for sparse bitsets, or an integer for dense ones. Sparse
+    bitsets only get turned into integers when they are needed.
+    """
+    __slots__ = ('_positions', '_bitset', '_size', '_count')
+
+    def __init__(self, positions: typing.Sequence[int], size: int):
+        self._size = size
+        self._count = len(positions)
+
+        # Each position takes four bytes in an array, while an integer takes
+        # one bit for every possible position.
+        if self._count * 4 < (size + 7) // 8:
+            self._positions: array | None = array('I', sorted(positions))
+            self._bitset: int | None = None
+        else:
+            self._positions: array | None = None
+            self._bitset: int | None = from_positions(positions, size)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def to_int(self) -> int:
+        if self._bitset is not None:
+            return self._bitset
+
+        return from_positions(self._positions, self._size)
+
+
+def from_positions(positions: typing.Iterable[int], size: int) -> int:
+    """
+    Creates a bitset with the given positions set.
+
+    :param positions: The positions to set. Each must be less than `size`.
+    :param size: The number of positions the bitset can hold.
+    :return: The bitset.
+    """
+    # Setting bits one at a time in an integer would create a new integer
+    # every time, so we set the bits in a byte array instead.
+    buffer: bytearray = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+
+    return int.from_bytes(buffer, 'little')
+
+
+def to_positions(bitset: int) -> list[int]:
+    """
+    Returns the positions set in the bitset, in ascending order.
+    """
+    positions: list[int] = []
+    data: bytes = bitset.to_bytes((bitset.bit_length() + 7) // 8, 'little')
+    for byte_index, byte in enumerate(data):
+        while byte:
+            lowest_bit: int = byte & -byte
+            positions.append(byte_index * 8 + lowest_bit.bit_length() - 1)
+            byte ^= lowest_bit
+
+    return positions
+
+
+def universe(size: int) -> int:
+    """
+    Returns a bitset with all positions from 0 to `size - 1` set.
+    """
+    return (1 << size) - 1
+
+
+def counter_from_counts(counts: typing.Sequence[int]) -> list[int]:
+    """
+    Creates a bit-sliced counter holding `counts[i]` for position `i`.
+    """
+    num_slices: int = max(counts, default=0).bit_length()
+    return [
+        from_positions(
+            (p for p, c in enumerate(counts) if (c >> i) & 1),
+            len(counts)
+        )
+        for i in range(num_slices)
+    ]
+
+
+def counter_from_constant(value: int, size: int) -> list[int]:
+    """
+    Creates a bit-sliced counter holding `value` for every position.
+    """
+    all_positions: int = universe(size)
+    return [
+        all_positions if (value >> i) & 1 else 0
+        for i in range(value.bit_length())
+    ]
+
+
+def add_counters(a: list[int], b: list[int]) -> list[int]:
+    """
+    Adds two bit-sliced counters, position by position.
+    """
+    result: list[int] = []
+    carry: int = 0
+    for i in range(max(len(a), len(b))):
+        x: int = a[i] if i < len(a) else 0
+        y: int = b[i] if i < len(b) else 0
+        result.append(x ^ y ^ carry)
+        carry = (x & y) | (carry & (x ^ y))
+
+    if carry:
+        result.append(carry)
+
+    return result
+
+
+def sum_bitsets(bitsets: typing.Iterable[int]) -> list[int]:
+    """
+    Returns a bit-sliced counter holding, for each position, the number of
+    bitsets that have the position set.
+    """
+    counter: list[int] = []
+    for bitset in bitsets:
+        counter = add_counters(counter, [bitset])
+
+    return counter
+
+
+def greater_equal(a: list[int], b: list[int], size: int) -> int:
+    """
+    Returns a bitset of the positions where the count in counter `a` is
+    greater than or equal to the count in counter `b`.
+    """
+    greater: int = 0
+    equal: int = universe(size)
+
+    # Compare from the most significant bit, just like how we would compare
+    # numbers by hand.
+    for i in reversed(range(max(len(a), len(b)))):
+        x: int = a[i] if i < len(a) else 0
+        y: int = b[i] if i < len(b) else 0
+        greater |= equal & x & ~y
+        equal &= ~(x ^ y)
+
+    return greater | equal
@@ -0,0 +1,104 @@
+import dataclasses
+import threading
+import typing
+from collections import OrderedDict
+
+K = typing.TypeVar('K')
+V = typing.TypeVar('V')
+
+
+@dataclasses.dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    num_entries: int
+    num_bytes: int
+
+
+class LRUCache(typing.Generic[K, V]):
+    """
+    A thread-safe cache that evicts its least recently used entries once it
+    holds more than `max_entries` entries, or more than `max_bytes` bytes.
+    The size of each entry in bytes is given when the entry is put in the
+    cache, since only the caller knows how to estimate it.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[K, tuple[V, int]] = OrderedDict()
+        self._num_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self._lock:
+            entry: tuple[V, int] | None = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def peek(self, key: K, default: V | None = None) -> V | None:
+        """
+        Returns the value of an entry like `get()`, but without counting it
+        as a use of the entry, or as a hit or a miss.
+        """
+        with self._lock:
+            entry: tuple[V, int] | None = self._entries.get(key)
+            if entry is None:
+                return default
+
+            return entry[0]
+
+    def put(self, key: K, value: V, num_bytes: int):
+        with self._lock:
+            if key in self._entries:
+                self._num_bytes -= self._entries.pop(key)[1]
+
+            if num_bytes > self._max_bytes or self._max_entries <= 0:
+                # The entry would just evict everything, including itself.
+                return
+
+            self._entries[key] = (value, num_bytes)
+            self._num_bytes += num_bytes
+
+            while (len(self._entries) > self._max_entries
+                   or self._num_bytes > self._max_bytes):
+                _, (_, evicted_num_bytes) = self._entries.popitem(last=False)
+                self._num_bytes -= evicted_num_bytes
+                self._evictions += 1
+
+    def items(self) -> list[tuple[K, V]]:
+        """
+        Returns the entries of the cache, from the least to the most recently
+        used one. Unlike `get()`, this doesn't count as a use of the entries.
+        """
+        with self._lock:
+            return [(key, value) for key, (value, _) in self._entries.items()]
+
+    def clear(self):
+        """
+        Removes all entries. The hit, miss, and eviction counts are kept.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._num_bytes = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits,
+                              self._misses,
+                              self._evictions,
+                              len(self._entries),
+                              self._num_bytes)